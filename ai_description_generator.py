@@ -1,9 +1,9 @@
 # ai_description_generator.py
-import os
-from typing import Dict, Any, Tuple, Optional
-from bs4 import BeautifulSoup
+import threading
+from typing import Dict, Any, Tuple, Optional, Callable
 from api_client import OpenAIClient
 from product_data_manager import ProductDataManager
+from prompt_templates import CompiledTemplate, get_prompt_manager
 
 class PromptSelector:
     """Selektor odpowiedniego promptu na podstawie typu produktu i dostępnych danych"""
@@ -69,24 +69,18 @@ class PromptProcessor:
         Returns:
             Przygotowany prompt
         """
-        # Sprawdź folder prompts, potem root dla kompatybilności wstecznej
-        prompt_path = os.path.join('prompts', prompt_file) if os.path.exists(
-            os.path.join('prompts', prompt_file)
-        ) else prompt_file
-        
-        try:
-            with open(prompt_path, "r", encoding="utf-8") as file:
-                prompt = file.read().replace("\n", "")
-        except FileNotFoundError:
+        # Szablon ze wspólnego managera promptów (z pamięci, odświeżany przez watcher)
+        template = get_prompt_manager().get_template(prompt_file)
+        if template is None:
             print(f"Warning: {prompt_file} not found, using default prompt")
-            prompt = PromptProcessor._get_default_prompt()
+            template = CompiledTemplate(PromptProcessor._get_default_prompt())
             
-        # Zastąp zmienne w prompcie
-        prompt = prompt.replace("{prod_name}", data_manager.product_data.name)
-        prompt = prompt.replace("{prod_desclongription}", data_manager.product_data.description)
-        prompt = prompt.replace("{product_specification}", specification)
-        
-        return prompt
+        # Zastąp zmienne w prompcie (jeden przebieg)
+        return template.render({
+            "prod_name": data_manager.product_data.name,
+            "prod_desclongription": data_manager.product_data.description,
+            "product_specification": specification
+        })
         
     @staticmethod
     def _get_default_prompt() -> str:
@@ -119,6 +113,9 @@ class ShortDescriptionGenerator:
             Wynik generowania lub None w przypadku błędu
         """
         try:
+            # Import przy pierwszym krótkim opisie - bs4 nie spowalnia startu aplikacji
+            from bs4 import BeautifulSoup
+            
             # Parsuj długi opis w poszukiwaniu pierwszej listy <ul>
             soup = BeautifulSoup(long_description, 'html.parser')
             first_ul = soup.find('ul')
@@ -129,15 +126,13 @@ class ShortDescriptionGenerator:
             # Wybierz odpowiedni prompt
             prompt_file = "prompt_shortdesc.txt" if is_bike else "prompt_shortdesc_short.txt"
             
-            # Sprawdź folder prompts, potem root
-            prompt_path = os.path.join('prompts', prompt_file) if os.path.exists(
-                os.path.join('prompts', prompt_file)
-            ) else prompt_file
-            
-            with open(prompt_path, "r", encoding="utf-8") as file:
-                prompt = file.read().replace("\n", "")
-                prompt = prompt.replace("{prod_desclongription}", str(first_ul))
+            # Szablon ze wspólnego managera promptów
+            template = get_prompt_manager().get_template(prompt_file)
+            if template is None:
+                raise FileNotFoundError(prompt_file)
                 
+            prompt = template.render({"prod_desclongription": str(first_ul)})
+            
             # Generuj krótki opis
             return self.openai_client.generate_content(prompt)
             
@@ -146,25 +141,107 @@ class ShortDescriptionGenerator:
             return None
 
 
+class _ShortDescriptionTrigger:
+    """
+    Obserwuje strumień długiego opisu i uruchamia generowanie krótkiego
+    opisu w tle, gdy tylko zamknie się pierwsza lista </ul>
+    """
+    
+    CLOSING_TAG = "</ul>"
+    
+    def __init__(self, short_desc_generator: ShortDescriptionGenerator, is_bike: bool,
+                 on_delta: Optional[Callable[[str], None]] = None):
+        self.short_desc_generator = short_desc_generator
+        self.is_bike = is_bike
+        self.on_delta = on_delta
+        self.parts = []
+        self.scanned = 0
+        self.thread: Optional[threading.Thread] = None
+        self.result: Optional[Dict[str, Any]] = None
+        
+    def __call__(self, delta: str) -> None:
+        self.parts.append(delta)
+        if self.on_delta:
+            self.on_delta(delta)
+            
+        if self.thread is not None:
+            return
+            
+        text = ''.join(self.parts)
+        # Szukaj od końca poprzedniego fragmentu (tag może być rozdzielony)
+        position = text.find(self.CLOSING_TAG, max(0, self.scanned - len(self.CLOSING_TAG)))
+        self.scanned = len(text)
+        if position != -1:
+            self.start(text[:position + len(self.CLOSING_TAG)])
+            
+    def start(self, long_description: str) -> None:
+        """Uruchom generowanie krótkiego opisu w osobnym wątku"""
+        def worker():
+            try:
+                self.result = self.short_desc_generator.generate_short_description(
+                    long_description, self.is_bike
+                )
+            except Exception as e:
+                self.result = {'success': False, 'error': str(e), 'cost': 0}
+                
+        self.thread = threading.Thread(target=worker, daemon=True)
+        self.thread.start()
+        
+    def wait(self, long_description: str) -> Optional[Dict[str, Any]]:
+        """Poczekaj na krótki opis (lub wygeneruj go teraz, jeśli lista nie wystąpiła w strumieniu)"""
+        if self.thread is None:
+            return self.short_desc_generator.generate_short_description(
+                long_description, self.is_bike
+            )
+        self.thread.join()
+        return self.result
+        
+    def background_cost(self) -> float:
+        """
+        Koszt krótkiego opisu uruchomionego już w tle (0, jeśli nie wystartował)
+        
+        Wołane, gdy długi opis się nie udał lub został przerwany - zapytanie
+        w toku nie może zostać przerwane, więc czekamy na nie, żeby koszt nie przepadł.
+        """
+        if self.thread is None:
+            return 0
+        self.thread.join()
+        return (self.result or {}).get('cost', 0)
+
+
 class AIDescriptionGenerator:
     """Główny generator opisów AI"""
     
-    def __init__(self, openai_client: OpenAIClient):
+    def __init__(self, openai_client: OpenAIClient, pipelined: bool = True):
+        """
+        Args:
+            openai_client: Klient OpenAI (lub RateLimitedOpenAIClient)
+            pipelined: Strumieniuj długi opis i zacznij krótki po pierwszym </ul>
+        """
         self.openai_client = openai_client
         self.short_desc_generator = ShortDescriptionGenerator(openai_client)
+        self.pipelined = pipelined
         
     def generate_descriptions(self, data_manager: ProductDataManager, 
-                            is_bike: bool) -> Dict[str, Any]:
+                            is_bike: bool,
+                            on_delta: Optional[Callable[[str], None]] = None,
+                            cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
         """
         Generuj kompletne opisy produktu (długi i krótki)
         
+        Gdy pipelined=True (lub podano on_delta), długi opis jest strumieniowany,
+        a zapytanie o krótki opis startuje równolegle po zamknięciu pierwszej listy <ul>.
+        
         Args:
             data_manager: Manager danych produktu
             is_bike: Czy produkt to rower
+            on_delta: Jeśli podane, długi opis jest strumieniowany fragmentami do tej funkcji
+            cancel_event: Przerywa strumieniowanie długiego opisu
             
         Returns:
             Słownik z wynikami generowania
         """
+        trigger = None
         try:
             # Wybierz prompt i specyfikację
             prompt_file, specification = PromptSelector.select_prompt_and_spec(
@@ -177,13 +254,27 @@ class AIDescriptionGenerator:
             )
             
             # Generuj długi opis
-            long_desc_result = self.openai_client.generate_content(prompt)
-            
+            if on_delta or self.pipelined:
+                trigger = _ShortDescriptionTrigger(self.short_desc_generator, is_bike, on_delta)
+                long_desc_result = self.openai_client.generate_content_stream(
+                    prompt, trigger, cancel_event
+                )
+            else:
+                long_desc_result = self.openai_client.generate_content(prompt)
+                
+            if long_desc_result.get('cancelled'):
+                return {
+                    'success': False,
+                    'cancelled': True,
+                    'error': "Generowanie zostało przerwane",
+                    'cost': long_desc_result['cost'] + trigger.background_cost()
+                }
+                
             if not long_desc_result['success']:
                 return {
                     'success': False,
                     'error': f"Błąd generowania długiego opisu: {long_desc_result['error']}",
-                    'cost': 0
+                    'cost': trigger.background_cost() if trigger else 0
                 }
             
             # Zapisz długi opis
@@ -197,27 +288,39 @@ class AIDescriptionGenerator:
             data_manager.set_generated_description('long', long_description)
             
             total_cost = long_desc_result['cost']
+            saved_cost = long_desc_result.get('saved_cost', 0)
             
-            # Generuj krótki opis
-            short_desc_result = self.short_desc_generator.generate_short_description(
-                long_description, is_bike
-            )
+            # Krótki opis (już w toku, jeśli strumień zawierał </ul>)
+            if trigger:
+                short_desc_result = trigger.wait(long_description)
+            else:
+                short_desc_result = self.short_desc_generator.generate_short_description(
+                    long_description, is_bike
+                )
             
+            short_error = None
             if short_desc_result and short_desc_result['success']:
                 data_manager.set_generated_description('short', short_desc_result['content'])
                 total_cost += short_desc_result.get('cost', 0)
+                saved_cost += short_desc_result.get('saved_cost', 0)
+            elif short_desc_result:
+                short_error = short_desc_result.get('error')
+                total_cost += short_desc_result.get('cost', 0)
             
             return {
                 'success': True,
                 'long_description': long_description,
                 'short_description': data_manager.generated_descriptions.short,
                 'cost': total_cost,
-                'prompt_file': prompt_file
+                'saved_cost': saved_cost,
+                'prompt_file': prompt_file,
+                'first_token_time': long_desc_result.get('first_token_time'),
+                'short_error': short_error
             }
             
         except Exception as e:
             return {
                 'success': False,
                 'error': f"Wystąpił błąd podczas generowania opisów: {str(e)}",
-                'cost': 0
-            }
\ No newline at end of file
+                'cost': trigger.background_cost() if trigger else 0
+            }
@@ -1,25 +1,251 @@
 # api_client.py
 import requests
 import json
-from typing import Dict, Any, Optional
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Iterator, Callable
+from urllib.parse import quote_plus, urlencode
+from response_cache import ResponseCache, make_cache_key, CACHE_USE, CACHE_OFF
+from product_cache import ProductCache
+
+# Domyślne limity puli połączeń (na host)
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
+
+# Domyślna liczba równoczesnych pobrań produktów (nie więcej niż pula)
+DEFAULT_FETCH_CONCURRENCY = 8
+
+# Timeouty (connect, read) w sekundach
+GSPORT_TIMEOUT = (5, 30)
+OPENAI_TIMEOUT = (5, 120)
+
+OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
+
+# Konserwatywne oszacowanie liczby tokenów dla polskiego tekstu
+CHARS_PER_TOKEN = 3.0
+MESSAGE_OVERHEAD_TOKENS = 7
+
+# Liczba znaków pliku XML kodowanych naraz przy wysyłce strumieniowej
+FORM_STREAM_CHUNK_CHARS = 256 * 1024
+
+# Słowa oznaczające błąd w odpowiedzi addUpdateProducts
+UPDATE_ERROR_PATTERN = re.compile(r"error|błąd|błęd|fail", re.IGNORECASE)
+# Podsumowanie bez błędów ("0 errors", "errors: 0", "błędów: 0")
+UPDATE_NO_ERRORS_PATTERN = re.compile(
+    r"\b0\s+(?:error|błąd|błęd|fail)\w*|\b(?:error|błąd|błęd|fail)\w*\s*[:=]\s*0\b",
+    re.IGNORECASE
+)
+# Komunikat błędu całego zapytania - linia zaczynająca się od "Error:", "Błąd:", "Failed -" itp.
+UPDATE_ERROR_LINE_PATTERN = re.compile(r"^\s*(?:error|błąd|błęd|fail)\w*\s*[:!-]", re.IGNORECASE)
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def create_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool
+    
+    Args:
+        pool_connections: Number of per-host pools to cache
+        pool_maxsize: Maximum number of kept-alive connections per host
+        
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text from its length
+    
+    Args:
+        text: Prompt or completion text
+        
+    Returns:
+        Estimated token count (rounded up, with message overhead)
+    """
+    return int(math.ceil(len(text) / CHARS_PER_TOKEN)) + MESSAGE_OVERHEAD_TOKENS
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Get the process-wide session shared by all API clients
+    
+    Returns:
+        Shared requests.Session (created on first use)
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def _mentions_error(text: str) -> bool:
+    """Whether text reports an error (a zero-count summary such as "0 errors" does not)"""
+    return bool(UPDATE_ERROR_PATTERN.search(text)) and not UPDATE_NO_ERRORS_PATTERN.search(text)
+
+
+def _is_item_ok(value: Any) -> bool:
+    """Interpret a single status value from an update response"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, dict):
+        if value.get("error") or value.get("errors"):
+            return False
+        status = value.get("status", value.get("result", ""))
+        return not _mentions_error(str(status))
+    if isinstance(value, (list, tuple)):
+        return all(_is_item_ok(item) for item in value)
+    return not _mentions_error(str(value))
+
+
+def parse_update_response(text: str, product_ids: List[str]) -> Dict[str, bool]:
+    """
+    Determine per-product success from an addUpdateProducts response body
+    
+    The response is accepted as JSON keyed by product ID, a JSON list of
+    items with prod_id, or plain text. In plain text, error lines that
+    mention product IDs fail only those products. A line without IDs fails
+    the whole request only if it is an error message ("Error: ...",
+    "Błąd: ..."); other mentions such as "0 errors" summaries are ignored,
+    so an HTTP 200 without an error payload counts as success.
+    
+    Args:
+        text: Response body
+        product_ids: IDs of the products sent in the request
+        
+    Returns:
+        Mapping of product ID to update success
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+        
+    if isinstance(data, dict):
+        keyed = {str(key): value for key, value in data.items()}
+        if any(product_id in keyed for product_id in product_ids):
+            return {
+                product_id: product_id in keyed and _is_item_ok(keyed[product_id])
+                for product_id in product_ids
+            }
+        ok = _is_item_ok(data)
+        return {product_id: ok for product_id in product_ids}
+        
+    if isinstance(data, list):
+        items = {
+            str(item.get("prod_id")): item
+            for item in data if isinstance(item, dict) and "prod_id" in item
+        }
+        if items:
+            return {
+                product_id: product_id in items and _is_item_ok(items[product_id])
+                for product_id in product_ids
+            }
+        ok = _is_item_ok(data)
+        return {product_id: ok for product_id in product_ids}
+        
+    results = {product_id: True for product_id in product_ids}
+    for line in (text or "").splitlines():
+        if not _mentions_error(line):
+            continue
+        failed = [
+            product_id for product_id in product_ids
+            if re.search(rf"\b{re.escape(product_id)}\b", line)
+        ]
+        if not failed and UPDATE_ERROR_LINE_PATTERN.match(line):
+            failed = product_ids
+        for product_id in failed:
+            results[product_id] = False
+    return results
+
+
+class FileFormBody:
+    """
+    URL-encoded form body whose last field is streamed from a text file
+    
+    requests sends a body with __len__ and __iter__ with a Content-Length
+    header and writes it chunk by chunk, so the file is never held in memory
+    as a whole. The file is read twice: once to compute the length, once
+    while sending.
+    """
+    
+    def __init__(self, fields: Dict[str, str], file_field: str, path: str,
+                 chunk_chars: int = FORM_STREAM_CHUNK_CHARS):
+        """
+        Args:
+            fields: Regular form fields (sent first)
+            file_field: Name of the field holding the file content
+            path: Path of the UTF-8 text file
+            chunk_chars: Number of characters encoded at a time
+        """
+        self.prefix = f"{urlencode(fields)}&{quote_plus(file_field)}=".encode("ascii")
+        self.path = path
+        self.chunk_chars = chunk_chars
+        self.length = len(self.prefix) + sum(len(chunk) for chunk in self._encoded_chunks())
+        
+    def _encoded_chunks(self) -> Iterator[bytes]:
+        # newline="" - the file is sent exactly as written
+        with open(self.path, "r", encoding="utf-8", newline="") as file:
+            while True:
+                chunk = file.read(self.chunk_chars)
+                if not chunk:
+                    break
+                yield quote_plus(chunk).encode("ascii")
+                
+    def __len__(self) -> int:
+        return self.length
+        
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.prefix
+        yield from self._encoded_chunks()
+
 
 class GSportAPIClient:
     """Client for GSport API operations"""
     
-    def __init__(self, api_url: str, api_key: str):
+    def __init__(self, api_url: str, api_key: str,
+                 session: Optional[requests.Session] = None,
+                 timeout: Tuple[float, float] = GSPORT_TIMEOUT,
+                 cache: Optional[ProductCache] = None):
         self.api_url = api_url
         self.api_key = api_key
+        self.session = session or get_shared_session()
+        self.timeout = timeout
+        self.cache = cache
         
-    def get_product_data(self, product_id: str) -> Optional[Dict[str, Any]]:
+    def get_product_data(self, product_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Fetch product data from GSport API
         
+        With a cache, fresh entries are returned without a request. Stale
+        entries are revalidated with If-None-Match / If-Modified-Since when
+        the server sent validators.
+        
         Args:
             product_id: Product ID to fetch
+            use_cache: Set to False to force a full download
             
         Returns:
             Dictionary with product data or None if failed
         """
+        entry = self.cache.get(product_id) if self.cache and use_cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record_hit()
+            return self.cache.get_data(entry)
+            
         params = {
             "function": "getProductData",
             "APIkey": self.api_key,
@@ -27,15 +253,83 @@ class GSportAPIClient:
             "lang": "pl"
         }
         
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+                
         try:
-            response = requests.get(self.api_url, params=params)
+            response = self.session.get(
+                self.api_url, params=params, headers=headers, timeout=self.timeout
+            )
+            
+            if response.status_code == 304 and entry is not None:
+                self.cache.touch(product_id, entry)
+                self.cache.record_hit()
+                return self.cache.get_data(entry)
+                
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.RequestException as e:
             raise Exception(f"API request failed: {str(e)}")
         except json.JSONDecodeError:
             raise Exception("Invalid JSON response from API")
             
+        if self.cache:
+            self.cache.record_miss()
+            if data:
+                self.cache.put(
+                    product_id, data,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
+                
+        return data
+        
+    def get_products_data(self, product_ids: Iterable[str],
+                          max_workers: int = DEFAULT_FETCH_CONCURRENCY) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch many products concurrently, yielding results as they complete
+        
+        At most max_workers requests are in flight at once. Keep it at or
+        below the session pool size so connections are reused.
+        
+        Args:
+            product_ids: Product IDs to fetch (may be a lazy iterable)
+            max_workers: Concurrency cap
+            
+        Returns:
+            Iterator of dicts with product_id, success, data/error
+        """
+        ids = iter(product_ids)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            
+            def submit_next() -> bool:
+                product_id = next(ids, None)
+                if product_id is None:
+                    return False
+                pending[executor.submit(self.get_product_data, product_id)] = product_id
+                return True
+                
+            for _ in range(max_workers):
+                if not submit_next():
+                    break
+                    
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    product_id = pending.pop(future)
+                    try:
+                        result = {'product_id': product_id, 'success': True, 'data': future.result()}
+                    except Exception as e:
+                        result = {'product_id': product_id, 'success': False, 'error': str(e)}
+                    submit_next()
+                    yield result
+                    
     def update_product(self, xml_content: str) -> bool:
         """
         Update product data via GSport API
@@ -46,72 +340,169 @@ class GSportAPIClient:
         Returns:
             True if successful, False otherwise
         """
+        response = self._post_update(xml_content)
+        success = response is not None and response.status_code == 200
+        
+        if success and self.cache:
+            for product_id in re.findall(r"<prod_id>([^<]*)</prod_id>", xml_content):
+                self.cache.invalidate(product_id)
+                
+        return success
+        
+    def update_products(self, xml_content: str, product_ids: List[str]) -> Dict[str, bool]:
+        """
+        Update several products with one addUpdateProducts call
+        
+        Args:
+            xml_content: XML document with one <item> per product
+            product_ids: IDs of the products in the document
+            
+        Returns:
+            Mapping of product ID to update success
+        """
+        return self._finish_products_update(self._post_update(xml_content), product_ids)
+        
+    def update_products_file(self, xml_path: str, product_ids: List[str]) -> Dict[str, bool]:
+        """
+        Update several products from an XML file streamed straight from disk
+        
+        Args:
+            xml_path: Path of the XML document (UTF-8) with one <item> per product
+            product_ids: IDs of the products in the document
+            
+        Returns:
+            Mapping of product ID to update success
+        """
+        return self._finish_products_update(self._post_update(xml_path=xml_path), product_ids)
+        
+    def _finish_products_update(self, response: Optional[requests.Response],
+                                product_ids: List[str]) -> Dict[str, bool]:
+        """Parse per-product results and drop updated products from the cache"""
+        if response is None or response.status_code != 200:
+            return {product_id: False for product_id in product_ids}
+            
+        results = parse_update_response(response.text, product_ids)
+        
+        # Dane w sklepie się zmieniły - następne pobranie musi być pełne
+        if self.cache:
+            for product_id, success in results.items():
+                if success:
+                    self.cache.invalidate(product_id)
+                    
+        return results
+        
+    def _post_update(self, xml_content: Optional[str] = None,
+                     xml_path: Optional[str] = None) -> Optional[requests.Response]:
+        """
+        Send addUpdateProducts request
+        
+        Args:
+            xml_content: XML content with product updates
+            xml_path: Path of an XML file to stream instead of xml_content
+            
+        Returns:
+            Response, or None if the request failed
+        """
         headers = {
             "Content-Type": "application/x-www-form-urlencoded"
         }
         
-        data = {
+        fields = {
             "function": "addUpdateProducts",
             "APIkey": self.api_key,
             "importType": "update",
-            "prodIndex": "prod_id",
-            "xml": xml_content
+            "prodIndex": "prod_id"
         }
         
         try:
-            response = requests.post(
+            if xml_path is not None:
+                data = FileFormBody(fields, "xml", xml_path)
+            else:
+                data = dict(fields, xml=xml_content)
+                
+            response = self.session.post(
                 self.api_url,
                 data=data,
-                headers=headers
+                headers=headers,
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
                 print(f"Update successful: {response.text}")
-                return True
             else:
                 print(f"Update failed {response.status_code}: {response.text}")
-                return False
+            return response
                 
         except requests.RequestException as e:
             print(f"Update request failed: {str(e)}")
-            return False
+            return None
 
 
 class OpenAIClient:
     """Client for OpenAI API operations"""
     
-    def __init__(self, api_key: str, model: str, max_tokens: int):
+    def __init__(self, api_key: str, model: str, max_tokens: int,
+                 session: Optional[requests.Session] = None,
+                 timeout: Tuple[float, float] = OPENAI_TIMEOUT,
+                 api_url: str = OPENAI_API_URL,
+                 cache: Optional[ResponseCache] = None,
+                 cache_mode: str = CACHE_USE):
         self.api_key = api_key
         self.model = model
         self.max_tokens = max_tokens
-        self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.api_url = api_url
+        self.session = session or get_shared_session()
+        self.timeout = timeout
+        self.cache = cache
+        self.cache_mode = cache_mode
         
-    def generate_content(self, prompt: str) -> Dict[str, Any]:
+    def get_cached(self, prompt: str) -> Optional[Dict[str, Any]]:
         """
-        Generate content using OpenAI API
+        Look up a cached response for the prompt
         
         Args:
-            prompt: The prompt to send to the API
+            prompt: The fully rendered prompt
             
         Returns:
-            Dictionary with success status, content/error, and cost
+            Result dictionary (cost 0, saved_cost set) or None on miss
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
+        if not self.cache or self.cache_mode != CACHE_USE:
+            return None
+            
+        entry = self.cache.get(make_cache_key(self.model, self.max_tokens, prompt))
+        if not entry:
+            return None
+            
+        return {
+            'success': True,
+            'content': entry['content'],
+            'cost': 0,
+            'saved_cost': entry.get('cost', 0),
+            'usage': entry.get('usage', {}),
+            'cached': True
         }
         
-        data = {
-            "model": self.model,
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": self.max_tokens
-        }
+    def generate_content(self, prompt: str, check_cache: bool = True) -> Dict[str, Any]:
+        """
+        Generate content using OpenAI API
         
+        Args:
+            prompt: The prompt to send to the API
+            check_cache: Look up the response cache first
+            
+        Returns:
+            Dictionary with success status, content/error, and cost
+        """
+        cached = self.get_cached(prompt) if check_cache else None
+        if cached:
+            return cached
+            
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
-                headers=headers,
-                data=json.dumps(data)
+                headers=self._build_headers(),
+                data=json.dumps(self._build_payload(prompt)),
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
@@ -119,29 +510,27 @@ class OpenAIClient:
                 
                 # Calculate cost
                 usage = response_data['usage']
-                cost = (
-                    usage['prompt_tokens'] * INPUT_COST + 
-                    usage['completion_tokens'] * OUTPUT_COST
-                )
+                cost = self._calculate_cost(usage)
+                content = response_data['choices'][0]['message']['content']
                 
+                self._store_in_cache(prompt, content, usage, cost)
+                    
                 return {
                     'success': True,
-                    'content': response_data['choices'][0]['message']['content'],
+                    'content': content,
                     'cost': cost,
-                    'usage': usage
+                    'usage': usage,
+                    'cached': False
                 }
             else:
-                return {
-                    'success': False,
-                    'error': f"API error {response.status_code}: {response.text}",
-                    'cost': 0
-                }
+                return self._error_result(response)
                 
         except requests.RequestException as e:
             return {
                 'success': False,
                 'error': f"Request failed: {str(e)}",
-                'cost': 0
+                'cost': 0,
+                'transport_error': True
             }
         except (KeyError, json.JSONDecodeError) as e:
             return {
@@ -149,6 +538,159 @@ class OpenAIClient:
                 'error': f"Invalid response format: {str(e)}",
                 'cost': 0
             }
+            
+    def generate_content_stream(self, prompt: str, on_delta: Callable[[str], None],
+                                cancel_event: Optional[threading.Event] = None,
+                                check_cache: bool = True) -> Dict[str, Any]:
+        """
+        Generate content with server-sent events, reporting deltas as they arrive
+        
+        Args:
+            prompt: The prompt to send to the API
+            on_delta: Called (from the calling thread) with each content chunk
+            cancel_event: When set, the stream is closed and generation stops
+            check_cache: Look up the response cache first
+            
+        Returns:
+            Dictionary like generate_content plus first_token_time; on cancel
+            success is False, cancelled is True and cost is an estimate; a
+            transport error after the first chunk also sets partial
+        """
+        cached = self.get_cached(prompt) if check_cache else None
+        if cached:
+            on_delta(cached['content'])
+            return dict(cached, first_token_time=0.0)
+            
+        payload = self._build_payload(prompt)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        
+        started = time.perf_counter()
+        first_token_time = None
+        parts = []
+        usage = None
+        
+        try:
+            with self.session.post(
+                self.api_url,
+                headers=self._build_headers(),
+                data=json.dumps(payload),
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    return self._error_result(response)
+                    
+                for chunk in self._iter_sse_chunks(response):
+                    if cancel_event is not None and cancel_event.is_set():
+                        content = ''.join(parts)
+                        estimated_usage = {
+                            'prompt_tokens': estimate_tokens(prompt),
+                            'completion_tokens': estimate_tokens(content)
+                        }
+                        return {
+                            'success': False,
+                            'cancelled': True,
+                            'error': "Generation cancelled",
+                            'content': content,
+                            'cost': self._calculate_cost(estimated_usage),
+                            'usage': estimated_usage,
+                            'first_token_time': first_token_time
+                        }
+                        
+                    if chunk.get('usage'):
+                        usage = chunk['usage']
+                        
+                    for choice in chunk.get('choices') or []:
+                        delta = (choice.get('delta') or {}).get('content')
+                        if delta:
+                            if first_token_time is None:
+                                first_token_time = time.perf_counter() - started
+                            parts.append(delta)
+                            on_delta(delta)
+                            
+        except requests.RequestException as e:
+            return {
+                'success': False,
+                'error': f"Request failed: {str(e)}",
+                'cost': 0,
+                'transport_error': True,
+                # Part of the content already went to on_delta - a retry would repeat it
+                'partial': bool(parts)
+            }
+        except (KeyError, ValueError) as e:
+            return {
+                'success': False,
+                'error': f"Invalid response format: {str(e)}",
+                'cost': 0
+            }
+            
+        content = ''.join(parts)
+        if usage is None:
+            usage = {
+                'prompt_tokens': estimate_tokens(prompt),
+                'completion_tokens': estimate_tokens(content)
+            }
+        cost = self._calculate_cost(usage)
+        self._store_in_cache(prompt, content, usage, cost)
+        
+        return {
+            'success': True,
+            'content': content,
+            'cost': cost,
+            'usage': usage,
+            'cached': False,
+            'first_token_time': first_token_time
+        }
+        
+    @staticmethod
+    def _iter_sse_chunks(response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Parse 'data:' lines of an SSE stream into JSON chunks"""
+        # Dekoduj ręcznie: dla text/event-stream requests zakłada ISO-8859-1
+        for raw_line in response.iter_lines():
+            if not raw_line.startswith(b"data:"):
+                continue
+            data = raw_line[5:].strip()
+            if data == b"[DONE]":
+                break
+            yield json.loads(data.decode("utf-8"))
+            
+    def _build_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        
+    def _build_payload(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": self.max_tokens
+        }
+        
+    @staticmethod
+    def _calculate_cost(usage: Dict[str, int]) -> float:
+        return (
+            usage['prompt_tokens'] * INPUT_COST + 
+            usage['completion_tokens'] * OUTPUT_COST
+        )
+        
+    @staticmethod
+    def _error_result(response: requests.Response) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': f"API error {response.status_code}: {response.text}",
+            'cost': 0,
+            'status_code': response.status_code,
+            'retry_after': response.headers.get('Retry-After')
+        }
+        
+    def _store_in_cache(self, prompt: str, content: str, usage: Dict[str, int], cost: float) -> None:
+        if self.cache and self.cache_mode != CACHE_OFF:
+            self.cache.put(
+                make_cache_key(self.model, self.max_tokens, prompt),
+                {'content': content, 'usage': usage, 'cost': cost}
+            )
 
 
 # Import cost constants from config
@@ -0,0 +1,349 @@
+# batch_processor.py
+"""
+Przetwarzanie wsadowe bez interfejsu Tk
+
+Pobiera dane produktów, generuje opisy AI i publikuje je w sklepie dla
+listy ID lub linków Sky-Shop (z pliku lub stdin). Wynik każdego produktu
+trafia do raportu CSV.
+
+Użycie:
+    python batch_processor.py lista_produktow.txt
+    cat lista.txt | python batch_processor.py - --not-bike --dry-run
+    python batch_processor.py lista.txt --workers 16 --rpm 500 --tpm 200000
+    python batch_processor.py lista.txt --batch-size 100
+"""
+import argparse
+import csv
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+from dataclasses import dataclass, asdict, fields
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from api_client import GSportAPIClient, OpenAIClient, create_session, DEFAULT_POOL_MAXSIZE
+from response_cache import ResponseCache, CACHE_MODES, CACHE_USE
+from product_data_manager import ProductDataManager
+from ai_description_generator import AIDescriptionGenerator
+from generation_scheduler import (
+    GenerationScheduler,
+    RateLimitedOpenAIClient,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TOKENS_PER_MINUTE
+)
+from xml_builder import XMLBuilder
+from product_publisher import ProductPublisher, DEFAULT_PUBLISH_BATCH_SIZE
+from utils import parse_product_id, save_xml_copy
+
+@dataclass
+class BatchResult:
+    """Wynik przetwarzania pojedynczego produktu"""
+    input: str
+    product_id: str = ""
+    status: str = ""  # ok / dry_run / generated / invalid / not_found / fetch_error / generate_error / update_error / error
+    prompt_file: str = ""
+    cost: float = 0.0
+    saved_cost: float = 0.0
+    duration: float = 0.0
+    error: str = ""
+
+
+def read_product_inputs(stream: TextIO) -> List[str]:
+    """
+    Wczytaj linie z ID lub linkami produktów
+    
+    Args:
+        stream: Strumień wejściowy (plik lub stdin)
+        
+    Returns:
+        Lista niepustych linii (bez komentarzy zaczynających się od #)
+    """
+    inputs = []
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            inputs.append(line)
+    return inputs
+
+
+class BatchProcessor:
+    """Silnik wsadowy: pobranie -> generowanie AI -> XML -> aktualizacja w sklepie"""
+    
+    def __init__(self, gsport_client: GSportAPIClient, openai_client: OpenAIClient,
+                 is_bike: bool = True, publish: bool = True, output_dir: str = "output",
+                 workers: int = 1, batch_size: int = DEFAULT_PUBLISH_BATCH_SIZE):
+        self.gsport_client = gsport_client
+        self.openai_client = openai_client
+        self.ai_generator = AIDescriptionGenerator(openai_client)
+        self.is_bike = is_bike
+        self.publish = publish
+        self.output_dir = output_dir
+        self.workers = workers
+        self.publisher = ProductPublisher(gsport_client, batch_size, output_dir)
+        
+    def process_product(self, raw_input: str) -> BatchResult:
+        """
+        Przetwórz jeden produkt (z osobną publikacją)
+        
+        Args:
+            raw_input: ID produktu lub link Sky-Shop
+            
+        Returns:
+            BatchResult ze statusem i kosztem
+        """
+        result, data_manager = self.generate_product(raw_input)
+        if data_manager is not None:
+            self._publish([(result, data_manager)])
+        return result
+        
+    def generate_product(self, raw_input: str) -> Tuple[BatchResult, Optional[ProductDataManager]]:
+        """
+        Pobierz dane i wygeneruj opisy jednego produktu
+        
+        Args:
+            raw_input: ID produktu lub link Sky-Shop
+            
+        Returns:
+            BatchResult oraz manager danych gotowy do publikacji (None jeśli nie ma czego publikować)
+        """
+        result = BatchResult(input=raw_input)
+        started = time.perf_counter()
+        
+        try:
+            product_id = parse_product_id(raw_input)
+            if not product_id:
+                result.status = "invalid"
+                result.error = "Nieprawidłowe ID lub link Sky-Shop"
+                return result, None
+            result.product_id = product_id
+            
+            # Pobierz dane produktu
+            try:
+                api_data = self.gsport_client.get_product_data(product_id)
+            except Exception as e:
+                result.status = "fetch_error"
+                result.error = str(e)
+                return result, None
+                
+            if not api_data:
+                result.status = "not_found"
+                result.error = "Nie znaleziono danych dla podanego ID"
+                return result, None
+                
+            data_manager = ProductDataManager()
+            data_manager.load_from_api(api_data)
+            data_manager.product_data.product_id = product_id
+            
+            # Generuj opisy
+            generated = self.ai_generator.generate_descriptions(data_manager, self.is_bike)
+            result.cost = generated.get('cost', 0)
+            result.saved_cost = generated.get('saved_cost', 0)
+            result.prompt_file = generated.get('prompt_file', "")
+            
+            if not generated['success']:
+                result.status = "generate_error"
+                result.error = generated['error']
+                return result, None
+                
+            if generated.get('short_error'):
+                # Długi opis jest gotowy - produkt idzie dalej, ale bez krótkiego opisu
+                result.error = f"Krótki opis: {generated['short_error']}"
+                
+            if not self.publish:
+                save_xml_copy(
+                    XMLBuilder.iter_products_xml([(product_id, data_manager)]),
+                    product_id,
+                    os.path.join(self.output_dir, "dry_run")
+                )
+                result.status = "dry_run"
+                return result, None
+                
+            result.status = "generated"
+            return result, data_manager
+            
+        except Exception as e:
+            # Błąd jednego produktu (dane API, generowanie, zapis XML) nie przerywa całej partii
+            result.status = "error"
+            result.error = str(e)
+            return result, None
+            
+        finally:
+            result.duration = time.perf_counter() - started
+            
+    def _publish(self, pending: List[Tuple[BatchResult, ProductDataManager]]) -> None:
+        """
+        Opublikuj wygenerowane produkty paczkami (jedno zapytanie na paczkę)
+        
+        Args:
+            pending: Pary (wynik, manager danych) ze statusem "generated"
+        """
+        updated = self.publisher.publish(
+            (result.product_id, data_manager) for result, data_manager in pending
+        )
+        
+        for result, _ in pending:
+            if updated.get(result.product_id):
+                result.status = "ok"
+            else:
+                result.status = "update_error"
+                result.error = "Aktualizacja produktu nie powiodła się"
+                
+        succeeded = sum(1 for result, _ in pending if result.status == "ok")
+        print(f"Opublikowano paczkę: {succeeded}/{len(pending)} produktów zaktualizowanych")
+        
+    def run(self, inputs: Iterable[str]) -> List[BatchResult]:
+        """
+        Przetwórz listę produktów (po kolei lub w puli wątków gdy workers > 1)
+        
+        Wygenerowane produkty są publikowane paczkami po batch_size, gdy tylko
+        paczka się zapełni - generowanie kolejnych trwa w tym czasie w tle.
+        
+        Args:
+            inputs: ID lub linki produktów
+            
+        Returns:
+            Lista wyników w kolejności wejścia
+        """
+        inputs = list(inputs)
+        results: List[Optional[BatchResult]] = [None] * len(inputs)
+        pending: List[Tuple[BatchResult, ProductDataManager]] = []
+        
+        client = self.openai_client if isinstance(self.openai_client, RateLimitedOpenAIClient) else None
+        scheduler = GenerationScheduler(max_workers=self.workers, client=client) if self.workers > 1 else None
+        
+        try:
+            for done, (index, result, data_manager) in enumerate(self._generate_all(inputs, scheduler), 1):
+                results[index] = result
+                self._print_progress(done, len(inputs), result, scheduler.stats() if scheduler else None)
+                
+                if data_manager is not None:
+                    pending.append((result, data_manager))
+                if len(pending) >= self.publisher.batch_size:
+                    self._publish(pending)
+                    pending = []
+                    
+            if pending:
+                self._publish(pending)
+        finally:
+            if scheduler:
+                scheduler.shutdown()
+                
+        return results
+        
+    def _generate_all(self, inputs: List[str], scheduler: Optional[GenerationScheduler]
+                      ) -> Iterator[Tuple[int, BatchResult, Optional[ProductDataManager]]]:
+        """Generuj produkty po kolei lub w puli i zwracaj je w kolejności ukończenia"""
+        if scheduler is None:
+            for index, raw_input in enumerate(inputs):
+                yield (index, *self.generate_product(raw_input))
+            return
+            
+        futures = {
+            scheduler.submit(self.generate_product, raw_input): index
+            for index, raw_input in enumerate(inputs)
+        }
+        for future in as_completed(futures):
+            yield (futures[future], *future.result())
+            
+    def _print_progress(self, done: int, total: int, result: BatchResult,
+                        stats: Optional[dict] = None) -> None:
+        """Wypisz postęp przetwarzania"""
+        line = (
+            f"[{done}/{total}] {result.product_id or result.input}: {result.status} "
+            f"({result.cost * 100:.5f}¢, {result.duration:.1f}s) {result.error}"
+        )
+        if stats:
+            line += " | " + " ".join(f"{key}={value}" for key, value in stats.items())
+        print(line)
+        
+    def write_report(self, results: List[BatchResult], report_path: Optional[str] = None) -> str:
+        """
+        Zapisz raport CSV z wynikami
+        
+        Args:
+            results: Wyniki przetwarzania
+            report_path: Ścieżka raportu (domyślnie output/batch/<timestamp>_report.csv)
+            
+        Returns:
+            Ścieżka zapisanego raportu
+        """
+        if not report_path:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = os.path.join(self.output_dir, "batch", f"{timestamp}_report.csv")
+            
+        report_dir = os.path.dirname(report_path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+            
+        with open(report_path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=[f.name for f in fields(BatchResult)])
+            writer.writeheader()
+            for result in results:
+                writer.writerow(asdict(result))
+                
+        return report_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punkt wejścia CLI"""
+    parser = argparse.ArgumentParser(description="Wsadowe generowanie i publikacja opisów produktów")
+    parser.add_argument("input", help="plik z ID/linkami produktów (jeden na linię) lub '-' dla stdin")
+    parser.add_argument("--not-bike", action="store_true", help="użyj promptów dla produktów nie-rowerowych")
+    parser.add_argument("--dry-run", action="store_true", help="nie wysyłaj do sklepu, tylko zapisz XML")
+    parser.add_argument("--report", help="ścieżka raportu CSV")
+    parser.add_argument("--output-dir", default="output", help="folder na kopie XML i raporty")
+    parser.add_argument("--workers", type=int, default=1, help="liczba produktów przetwarzanych równolegle")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_REQUESTS_PER_MINUTE, help="limit zapytań OpenAI na minutę")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TOKENS_PER_MINUTE, help="limit tokenów OpenAI na minutę")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_PUBLISH_BATCH_SIZE,
+                        help="liczba produktów wysyłanych do sklepu w jednym zapytaniu")
+    parser.add_argument("--cache", choices=CACHE_MODES, default=CACHE_USE,
+                        help="cache odpowiedzi AI: use (domyślnie), refresh (wymuś nowe), off")
+    args = parser.parse_args(argv)
+    
+    from config import GSPORT_API_URL, GSPORT_API_KEY, GPT_API_KEY, MODEL, MAX_TOKENS
+    
+    if args.input == "-":
+        inputs = read_product_inputs(sys.stdin)
+    else:
+        with open(args.input, "r", encoding="utf-8") as file:
+            inputs = read_product_inputs(file)
+            
+    # Pula połączeń co najmniej tak duża jak liczba wątków
+    session = create_session(pool_maxsize=max(DEFAULT_POOL_MAXSIZE, args.workers))
+    
+    processor = BatchProcessor(
+        GSportAPIClient(GSPORT_API_URL, GSPORT_API_KEY, session=session),
+        RateLimitedOpenAIClient(
+            OpenAIClient(
+                GPT_API_KEY, MODEL, MAX_TOKENS, session=session,
+                cache=ResponseCache(), cache_mode=args.cache
+            ),
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm
+        ),
+        is_bike=not args.not_bike,
+        publish=not args.dry_run,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        batch_size=args.batch_size
+    )
+    
+    results = processor.run(inputs)
+    report_path = processor.write_report(results, args.report)
+    
+    succeeded = sum(1 for r in results if r.status in ("ok", "dry_run"))
+    total_cost = sum(r.cost for r in results)
+    saved_cost = sum(r.saved_cost for r in results)
+    print(
+        f"Przetworzono {succeeded}/{len(results)} produktów, koszt: {total_cost * 100:.5f}¢ USD, "
+        f"zaoszczędzono z cache: {saved_cost * 100:.5f}¢ USD"
+    )
+    print(f"Raport: {report_path}")
+    
+    return 0 if succeeded == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
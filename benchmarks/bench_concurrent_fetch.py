@@ -0,0 +1,73 @@
+# benchmarks/bench_concurrent_fetch.py
+"""
+Benchmark: przepustowość pobierania produktów (sekwencyjnie vs pula wątków)
+
+Stub API odpowiada z zadanym opóźnieniem, co symuluje czas odpowiedzi
+Sky-Shop. Wynik pokazuje produkty/s i szacowany czas dla 5000 produktów.
+
+Uruchomienie:
+    python benchmarks/bench_concurrent_fetch.py -n 400 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench_config  # noqa: F401 - config.py lub config_sample.py
+from api_client import GSportAPIClient, create_session
+from stub_server import StubServer
+
+
+def run_sequential(client: GSportAPIClient, product_ids) -> int:
+    """Pobieraj produkty jeden po drugim"""
+    errors = 0
+    for product_id in product_ids:
+        try:
+            client.get_product_data(product_id)
+        except Exception:
+            errors += 1
+    return errors
+
+
+def run_concurrent(client: GSportAPIClient, product_ids, workers: int) -> int:
+    """Pobieraj produkty przez get_products_data"""
+    return sum(1 for r in client.get_products_data(product_ids, max_workers=workers) if not r['success'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--products", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05, help="opóźnienie odpowiedzi stubu [s]")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+    
+    product_ids = [str(100000 + i) for i in range(args.products)]
+    
+    with StubServer(latency=args.latency) as server:
+        runs = [("sekwencyjnie", lambda c: run_sequential(c, product_ids), 10)]
+        runs += [
+            (f"pula x{w}", lambda c, w=w: run_concurrent(c, product_ids, w), w)
+            for w in args.workers
+        ]
+        
+        for label, runner, pool_size in runs:
+            session = create_session(pool_maxsize=pool_size)
+            client = GSportAPIClient(server.gsport_url, "stub", session=session)
+            server.stats.reset()
+            
+            start = time.perf_counter()
+            errors = runner(client)
+            elapsed = time.perf_counter() - start
+            session.close()
+            
+            rate = args.products / elapsed
+            print(
+                f"{label:14s} {rate:8.1f} produktów/s  błędy={errors:3d}  "
+                f"połączenia={server.stats.connections:3d}  5000 produktów ≈ {5000 / rate / 60:6.1f} min"
+            )
+
+
+if __name__ == "__main__":
+    main()
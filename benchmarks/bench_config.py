@@ -0,0 +1,15 @@
+# benchmarks/bench_config.py
+"""
+Konfiguracja dla benchmarków: config.py użytkownika, a gdy go brak - config_sample.py
+
+Benchmarki działają na stubie API, więc klucze nie są potrzebne. Import
+tego modułu (po dodaniu katalogu głównego do sys.path, przed modułami
+aplikacji) rejestruje config_sample jako config, jeśli config.py nie istnieje.
+"""
+import importlib
+import sys
+
+try:
+    import config  # noqa: F401
+except ImportError:
+    sys.modules["config"] = importlib.import_module("config_sample")
@@ -0,0 +1,65 @@
+# benchmarks/bench_connection_pool.py
+"""
+Benchmark: liczba otwartych połączeń TCP dla N kolejnych wywołań API
+
+Porównuje stare wywołania przez moduł requests (nowe połączenie na każde
+żądanie) z klientami korzystającymi ze wspólnej puli keep-alive.
+
+Uruchomienie:
+    python benchmarks/bench_connection_pool.py -n 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench_config  # noqa: F401 - config.py lub config_sample.py
+import requests
+from api_client import GSportAPIClient, OpenAIClient, create_session
+from stub_server import StubServer
+
+
+def run_unpooled(server: StubServer, calls: int) -> float:
+    """Wywołania przez requests.get/post bez sesji"""
+    start = time.perf_counter()
+    for i in range(calls):
+        requests.get(server.gsport_url, params={"function": "getProductData", "productID": str(i)})
+        requests.post(server.openai_url, json={"messages": [{"content": "x"}]})
+    return time.perf_counter() - start
+
+
+def run_pooled(server: StubServer, calls: int) -> float:
+    """Wywołania przez klientów API ze wspólną sesją"""
+    session = create_session()
+    gsport = GSportAPIClient(server.gsport_url, "stub", session=session)
+    openai = OpenAIClient("stub", "gpt-4o-mini", 16, session=session, api_url=server.openai_url)
+    
+    start = time.perf_counter()
+    for i in range(calls):
+        gsport.get_product_data(str(i))
+        openai.generate_content("x")
+    elapsed = time.perf_counter() - start
+    
+    session.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--calls", type=int, default=100, help="liczba par wywołań")
+    args = parser.parse_args()
+    
+    with StubServer() as server:
+        for label, runner in (("bez puli", run_unpooled), ("pula keep-alive", run_pooled)):
+            server.stats.reset()
+            elapsed = runner(server, args.calls)
+            print(
+                f"{label:16s} żądania={server.stats.requests:5d} "
+                f"połączenia={server.stats.connections:5d} czas={elapsed * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/bench_end_to_end.py
+"""
+Benchmark: pełny przebieg produktu na stubie API (bez sieci i kosztów)
+
+Pobranie danych (GSportAPIClient) -> generowanie długiego i krótkiego opisu
+(AIDescriptionGenerator + OpenAIClient z limitami RPM/TPM) -> XML
+(XMLBuilder) -> publikacja paczkami (addUpdateProducts). Raportuje
+produkty/min, p50/p95 czasu produktu, statusy, liczniki stubu oraz -
+w osobnym przebiegu z tracemalloc - szczyt i przyrost pamięci (łącznie ze
+stubem, który działa w tym samym procesie).
+
+Uruchomienie:
+    python benchmarks/bench_end_to_end.py -n 200 --workers 8
+    python benchmarks/bench_end_to_end.py -n 200 --workers 8 --error-rate 0.02 --rate-limit-rate 0.05
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import bench_config  # noqa: F401 - config.py lub config_sample.py
+from api_client import GSportAPIClient, OpenAIClient, create_session
+from batch_processor import BatchProcessor
+from generation_scheduler import RateLimitedOpenAIClient
+from stub_server import StubServer
+
+
+def percentile(values, fraction: float) -> float:
+    """Percentyl metodą najbliższego rzędu"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_processor(server: StubServer, args, output_dir: str) -> BatchProcessor:
+    """Złóż pełny pipeline wskazujący na stub"""
+    session = create_session(pool_maxsize=max(10, args.workers))
+    openai_client = RateLimitedOpenAIClient(
+        OpenAIClient("stub", "gpt-4o-mini", 4096, session=session, api_url=server.openai_url),
+        base_delay=0.1
+    )
+    return BatchProcessor(
+        GSportAPIClient(server.gsport_url, "stub", session=session),
+        openai_client,
+        output_dir=output_dir,
+        workers=args.workers,
+        batch_size=args.batch_size
+    )
+
+
+def run_pipeline(server: StubServer, args, product_ids):
+    """Przetwórz produkty i zwróć (wyniki, czas całkowity)"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        processor = build_processor(server, args, output_dir)
+        
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = processor.run(product_ids)
+        elapsed = time.perf_counter() - start
+        
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--products", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="opóźnienie odpowiedzi stubu [s]")
+    parser.add_argument("--jitter", type=float, default=0.02, help="losowe dodatkowe opóźnienie [s]")
+    parser.add_argument("--token-interval", type=float, default=0.005, help="odstęp między tokenami stubu [s]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="odsetek odpowiedzi 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="odsetek odpowiedzi 429 (OpenAI)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--alloc-products", type=int, default=20,
+                        help="liczba produktów w przebiegu z tracemalloc (0 = pomiń)")
+    args = parser.parse_args()
+    
+    # Prompty są wczytywane ścieżkami względnymi
+    os.chdir(ROOT_DIR)
+    
+    product_ids = [str(100000 + i) for i in range(args.products)]
+    
+    with StubServer(
+        latency=args.latency,
+        token_interval=args.token_interval,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    ) as server:
+        results, elapsed = run_pipeline(server, args, product_ids)
+        stub_stats = server.stats.as_dict()
+        
+        durations = [r.duration for r in results if r.status == "ok"]
+        statuses = Counter(r.status for r in results)
+        
+        print(f"Produkty: {args.products}, wątki: {args.workers}, paczka: {args.batch_size}")
+        print(f"Przepustowość: {args.products / elapsed * 60:8.1f} produktów/min ({elapsed:.2f}s)")
+        if durations:
+            print(
+                f"Czas produktu (pobranie + generowanie): p50 {percentile(durations, 0.5):.3f}s  "
+                f"p95 {percentile(durations, 0.95):.3f}s  max {max(durations):.3f}s"
+            )
+        print("Statusy: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items())))
+        print("Stub: " + ", ".join(f"{name}={value}" for name, value in stub_stats.items()))
+        
+        if args.alloc_products:
+            alloc_ids = product_ids[:args.alloc_products]
+            server.stats.reset()
+            
+            tracemalloc.start()
+            baseline, _ = tracemalloc.get_traced_memory()
+            run_pipeline(server, args, alloc_ids)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            print(
+                f"Pamięć ({len(alloc_ids)} produktów, tracemalloc): szczyt {(peak - baseline) / 1024:.0f} KiB, "
+                f"{(peak - baseline) / len(alloc_ids) / 1024:.1f} KiB/produkt, "
+                f"pozostało po przebiegu {(current - baseline) / 1024:.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
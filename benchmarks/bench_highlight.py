@@ -0,0 +1,213 @@
+# benchmarks/bench_highlight.py
+"""
+Benchmark: koszt podświetlania składni na naciśnięcie klawisza (pełny przebieg vs przyrostowy)
+
+Dla opisów HTML o rosnącej długości wpisuje znaki w środku dokumentu
+i mierzy czas odświeżenia podświetlenia po każdym z nich: dawną ścieżką
+SyntaxHighlighter (usunięcie wszystkich tagów, dwa wyrażenia regularne
+na całym tekście, index() na dopasowanie) oraz IncrementalHighlighter
+(tylko zmienione linie). Druga tabela porównuje nakładanie tagów w pełnym
+przebiegu obu tokenizerów (SyntaxHighlighter i HTMLTextWidget): index()
+i tag_add na fragment vs LineIndex i jedno tag_add na tag. Trzecia -
+strumieniowanie opisu kawałkami do HTMLTextWidget: pełny przebieg po
+każdym kawałku (dawne insert) vs jeden przebieg z batch_update().
+Wymaga ekranu (okno Tk jest ukryte).
+
+Uruchomienie:
+    python benchmarks/bench_highlight.py --sizes 2,5,15,50 -n 50
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+import tkinter as tk
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from html_highlighter import HIGHLIGHT_TAGS, LineIndex, apply_tokens, tokenize_html, tokenize_markup
+from html_text_widget import HTMLTextWidget
+from ui_components import SyntaxHighlighter
+
+STREAM_CHUNK_CHARS = 40
+
+PARAGRAPH = (
+    '<h3 class="section">Rama i amortyzacja</h3>\n'
+    '<p>Lekka rama z <strong>aluminium 6061</strong> i geometria trailowa '
+    'dają pewne prowadzenie na zjazdach.</p>\n'
+    '<ul class="specs">\n'
+    '<li data-key="fork">Amortyzator: <a href="https://www.gsport.pl/amortyzatory">RockShox 120 mm</a></li>\n'
+    '<li data-key="brakes">Hamulce: tarczowe hydrauliczne, tarcze 180/160 mm</li>\n'
+    '</ul>\n'
+)
+
+
+def legacy_highlight(text_widget) -> None:
+    """Dawna implementacja SyntaxHighlighter.highlight_syntax"""
+    for tag in ["html_tag", "html_attribute", "html_value"]:
+        text_widget.tag_remove(tag, "1.0", "end")
+        
+    content = text_widget.get("1.0", "end-1c")
+    
+    for match in re.finditer(r'</?(\w+)(?:\s+[^>]*)?>|</\w+>', content):
+        start = text_widget.index(f"1.0+{match.start()}c")
+        end = text_widget.index(f"1.0+{match.end()}c")
+        text_widget.tag_add("html_tag", start, end)
+        
+    for match in re.finditer(r'(\w+)=(["\'])([^"\']*)\2', content):
+        attr_start = text_widget.index(f"1.0+{match.start(1)}c")
+        attr_end = text_widget.index(f"1.0+{match.end(1)}c")
+        text_widget.tag_add("html_attribute", attr_start, attr_end)
+        
+        val_start = text_widget.index(f"1.0+{match.start(2)}c")
+        val_end = text_widget.index(f"1.0+{match.end(3)}c")
+        text_widget.tag_add("html_value", val_start, val_end)
+
+
+def legacy_apply(text_widget, tokens) -> None:
+    """Dawne nakładanie tagów: index("1.0+Nc") i tag_add na każdy fragment"""
+    for tag, start, end in tokens:
+        text_widget.tag_add(tag, text_widget.index(f"1.0+{start}c"), text_widget.index(f"1.0+{end}c"))
+
+
+def make_document(kib: int) -> str:
+    return PARAGRAPH * (kib * 1024 // len(PARAGRAPH) + 1)
+
+
+def measure_keystrokes(text_widget, refresh, keystrokes: int) -> list:
+    """Wpisz znaki w środku dokumentu i zmierz odświeżenie po każdym [s]"""
+    middle = int(text_widget.index("end").split(".")[0]) // 2
+    durations = []
+    for i in range(keystrokes):
+        text_widget.insert(f"{middle}.5", "x" if i % 2 == 0 else "<")
+        start = time.perf_counter()
+        refresh()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def percentiles(durations: list) -> tuple:
+    """Mediana i 95. percentyl [ms]"""
+    ordered = sorted(durations)
+    return statistics.median(ordered) * 1000, ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000
+
+
+def tag_ranges(text_widget, tags=HIGHLIGHT_TAGS) -> dict:
+    return {tag: [str(index) for index in text_widget.tag_ranges(tag)] for tag in tags}
+
+
+def compare_full_pass(root, sizes, iterations: int) -> None:
+    """Pełny przebieg: index() na fragment vs LineIndex + zbiorcze tag_add"""
+    print(f"\n{'tokenizer':17s} {'opis':>7s} {'fragmenty':>10s} {'index()':>10s} {'LineIndex':>10s} {'przyspieszenie':>15s}")
+    for label, tokenize in (("SyntaxHighlighter", tokenize_html), ("HTMLTextWidget", tokenize_markup)):
+        for kib in sizes:
+            document = make_document(kib)
+            tokens = list(tokenize(document))
+            legacy_widget = tk.Text(root)
+            legacy_widget.insert("1.0", document)
+            widget = tk.Text(root)
+            widget.insert("1.0", document)
+            
+            legacy = min(
+                timed(lambda: legacy_apply(legacy_widget, tokenize(document))) for _ in range(iterations)
+            )
+            batched = min(
+                timed(lambda: apply_tokens(widget, tokenize(document), LineIndex.from_text(document)))
+                for _ in range(iterations)
+            )
+            tags = sorted({token[0] for token in tokens})
+            if tag_ranges(widget, tags) != tag_ranges(legacy_widget, tags):
+                print(f"Uwaga: tagi różnią się ({label}, {kib} KiB)")
+                
+            print(
+                f"{label:17s} {kib:5d}KB {len(tokens):10d} {legacy * 1000:8.2f}ms "
+                f"{batched * 1000:8.2f}ms {legacy / batched:14.1f}x"
+            )
+            legacy_widget.destroy()
+            widget.destroy()
+
+
+def compare_streaming(root, sizes) -> None:
+    """Strumieniowanie do HTMLTextWidget: przebieg na kawałek vs batch_update()"""
+    print(f"\n{'opis':>7s} {'kawałki':>8s} {'przebieg na kawałek':>20s} {'batch_update':>13s}")
+    for kib in sizes:
+        document = make_document(kib)
+        chunks = [document[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(document), STREAM_CHUNK_CHARS)]
+        
+        def per_chunk(widget):
+            for chunk in chunks:
+                widget.insert("end", chunk)
+                widget.highlight_syntax()
+                
+        def batched(widget):
+            with widget.batch_update():
+                for chunk in chunks:
+                    widget.insert("end", chunk)
+                    
+        results = []
+        for stream in (per_chunk, batched):
+            widget = HTMLTextWidget(root)
+            results.append(timed(lambda: stream(widget)))
+            widget.destroy()
+            
+        print(f"{kib:5d}KB {len(chunks):8d} {results[0] * 1000:18.1f}ms {results[1] * 1000:11.1f}ms")
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="2,5,15,50", help="długości opisu [KiB] (po przecinku)")
+    parser.add_argument("-n", "--keystrokes", type=int, default=50)
+    parser.add_argument("--full-iterations", type=int, default=5, help="powtórzenia pełnego przebiegu")
+    args = parser.parse_args()
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Benchmark wymaga ekranu (Tk): {e}")
+    root.withdraw()
+    
+    sizes = [int(value) for value in args.sizes.split(",")]
+    print(f"{'opis':>7s} {'linie':>6s} {'pełny: p50':>11s} {'p95':>9s} {'przyrostowo: p50':>17s} {'p95':>9s}")
+    for kib in sizes:
+        document = make_document(kib)
+        
+        legacy_widget = tk.Text(root)
+        legacy_widget.insert("1.0", document)
+        legacy_highlight(legacy_widget)
+        legacy = measure_keystrokes(legacy_widget, lambda: legacy_highlight(legacy_widget), args.keystrokes)
+        
+        widget = tk.Text(root)
+        highlighter = SyntaxHighlighter.setup_text_widget(widget)
+        widget.insert("1.0", document)
+        highlighter.highlight()
+        incremental = measure_keystrokes(widget, highlighter.update, args.keystrokes)
+        
+        # Po tych samych zmianach podświetlenie musi być identyczne
+        if tag_ranges(widget) != tag_ranges(legacy_widget):
+            print(f"Uwaga: podświetlenie różni się od pełnego przebiegu ({kib} KiB)")
+            
+        legacy_p50, legacy_p95 = percentiles(legacy)
+        incremental_p50, incremental_p95 = percentiles(incremental)
+        lines = document.count("\n")
+        print(
+            f"{kib:5d}KB {lines:6d} {legacy_p50:9.2f}ms {legacy_p95:7.2f}ms "
+            f"{incremental_p50:15.2f}ms {incremental_p95:7.2f}ms"
+        )
+        legacy_widget.destroy()
+        widget.destroy()
+        
+    compare_full_pass(root, sizes, args.full_iterations)
+    compare_streaming(root, sizes)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# benchmarks/bench_image_decode.py
+"""
+Benchmark: dekodowanie + skalowanie zdjęć produktów (pełne dekodowanie vs Image.draft)
+
+Dla każdego trybu jakości ImageService (oraz dawnej ścieżki: pełne
+dekodowanie + LANCZOS) mierzy średni czas decode+resize do miniatury
+120x120 i podglądu 580x550 oraz przyrost szczytowej pamięci procesu
+(VmHWM / ru_maxrss w osobnym procesie na tryb - bufory Pillow nie są
+widoczne dla tracemalloc; na Windows pamięć nie jest mierzona).
+Bez --images generuje przykładowe JPEG w folderze tymczasowym.
+
+Uruchomienie:
+    python benchmarks/bench_image_decode.py --images ścieżka/do/zdjęć -n 20
+    python benchmarks/bench_image_decode.py -n 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from PIL import Image
+
+import bench_config  # noqa: F401 - config.py lub config_sample.py
+from image_cache import ImageCache
+from image_service import ImageService, QUALITY_MODES
+
+LEGACY = "legacy"
+SIZES = {"miniatura": (120, 120), "podgląd": (580, 550)}
+
+
+def legacy_decode(content: bytes, max_width: int, max_height: int) -> Image.Image:
+    """Dawna ścieżka ImageManager: pełne dekodowanie i LANCZOS"""
+    img = Image.open(BytesIO(content))
+    width, height = img.size
+    aspect_ratio = width / height
+    if aspect_ratio > 1:
+        size = (max_width, int(max_width / aspect_ratio))
+    else:
+        size = (int(max_height * aspect_ratio), max_height)
+    return img.resize(size, Image.Resampling.LANCZOS)
+
+
+def generate_samples(directory: str, count: int = 8) -> None:
+    """Zapisz przykładowe zdjęcia (gradient + szum) w typowych rozmiarach sklepu"""
+    sizes = [(500, 500), (1000, 750), (2000, 1500), (3000, 2000)]
+    for index in range(count):
+        width, height = sizes[index % len(sizes)]
+        gradient = Image.linear_gradient("L").resize((width, height))
+        noise = Image.effect_noise((width, height), 40 + index)
+        img = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+        img.save(os.path.join(directory, f"sample_{index}_{width}x{height}.jpg"), quality=85)
+
+
+def load_samples(directory: str):
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith((".jpg", ".jpeg"))
+    )
+    samples = []
+    for path in paths:
+        with open(path, "rb") as file:
+            samples.append(file.read())
+    return samples
+
+
+def peak_rss_kib():
+    """Szczytowe RSS procesu w KiB (None jeśli system go nie udostępnia)"""
+    try:
+        # Linux: VmHWM jest zerowane przy exec, w przeciwieństwie do ru_maxrss
+        with open("/proc/self/status", "r") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS podaje bajty
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def decoder(mode: str):
+    if mode == LEGACY:
+        return legacy_decode
+    service = ImageService(cache=ImageCache(cache_dir=None), quality=mode)
+    return lambda content, width, height: service.decode(content, width, height)
+
+
+def run_mode(mode: str, directory: str, iterations: int) -> dict:
+    """Zmierz czasy jednego trybu (wołane w osobnym procesie)"""
+    samples = load_samples(directory)
+    decode = decoder(mode)
+    baseline = peak_rss_kib()
+    
+    results = {}
+    for label, (width, height) in SIZES.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for content in samples:
+                decode(content, width, height)
+        results[label] = (time.perf_counter() - start) / (iterations * len(samples))
+        
+    peak = peak_rss_kib()
+    results["peak_kib"] = peak - baseline if peak is not None else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", help="folder z plikami JPEG (domyślnie wygenerowane próbki)")
+    parser.add_argument("-n", "--iterations", type=int, default=10)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(run_mode(args.worker, args.images, args.iterations)))
+        return
+        
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = args.images
+        if not directory:
+            generate_samples(temp_dir)
+            directory = temp_dir
+            
+        samples = load_samples(directory)
+        print(f"Zdjęcia: {len(samples)} ({sum(len(s) for s in samples) / 1024:.0f} KiB), powtórzenia: {args.iterations}")
+        print(f"{'tryb':10s} {'miniatura':>12s} {'podgląd':>12s} {'szczyt RSS':>12s}")
+        
+        for mode in (LEGACY,) + QUALITY_MODES:
+            # Osobny proces - szczyt pamięci nie maleje, więc tryby nie mogą dzielić procesu
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", mode,
+                 "--images", directory, "-n", str(args.iterations)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output)
+            peak = f"{result['peak_kib'] / 1024:9.1f}MiB" if result["peak_kib"] is not None else f"{'n/d':>12s}"
+            print(f"{mode:10s} {result['miniatura'] * 1000:10.2f}ms {result['podgląd'] * 1000:10.2f}ms {peak}")
+
+
+if __name__ == "__main__":
+    main()
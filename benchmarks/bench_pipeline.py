@@ -0,0 +1,73 @@
+# benchmarks/bench_pipeline.py
+"""
+Benchmark: czas generowania opisów produktu (sekwencyjnie vs potokowo)
+
+Tryb sekwencyjny czeka na cały długi opis, a dopiero potem pyta o krótki.
+Tryb potokowy strumieniuje długi opis i wysyła zapytanie o krótki opis
+zaraz po zamknięciu pierwszej listy </ul>.
+
+Uruchomienie:
+    python benchmarks/bench_pipeline.py -n 10 --token-interval 0.02
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import bench_config  # noqa: F401 - config.py lub config_sample.py
+from api_client import OpenAIClient, create_session
+from product_data_manager import ProductDataManager
+from ai_description_generator import AIDescriptionGenerator
+from stub_server import StubServer, sample_product
+
+
+def run(generator: AIDescriptionGenerator, products) -> list:
+    """Wygeneruj opisy dla produktów i zwróć czasy [s]"""
+    durations = []
+    for api_data in products:
+        data_manager = ProductDataManager()
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_manager.load_from_api(api_data)
+            
+        start = time.perf_counter()
+        result = generator.generate_descriptions(data_manager, is_bike=True)
+        durations.append(time.perf_counter() - start)
+        
+        if not result['success']:
+            raise RuntimeError(result['error'])
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--products", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="opóźnienie odpowiedzi stubu [s]")
+    parser.add_argument("--token-interval", type=float, default=0.02, help="odstęp między tokenami stubu [s]")
+    args = parser.parse_args()
+    
+    # Prompty są wczytywane ścieżkami względnymi
+    os.chdir(ROOT_DIR)
+    
+    products = [sample_product(str(100000 + i)) for i in range(args.products)]
+    
+    with StubServer(latency=args.latency, token_interval=args.token_interval) as server:
+        for label, pipelined in (("sekwencyjnie", False), ("potokowo", True)):
+            session = create_session()
+            client = OpenAIClient("stub", "gpt-4o-mini", 4096, session=session, api_url=server.openai_url)
+            durations = run(AIDescriptionGenerator(client, pipelined=pipelined), products)
+            session.close()
+            
+            print(
+                f"{label:14s} średnio {statistics.mean(durations):6.3f}s  "
+                f"min {min(durations):6.3f}s  max {max(durations):6.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/bench_prompt_editor.py
+"""
+Benchmark: koszt naciśnięcia klawisza w edytorze promptów (pełne odświeżenie vs przyrostowe)
+
+Dla każdego pliku z folderu prompts (opcjonalnie powielonego --scale razy)
+wpisuje znaki w środku tekstu (co dziesiąty to nowa linia) i mierzy czas
+odświeżenia po każdym z nich: dawną ścieżką PromptEditor (podświetlenie
+całego tekstu z index() na dopasowanie + przebudowa numerów wszystkich
+linii w widżecie Text) oraz nową (IncrementalHighlighter.update z budżetem
+PROMPT_HIGHLIGHT_BUDGET_MS + rysowanie numerów tylko widocznych linii,
+gdy zmieni się ich liczba). Wymaga ekranu (okno Tk jest ukryte).
+
+Uruchomienie:
+    python benchmarks/bench_prompt_editor.py --scale 1,10 -n 100
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+import tkinter as tk
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from prompt_editor import PROMPT_HIGHLIGHT_BUDGET_MS, PromptEditor
+from prompt_templates import PromptManager
+
+
+def legacy_highlight(text_editor) -> None:
+    """Dawna implementacja PromptEditor.apply_syntax_highlighting"""
+    for tag in ["header", "variable", "string", "comment"]:
+        text_editor.tag_remove(tag, 1.0, tk.END)
+        
+    content = text_editor.get(1.0, tk.END)
+    
+    for i, line in enumerate(content.split('\n'), 1):
+        if line.startswith('### ') and line.endswith(' ###'):
+            text_editor.tag_add("header", f"{i}.0", f"{i}.end")
+            
+    for match in re.finditer(r'\{\{?\w+\}?\}', content):
+        start = text_editor.index(f"1.0+{match.start()}c")
+        end = text_editor.index(f"1.0+{match.end()}c")
+        text_editor.tag_add("variable", start, end)
+        
+    for match in re.finditer(r'"[^"]*"', content):
+        start = text_editor.index(f"1.0+{match.start()}c")
+        end = text_editor.index(f"1.0+{match.end()}c")
+        text_editor.tag_add("string", start, end)
+
+
+def legacy_line_numbers(text_editor, line_numbers) -> None:
+    """Dawna implementacja PromptEditor.update_line_numbers"""
+    lines = text_editor.get(1.0, tk.END).count('\n')
+    line_numbers_text = '\n'.join(str(i) for i in range(1, lines + 1))
+    
+    line_numbers.config(state='normal')
+    line_numbers.delete(1.0, tk.END)
+    line_numbers.insert(1.0, line_numbers_text)
+    line_numbers.config(state='disabled')
+
+
+def measure_keystrokes(text_widget, refresh, keystrokes: int) -> list:
+    """Wpisz znaki w środku tekstu i zmierz odświeżenie po każdym [s]"""
+    middle = int(text_widget.index("end").split(".")[0]) // 2
+    durations = []
+    for i in range(keystrokes):
+        text_widget.insert(f"{middle}.0", "\n" if i % 10 == 9 else "{")
+        start = time.perf_counter()
+        refresh()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def percentiles(durations: list) -> tuple:
+    """Mediana, 95. percentyl i maksimum [ms]"""
+    ordered = sorted(durations)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return statistics.median(ordered) * 1000, p95 * 1000, ordered[-1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", default="1,10", help="ile razy powielić treść promptu (po przecinku)")
+    parser.add_argument("-n", "--keystrokes", type=int, default=100)
+    args = parser.parse_args()
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Benchmark wymaga ekranu (Tk): {e}")
+    root.withdraw()
+    
+    prompt_manager = PromptManager(os.path.join(ROOT_DIR, "prompts"))
+    editor = PromptEditor(root, prompt_manager)
+    editor.window.withdraw()
+    
+    legacy_editor = tk.Text(root, wrap="none", font=("Consolas", 11))
+    legacy_gutter = tk.Text(root, width=4, state='disabled', wrap='none')
+    
+    print(f"Budżet podświetlania: {PROMPT_HIGHLIGHT_BUDGET_MS} ms na naciśnięcie klawisza")
+    print(
+        f"{'prompt':34s} {'x':>3s} {'linie':>6s} {'pełne: p50':>11s} {'p95':>8s} {'max':>8s} "
+        f"{'przyrostowe: p50':>17s} {'p95':>8s} {'max':>8s}"
+    )
+    for filename in prompt_manager.get_prompt_list():
+        for scale in (int(value) for value in args.scale.split(",")):
+            content = prompt_manager.get_prompt_content(filename) * scale
+            
+            legacy_editor.delete("1.0", "end")
+            legacy_editor.insert("1.0", content)
+            legacy_highlight(legacy_editor)
+            legacy = measure_keystrokes(
+                legacy_editor,
+                lambda: (legacy_highlight(legacy_editor), legacy_line_numbers(legacy_editor, legacy_gutter)),
+                args.keystrokes
+            )
+            
+            text_editor = editor.text_editor
+            text_editor.delete("1.0", "end")
+            text_editor.insert("1.0", content)
+            editor.apply_syntax_highlighting()
+            editor.update_line_numbers()
+            incremental = measure_keystrokes(
+                text_editor,
+                lambda: (editor.highlighter.update(), editor.update_line_numbers()),
+                args.keystrokes
+            )
+            # Dokończ linie odłożone przez budżet przed porównaniem
+            editor.highlighter.update(limited=False)
+            
+            # Cudzysłowy nie przechodzą już przez koniec linii - porównujemy pozostałe tagi
+            for tag in ("header", "variable"):
+                if [str(i) for i in text_editor.tag_ranges(tag)] != [str(i) for i in legacy_editor.tag_ranges(tag)]:
+                    print(f"Uwaga: podświetlenie '{tag}' różni się od pełnego przebiegu ({filename})")
+                    
+            lines = int(text_editor.index("end-1c").split(".")[0])
+            legacy_p50, legacy_p95, legacy_max = percentiles(legacy)
+            new_p50, new_p95, new_max = percentiles(incremental)
+            print(
+                f"{filename:34s} {scale:3d} {lines:6d} {legacy_p50:9.2f}ms {legacy_p95:6.2f}ms {legacy_max:6.2f}ms "
+                f"{new_p50:15.2f}ms {new_p95:6.2f}ms {new_max:6.2f}ms"
+            )
+            
+    editor.highlighter.cancel()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_prompt_render.py
+"""
+Benchmark: przygotowanie promptu na produkt (odczyt pliku + str.replace vs skompilowany szablon)
+
+Dla każdego pliku z prompts/ porównuje dawną ścieżkę (os.path.exists,
+odczyt pliku, usunięcie nowych linii, trzy str.replace) z renderowaniem
+szablonu z PromptManager (odczyt z pamięci + jedno złączenie fragmentów).
+
+Uruchomienie:
+    python benchmarks/bench_prompt_render.py -n 2000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from prompt_templates import PromptManager, PROMPTS_DIR
+
+
+def legacy_prepare(prompt_file: str, values: dict) -> str:
+    """Dawna implementacja PromptProcessor.load_and_prepare_prompt"""
+    prompt_path = os.path.join(PROMPTS_DIR, prompt_file) if os.path.exists(
+        os.path.join(PROMPTS_DIR, prompt_file)
+    ) else prompt_file
+    
+    with open(prompt_path, "r", encoding="utf-8") as file:
+        prompt = file.read().replace("\n", "")
+        
+    prompt = prompt.replace("{prod_name}", values["prod_name"])
+    prompt = prompt.replace("{prod_desclongription}", values["prod_desclongription"])
+    prompt = prompt.replace("{product_specification}", values["product_specification"])
+    return prompt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    
+    # Prompty są wczytywane ścieżkami względnymi
+    os.chdir(ROOT_DIR)
+    
+    values = {
+        "prod_name": "Rower testowy SCOTT Spark 930",
+        "prod_desclongription": "<p>Opis produktu testowego z kilkoma zdaniami treści.</p>" * 40,
+        "product_specification": "<table><tr><td>Rama</td><td>Aluminium</td></tr></table>" * 30
+    }
+    
+    manager = PromptManager()
+    prompt_files = manager.get_prompt_list()
+    
+    print(f"{'prompt':40s} {'rozmiar':>8s} {'replace':>10s} {'szablon':>10s} {'przyspieszenie':>15s}")
+    legacy_total = compiled_total = 0.0
+    
+    for prompt_file in prompt_files:
+        assert legacy_prepare(prompt_file, values) == manager.get_template(prompt_file).render(values)
+        
+        legacy = timeit.timeit(lambda: legacy_prepare(prompt_file, values), number=args.iterations)
+        compiled = timeit.timeit(lambda: manager.get_template(prompt_file).render(values), number=args.iterations)
+        legacy_total += legacy
+        compiled_total += compiled
+        
+        size = os.path.getsize(os.path.join(PROMPTS_DIR, prompt_file))
+        print(
+            f"{prompt_file:40s} {size:7d}B "
+            f"{legacy / args.iterations * 1e6:8.1f}µs {compiled / args.iterations * 1e6:8.1f}µs "
+            f"{legacy / compiled:14.1f}x"
+        )
+        
+    print(
+        f"{'razem (' + str(len(prompt_files)) + ' promptów)':40s} {'':8s} "
+        f"{legacy_total / args.iterations * 1e6:8.1f}µs {compiled_total / args.iterations * 1e6:8.1f}µs "
+        f"{legacy_total / compiled_total:14.1f}x"
+    )
+    print(f"Wczytania plików: {manager.loads}")
+
+
+if __name__ == "__main__":
+    main()
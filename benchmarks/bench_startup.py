@@ -0,0 +1,118 @@
+# benchmarks/bench_startup.py
+"""
+Benchmark: czas startu aplikacji (import modułów + czas do pierwszej klatki okna)
+
+Każdy pomiar to osobny proces Pythona (świeże importy): czas importu
+main oraz czas od startu procesu do narysowania głównego okna
+(ProductManagerApp, pierwszy przebieg pętli zdarzeń po zmapowaniu okna).
+Pokazuje też, które ciężkie biblioteki były już załadowane przy
+pierwszej klatce. Z --history dopisuje medianę do pliku CSV (data,
+rewizja git), aby śledzić czas startu między wydaniami.
+Wymaga ekranu (bez config.py używa config_sample.py).
+
+Uruchomienie:
+    python benchmarks/bench_startup.py -n 10
+    python benchmarks/bench_startup.py -n 10 --history benchmarks/startup_history.csv
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Biblioteki, które nie powinny spowalniać startu
+HEAVY_MODULES = ("PIL", "bs4", "tkinterweb", "requests")
+
+
+def run_worker() -> dict:
+    """Zmierz start aplikacji (wołane w osobnym procesie)"""
+    import bench_config  # noqa: F401 - config.py lub config_sample.py
+    
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+    
+    app = main.ProductManagerApp()
+    result = {}
+    
+    def first_frame():
+        app.root.update_idletasks()
+        result["frame"] = time.perf_counter() - started
+        result["loaded"] = [name for name in HEAVY_MODULES if name in sys.modules]
+        app.on_close()
+        
+    # Okno jest mapowane w czasie bezczynności - after_idle wykona się po nim
+    app.root.after_idle(first_frame)
+    app.run()
+    result["import"] = imported - started
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT_DIR, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "?"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10, help="liczba uruchomień (procesów)")
+    parser.add_argument("--history", help="plik CSV, do którego dopisać wynik")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        # Ścieżki względne aplikacji (prompts, cache) jak przy zwykłym uruchomieniu
+        os.chdir(ROOT_DIR)
+        print(json.dumps(run_worker()))
+        return
+        
+    imports, frames = [], []
+    loaded = []
+    for _ in range(args.runs):
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker"],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            sys.exit(f"Start aplikacji nie powiódł się (wymaga ekranu):\n{completed.stderr}")
+        # Ostatnia linia - aplikacja może wypisywać komunikaty na stdout
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        imports.append(result["import"] * 1000)
+        frames.append(result["frame"] * 1000)
+        loaded = result["loaded"]
+        
+    import_ms = statistics.median(imports)
+    frame_ms = statistics.median(frames)
+    print(f"Uruchomienia: {args.runs}")
+    print(f"{'':22s} {'p50':>9s} {'min':>9s} {'max':>9s}")
+    print(f"{'import main':22s} {import_ms:7.0f}ms {min(imports):7.0f}ms {max(imports):7.0f}ms")
+    print(f"{'pierwsza klatka':22s} {frame_ms:7.0f}ms {min(frames):7.0f}ms {max(frames):7.0f}ms")
+    print(f"Załadowane przy pierwszej klatce: {', '.join(loaded) or 'brak'} (z {', '.join(HEAVY_MODULES)})")
+    
+    if args.history:
+        new_file = not os.path.exists(args.history)
+        with open(args.history, "a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(["data", "rewizja", "import_ms", "pierwsza_klatka_ms", "biblioteki"])
+            writer.writerow([
+                datetime.datetime.now().isoformat(timespec="seconds"), git_revision(),
+                f"{import_ms:.0f}", f"{frame_ms:.0f}", " ".join(loaded)
+            ])
+        print(f"Dopisano do {args.history}")
+
+
+if __name__ == "__main__":
+    main()
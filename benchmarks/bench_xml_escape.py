@@ -0,0 +1,102 @@
+# benchmarks/bench_xml_escape.py
+"""
+Benchmark: escapowanie nazw i wartości opcji (pięć str.replace vs xml_escape)
+
+Na realistycznych listach opcji (nazwy i wartości jak w getProductData,
+dwa wywołania na opcję, kilkanaście opcji na produkt) porównuje dawną
+funkcję z xml_builder, escape_xml (zamiana tylko obecnych znaków) oraz
+escape_xml_cached (pamięć wyników). Dodatkowo sprawdza, że XML z "]]>"
+w opisie pozostaje poprawny.
+
+Uruchomienie:
+    python benchmarks/bench_xml_escape.py --products 1000
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from xml.dom import minidom
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from xml_escape import cdata, escape_xml, escape_xml_cached
+
+OPTION_NAMES = [
+    "Wzrost", "Kolor dominujący", "Materiał ramy", "Rozmiar koła", "Rozmiar ramy",
+    "Typ hamulców", "Liczba biegów", "Amortyzator", "Waga", "Płeć", "Producent",
+    "Przeznaczenie", "Napęd", "Opony"
+]
+OPTION_VALUES = [
+    "Aluminium", "Karbon", "29\"", "27,5\"", "M", "L", "XL", "Tarczowe hydrauliczne",
+    "12", "Powietrzny 120 mm", "13,5 kg", "Męski", "Damski", "Unisex", "SCOTT",
+    "Trail & Enduro", "Shimano Deore <12s>", "Maxxis Rekon 2.4\"", "czarny", "niebieski"
+]
+
+
+def legacy_escape_xml(text: str) -> str:
+    """Dawna implementacja xml_builder.escape_xml"""
+    if not text:
+        return text
+    xml_escape_table = {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "'": "&#39;"
+    }
+    for char, escape_seq in xml_escape_table.items():
+        text = text.replace(char, escape_seq)
+    return text
+
+
+def build_options(products: int, seed: int = 0):
+    """Pary (nazwa, wartość) dla wszystkich opcji wszystkich produktów"""
+    rng = random.Random(seed)
+    options = []
+    for _ in range(products):
+        for name in rng.sample(OPTION_NAMES, rng.randint(8, len(OPTION_NAMES))):
+            options.append((name, rng.choice(OPTION_VALUES)))
+    return options
+
+
+def escape_all(escape, options) -> None:
+    for name, value in options:
+        escape(name)
+        escape(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("-n", "--iterations", type=int, default=5)
+    args = parser.parse_args()
+    
+    options = build_options(args.products)
+    for name, value in options:
+        assert legacy_escape_xml(name) == escape_xml(name) == escape_xml_cached(name)
+        assert legacy_escape_xml(value) == escape_xml(value) == escape_xml_cached(value)
+        
+    calls = 2 * len(options)
+    print(f"Produkty: {args.products}, opcje: {len(options)}, wywołania: {calls}")
+    
+    legacy = min(timeit.repeat(lambda: escape_all(legacy_escape_xml, options), number=1, repeat=args.iterations))
+    for label, escape in (("pięć str.replace", legacy_escape_xml),
+                          ("escape_xml", escape_xml),
+                          ("escape_xml_cached", escape_xml_cached)):
+        elapsed = min(timeit.repeat(lambda: escape_all(escape, options), number=1, repeat=args.iterations))
+        print(f"{label:20s} {elapsed * 1000:8.2f}ms  {elapsed / calls * 1e9:6.0f}ns/wywołanie  {legacy / elapsed:5.1f}x")
+        
+    print(f"Cache: {escape_xml_cached.cache_info()}")
+    
+    # CDATA: "]]>" w opisie nie może zamknąć sekcji
+    description = "<p>Tablica a[b[0]]> 5</p>"
+    document = f"<item><prod_desc_pl>{cdata(description)}</prod_desc_pl></item>"
+    parsed = minidom.parseString(document).documentElement.firstChild
+    assert "".join(node.data for node in parsed.childNodes) == description
+    print("CDATA z ']]>': poprawny XML, treść zachowana")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_xml_stream.py
+"""
+Benchmark: pamięć przygotowania XML aktualizacji (cały dokument w pamięci vs strumieniowo)
+
+Dawna ścieżka: build_products_xml -> kopia na dysk -> kodowanie formularza
+całego dokumentu (jak requests dla data=dict). Nowa: iter_products_xml
+prosto do pliku -> FileFormBody czytany z dysku fragmentami (jak przy
+wysyłce). Dla rosnącej liczby produktów raportuje szczyt pamięci
+(tracemalloc) i czas; dane produktów są tworzone przed pomiarem.
+
+Uruchomienie:
+    python benchmarks/bench_xml_stream.py --products 100,1000,5000 --desc-kib 20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import bench_config  # noqa: F401 - config.py lub config_sample.py
+from api_client import FileFormBody
+from product_data_manager import ProductDataManager, OriginalOption
+from utils import save_xml_copy
+from xml_builder import XMLBuilder
+
+FORM_FIELDS = {
+    "function": "addUpdateProducts",
+    "APIkey": "stub",
+    "importType": "update",
+    "prodIndex": "prod_id"
+}
+
+
+def make_data_manager(desc_kib: int) -> ProductDataManager:
+    """Produkt z długim opisem HTML i typowymi parametrami"""
+    data_manager = ProductDataManager()
+    paragraph = "<p>Rower górski z ramą z aluminium, amortyzatorem i hamulcami tarczowymi.</p>\n"
+    data_manager.generated_descriptions.long = paragraph * (desc_kib * 1024 // len(paragraph) + 1)
+    data_manager.generated_descriptions.short = "<ul><li>Rama: aluminium</li><li>Koła: 29\"</li></ul>"
+    data_manager.original_info_options = [
+        OriginalOption("Materiał ramy", "101", "Aluminium"),
+        OriginalOption("Rozmiar koła", "102", "29\"")
+    ]
+    data_manager.original_options = [OriginalOption("Rozmiar", "201", "M")]
+    data_manager.set_product_color("czarny", "10294")
+    data_manager.set_product_height_range(150, 190)
+    return data_manager
+
+
+def legacy_path(items, output_dir: str) -> int:
+    xml_content = XMLBuilder.build_products_xml(items)
+    save_xml_copy(xml_content, "legacy", output_dir)
+    body = urlencode(dict(FORM_FIELDS, xml=xml_content))
+    return len(body)
+
+
+def streaming_path(items, output_dir: str) -> int:
+    path = save_xml_copy(XMLBuilder.iter_products_xml(items), "stream", output_dir)
+    body = FileFormBody(FORM_FIELDS, "xml", path)
+    # Odczyt jak przy wysyłce (requests iteruje body)
+    return sum(len(chunk) for chunk in body)
+
+
+def measure(fn, items, output_dir: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        size = fn(items, output_dir)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", default="100,1000,5000", help="liczby produktów (po przecinku)")
+    parser.add_argument("--desc-kib", type=int, default=20, help="długość opisu produktu [KiB]")
+    args = parser.parse_args()
+    
+    # Jeden manager danych dla wszystkich produktów - mierzymy tylko narzut XML
+    data_manager = make_data_manager(args.desc_kib)
+    
+    print(f"{'produkty':>9s} {'body':>10s} {'szczyt: dokument':>17s} {'strumień':>10s} {'czas: dokument':>15s} {'strumień':>9s}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for count in (int(value) for value in args.products.split(",")):
+            items = [(str(100000 + i), data_manager) for i in range(count)]
+            
+            legacy_size, legacy_peak, legacy_time = measure(legacy_path, items, output_dir)
+            stream_size, stream_peak, stream_time = measure(streaming_path, items, output_dir)
+            assert legacy_size == stream_size
+            
+            print(
+                f"{count:9d} {stream_size / 2**20:8.1f}MB {legacy_peak / 2**20:15.1f}MB "
+                f"{stream_peak / 2**20:8.1f}MB {legacy_time:14.2f}s {stream_time:8.2f}s"
+            )
+            for name in os.listdir(output_dir):
+                os.remove(os.path.join(output_dir, name))
+
+
+if __name__ == "__main__":
+    main()
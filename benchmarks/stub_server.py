@@ -0,0 +1,302 @@
+# benchmarks/stub_server.py
+"""
+Lokalny stub API GSport (Sky-Shop) i OpenAI do benchmarków bez sieci
+
+Obsługuje getProductData (z ETag / 304), addUpdateProducts (odpowiedź JSON per produkt)
+i /v1/chat/completions (zwykłe i strumieniowe SSE). Opóźnienia, odsetek
+błędów 5xx i odpowiedzi 429 są konfigurowalne; losowanie z ziarnem daje
+powtarzalne przebiegi.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any
+
+
+def sample_product(product_id: str) -> Dict[str, Any]:
+    """Zbuduj przykładową odpowiedź getProductData"""
+    return {
+        "prod_id": product_id,
+        "prod_name": f"Rower testowy {product_id}",
+        "prod_desclong": "<p>Opis produktu testowego.</p>" * 20,
+        "prod_img_src": f"/images/products/{product_id}",
+        "prd_name": "SCOTT",
+        "prd_logo": "",
+        "prd_link_text": "Szwajcarski producent rowerów.",
+        "prod_options": {
+            product_id: {
+                "1": {
+                    "name": "Kolor dominujący",
+                    "type": "choose",
+                    "values": {"10294": {"name": "Czarny", "selected": "1"}}
+                },
+                "2": {
+                    "name": "Wzrost",
+                    "type": "info",
+                    "values": {"23533": {"name": "170"}, "23538": {"name": "175"}}
+                }
+            }
+        }
+    }
+
+
+# Odpowiedź stubu podzielona na tokeny (pierwsza lista <ul> potrzebna do krótkiego opisu)
+STUB_COMPLETION_TOKENS = (
+    ["<h2>", "Rower", " testowy", "</h2>", "<ul>"]
+    + ["<li>", "Zaleta", " produktu", "</li>"] * 3
+    + ["</ul>"]
+    + ["<p>", "Dłuższy", " akapit", " opisu", " produktu", ".", "</p>"] * 5
+)
+
+
+class StubStats:
+    """Liczniki połączeń i żądań obsłużonych przez stub"""
+    
+    COUNTERS = ("connections", "requests", "product_requests", "not_modified", "update_requests",
+                "updated_items", "openai_requests", "errors", "rate_limited")
+                
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+        
+    def add_connection(self) -> None:
+        self.add("connections")
+        
+    def add_request(self) -> None:
+        self.add("requests")
+        
+    def add(self, counter: str, amount: int = 1) -> None:
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+            
+    def reset(self) -> None:
+        with self.lock:
+            for counter in self.COUNTERS:
+                setattr(self, counter, 0)
+                
+    def as_dict(self) -> Dict[str, int]:
+        with self.lock:
+            return {counter: getattr(self, counter) for counter in self.COUNTERS}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 (keep-alive) udający GSport i OpenAI"""
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def setup(self):
+        super().setup()
+        self.server.stats.add_connection()
+        
+    def log_message(self, format, *args):
+        pass
+        
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+        
+    def _wait_latency(self) -> None:
+        latency = self.server.latency
+        if self.server.latency_jitter:
+            latency += self.server.random(0, self.server.latency_jitter)
+        if latency:
+            time.sleep(latency)
+            
+    def _send_failure(self, rate_limit_rate: float) -> bool:
+        """Wylosuj 429 lub 5xx zgodnie z konfiguracją; True jeśli wysłano błąd"""
+        draw = self.server.random(0, 1)
+        if draw < rate_limit_rate:
+            self.server.stats.add("rate_limited")
+            body = json.dumps({"error": {"message": "Rate limit reached", "type": "requests"}}).encode("utf-8")
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.server.retry_after))
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return True
+        if draw < rate_limit_rate + self.server.error_rate:
+            self.server.stats.add("errors")
+            self._send(500, b"stub error", "text/plain")
+            return True
+        return False
+        
+    def do_GET(self):
+        self.server.stats.add_request()
+        self._wait_latency()
+        if self._send_failure(0.0):
+            return
+            
+        query = parse_qs(urlparse(self.path).query)
+        if query.get("function", [""])[0] != "getProductData":
+            self._send(404, b"unknown function", "text/plain")
+            return
+            
+        self.server.stats.add("product_requests")
+        product_id = query.get("productID", ["0"])[0]
+        
+        # Dane stubu się nie zmieniają, więc ETag zależy tylko od ID
+        etag = f'"stub-{product_id}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.stats.add("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+            
+        body = json.dumps(sample_product(product_id)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def do_POST(self):
+        self.server.stats.add_request()
+        body = self._read_body()
+        self._wait_latency()
+        
+        is_openai = urlparse(self.path).path.endswith("/chat/completions")
+        if self._send_failure(self.server.rate_limit_rate if is_openai else 0.0):
+            return
+            
+        if is_openai:
+            self.server.stats.add("openai_requests")
+            payload = json.loads(body or b"{}")
+            prompt = payload.get("messages", [{}])[0].get("content", "")
+            usage = {"prompt_tokens": max(1, len(prompt) // 4), "completion_tokens": len(STUB_COMPLETION_TOKENS)}
+            
+            if payload.get("stream"):
+                self._send_stream(usage)
+                return
+                
+            # Bez strumienia: ten sam czas generowania, odpowiedź na końcu
+            if self.server.token_interval:
+                time.sleep(self.server.token_interval * len(STUB_COMPLETION_TOKENS))
+                
+            response = {
+                "choices": [{"message": {"role": "assistant", "content": "".join(STUB_COMPLETION_TOKENS)}}],
+                "usage": usage
+            }
+            self._send(200, json.dumps(response).encode("utf-8"), "application/json")
+        else:
+            self._send_update_response(body)
+            
+    def _send_update_response(self, body: bytes) -> None:
+        """addUpdateProducts: status "ok" dla każdego <prod_id> w przesłanym XML"""
+        form = parse_qs(body.decode("utf-8"))
+        xml_content = form.get("xml", [""])[0]
+        product_ids = re.findall(r"<prod_id>([^<]*)</prod_id>", xml_content)
+        
+        self.server.stats.add("update_requests")
+        self.server.stats.add("updated_items", len(product_ids))
+        
+        response = {product_id: "ok" for product_id in product_ids}
+        self._send(200, json.dumps(response).encode("utf-8"), "application/json")
+            
+    def _send_stream(self, usage: Dict[str, int]) -> None:
+        """Odpowiedź SSE (chunked) z tokenami wysyłanymi co token_interval"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        
+        def write_event(data: str) -> None:
+            event = f"data: {data}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(event):X}\r\n".encode("ascii") + event + b"\r\n")
+            
+        try:
+            for token in STUB_COMPLETION_TOKENS:
+                if self.server.token_interval:
+                    time.sleep(self.server.token_interval)
+                write_event(json.dumps({"choices": [{"delta": {"content": token}}]}, ensure_ascii=False))
+                
+            write_event(json.dumps({"choices": [], "usage": usage}))
+            write_event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Klient przerwał strumień (anulowanie)
+            self.close_connection = True
+
+
+class StubServer:
+    """Serwer stub uruchamiany w wątku w tle (context manager)"""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 token_interval: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: float = 0.1, seed: int = 0):
+        """
+        Args:
+            latency: Stałe opóźnienie każdej odpowiedzi [s]
+            token_interval: Odstęp między tokenami odpowiedzi OpenAI [s]
+            latency_jitter: Dodatkowe losowe opóźnienie 0..jitter [s]
+            error_rate: Odsetek odpowiedzi 500 (wszystkie endpointy)
+            rate_limit_rate: Odsetek odpowiedzi 429 z Retry-After (tylko OpenAI)
+            retry_after: Wartość nagłówka Retry-After [s]
+            seed: Ziarno losowania błędów i opóźnień
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stats = StubStats()
+        self.httpd.latency = latency
+        self.httpd.token_interval = token_interval
+        self.httpd.latency_jitter = latency_jitter
+        self.httpd.error_rate = error_rate
+        self.httpd.rate_limit_rate = rate_limit_rate
+        self.httpd.retry_after = retry_after
+        
+        rng = random.Random(seed)
+        rng_lock = threading.Lock()
+        
+        def draw(low: float, high: float) -> float:
+            with rng_lock:
+                return rng.uniform(low, high)
+                
+        self.httpd.random = draw
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        
+    @property
+    def stats(self) -> StubStats:
+        return self.httpd.stats
+        
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+        
+    @property
+    def gsport_url(self) -> str:
+        return f"{self.base_url}/api"
+        
+    @property
+    def openai_url(self) -> str:
+        return f"{self.base_url}/v1/chat/completions"
+        
+    def start(self) -> "StubServer":
+        self.thread.start()
+        return self
+        
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        
+    def __enter__(self) -> "StubServer":
+        return self.start()
+        
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,153 @@
+# cache_directory.py
+"""Folder plików cache z limitem rozmiaru i wieku (wspólny dla ResponseCache, ProductCache i ImageCache)"""
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+TEMP_SUFFIX = ".tmp"
+# Plik tymczasowy starszy niż to jest pozostałością po przerwanym zapisie
+STALE_TEMP_AGE = 3600
+
+
+class CacheDirectory:
+    """
+    Pliki cache w jednym folderze z licznikiem zajętego miejsca
+    
+    Zapis jest atomowy (plik tymczasowy + os.replace) i jest najlepszą próbą:
+    błąd dysku tylko pomija wpis i usuwa plik tymczasowy. Gdy rozmiar
+    przekroczy max_bytes, evict usuwa pliki starsze niż max_age, a potem
+    najstarsze (mtime) aż rozmiar spadnie do 90% limitu. Wywołujący może
+    odświeżać mtime przy trafieniu (touch), aby usuwane były najdawniej używane.
+    """
+    
+    def __init__(self, path: str, max_bytes: int, max_age: Optional[float] = None,
+                 label: str = "cache"):
+        """
+        Args:
+            path: Folder na pliki
+            max_bytes: Limit rozmiaru plików
+            max_age: Wiek pliku [s] (wg mtime), po którym jest usuwany (None - bez limitu)
+            label: Nazwa cache w ostrzeżeniach
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.label = label
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        
+        os.makedirs(self.path, exist_ok=True)
+        self.evict()
+        
+    def write(self, path: str, data: bytes) -> bool:
+        """
+        Zapisz plik atomowo, przez plik tymczasowy
+        
+        Args:
+            path: Ścieżka pliku w folderze cache
+            data: Zawartość
+            
+        Returns:
+            True jeśli zapisano
+        """
+        temp_path = f"{path}.{threading.get_ident()}{TEMP_SUFFIX}"
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+            
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write {self.label}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+            
+        with self.lock:
+            self.total_bytes += len(data) - previous
+            over_limit = self.total_bytes > self.max_bytes
+            
+        if over_limit:
+            self.evict()
+        return True
+        
+    def touch(self, path: str) -> None:
+        """Odśwież mtime pliku (ostatnie użycie)"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+            
+    def remove(self, path: str) -> bool:
+        """Usuń plik i odejmij jego rozmiar od licznika"""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        with self.lock:
+            self.total_bytes -= size
+        return True
+        
+    def evict(self) -> None:
+        """Usuń pliki starsze niż max_age, potem najstarsze aż rozmiar spadnie do 90% limitu"""
+        entries, stale_temp = self._scan()
+        for path in stale_temp:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+                
+        entries.sort()
+        oldest_allowed = time.time() - self.max_age if self.max_age is not None else float("-inf")
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        
+        for mtime, size, path in entries:
+            if mtime >= oldest_allowed and total <= target:
+                break
+            if self.remove(path):
+                total -= size
+                
+        with self.lock:
+            self.total_bytes = total
+            
+    def clear(self) -> None:
+        """Usuń wszystkie pliki (poza trwającymi zapisami)"""
+        entries, _ = self._scan()
+        for _, _, path in entries:
+            self.remove(path)
+            
+    def _scan(self) -> Tuple[List[Tuple[float, int, str]], List[str]]:
+        """
+        Pliki w folderze: wpisy (mtime, rozmiar, ścieżka) oraz porzucone pliki tymczasowe
+        
+        Pliki usunięte w trakcie skanu (np. równoległe evict) są pomijane.
+        """
+        entries = []
+        stale_temp = []
+        try:
+            scan = list(os.scandir(self.path))
+        except OSError:
+            return entries, stale_temp
+            
+        stale_before = time.time() - STALE_TEMP_AGE
+        for entry in scan:
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.name.endswith(TEMP_SUFFIX):
+                if stat.st_mtime < stale_before:
+                    stale_temp.append(entry.path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries, stale_temp
@@ -3,23 +3,37 @@ import tkinter as tk
 from tkinter import ttk
 from ui_components import SyntaxHighlighter
 
+# Klasa HtmlFrame z tkinterweb (None - brak biblioteki), importowana przy pierwszym podglądzie
+_html_frame_class = False
+
+
+def _load_html_frame_class():
+    """Zaimportuj tkinterweb przy pierwszej potrzebie (import trwa, a podgląd nie jest potrzebny do startu)"""
+    global _html_frame_class
+    if _html_frame_class is False:
+        try:
+            from tkinterweb import HtmlFrame
+        except ImportError:
+            print("Warning: tkinterweb not available. HTML preview will be limited.")
+            HtmlFrame = None
+        _html_frame_class = HtmlFrame
+    return _html_frame_class
+
+
 class ContentArea:
     """Obszar wyświetlania i edycji treści"""
     
     def __init__(self, parent, app):
         self.app = app
         self.parent = parent
+        # Przyrostowe podświetlanie składni edytowalnych opisów ('long' / 'short')
+        self.highlighters = {}
+        # Ramki podglądu HTML (nazwa atrybutu -> LabelFrame) dla widgetów tworzonych przy pierwszym użyciu
+        self.html_containers = {}
         self.create_content_area()
         
     def create_content_area(self):
         """Utwórz obszar treści"""
-        # Import tutaj, aby uniknąć błędów cyklicznych
-        try:
-            from tkinterweb import HtmlFrame
-        except ImportError:
-            print("Warning: tkinterweb not available. HTML preview will be limited.")
-            HtmlFrame = None
-        
         content_frame = tk.Frame(self.parent, bg="#F9F9F9")
         content_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
@@ -31,72 +45,63 @@ class ContentArea:
         content_frame.rowconfigure(1, weight=2)     # Dolny rząd
         
         # Opis oryginalny produktu
-        self._create_original_description_frame(content_frame, HtmlFrame)
+        self._create_original_description_frame(content_frame)
         
         # Ramki specyfikacji
-        self._create_specification_frames(content_frame, HtmlFrame)
+        self._create_specification_frames(content_frame)
         
         # Wygenerowane opisy AI
         self._create_ai_description_frames(content_frame)
         
-    def _create_original_description_frame(self, parent, HtmlFrame):
-        """Utwórz ramkę oryginalnego opisu produktu"""
-        frame_original = tk.LabelFrame(
+    def _create_html_frame(self, parent, frame_name, title, row, column):
+        """
+        Utwórz ramkę podglądu HTML
+        
+        Sam widget podglądu (HtmlFrame) powstaje dopiero przy pierwszej
+        treści - patrz _get_html_widget.
+        """
+        frame = tk.LabelFrame(
             parent,
-            text="Opis produktu ze sklepu",
+            text=title,
             padx=10,
             pady=10,
             bg="#FFFFFF",
             font=("Arial", 10)
         )
-        frame_original.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        frame.grid(row=row, column=column, sticky="nsew", padx=5, pady=5)
         
-        if HtmlFrame:
-            self.html_original_desc = HtmlFrame(frame_original, messages_enabled=False)
-            self.html_original_desc.pack(fill="both", expand=True)
-        else:
-            # Fallback dla braku tkinterweb
-            self.html_original_desc = tk.Text(frame_original, wrap=tk.WORD)
-            self.html_original_desc.pack(fill="both", expand=True)
-            
-    def _create_specification_frames(self, parent, HtmlFrame):
+        self.html_containers[frame_name] = frame
+        setattr(self, frame_name, None)
+        
+    def _create_original_description_frame(self, parent):
+        """Utwórz ramkę oryginalnego opisu produktu"""
+        self._create_html_frame(parent, 'html_original_desc', "Opis produktu ze sklepu", 0, 0)
+        
+    def _create_specification_frames(self, parent):
         """Utwórz ramki specyfikacji"""
         # Specyfikacja JSON
-        frame_spec_json = tk.LabelFrame(
-            parent,
-            text="Specyfikacja JSON",
-            padx=10,
-            pady=10,
-            bg="#FFFFFF",
-            font=("Arial", 10)
-        )
-        frame_spec_json.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
-        
-        if HtmlFrame:
-            self.html_spec_json = HtmlFrame(frame_spec_json, messages_enabled=False)
-            self.html_spec_json.pack(fill="both", expand=True)
-        else:
-            self.html_spec_json = tk.Text(frame_spec_json, wrap=tk.WORD)
-            self.html_spec_json.pack(fill="both", expand=True)
+        self._create_html_frame(parent, 'html_spec_json', "Specyfikacja JSON", 1, 0)
         
         # Specyfikacja HTML
-        frame_spec_html = tk.LabelFrame(
-            parent,
-            text="Specyfikacja HTML",
-            padx=10,
-            pady=10,
-            bg="#FFFFFF",
-            font=("Arial", 10)
-        )
-        frame_spec_html.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
+        self._create_html_frame(parent, 'html_spec_html', "Specyfikacja HTML", 1, 1)
         
+    def _get_html_widget(self, frame_name):
+        """Widget podglądu HTML ramki (tworzony przy pierwszym użyciu)"""
+        widget = getattr(self, frame_name, None)
+        if widget is not None:
+            return widget
+            
+        HtmlFrame = _load_html_frame_class()
+        parent = self.html_containers[frame_name]
         if HtmlFrame:
-            self.html_spec_html = HtmlFrame(frame_spec_html, messages_enabled=False)
-            self.html_spec_html.pack(fill="both", expand=True)
+            widget = HtmlFrame(parent, messages_enabled=False)
         else:
-            self.html_spec_html = tk.Text(frame_spec_html, wrap=tk.WORD)
-            self.html_spec_html.pack(fill="both", expand=True)
-            
+            # Fallback dla braku tkinterweb
+            widget = tk.Text(parent, wrap=tk.WORD)
+        widget.pack(fill="both", expand=True)
+        setattr(self, frame_name, widget)
+        return widget
+        
     def _create_ai_description_frames(self, parent):
         """Utwórz ramki opisów AI"""
         # Długi opis AI
@@ -175,7 +180,7 @@ class ContentArea:
         scrollbar.config(command=text_widget.yview)
         
         # Konfiguruj podświetlanie składni
-        SyntaxHighlighter.setup_text_widget(text_widget)
+        self.highlighters[area_type] = SyntaxHighlighter.setup_text_widget(text_widget)
         
         # Przypisz widget do odpowiedniego atrybutu
         if area_type == 'long':
@@ -183,20 +188,19 @@ class ContentArea:
         else:
             self.text_ai_short = text_widget
             
-        # Powiąż zdarzenia
-        text_widget.bind("<KeyRelease>", lambda e: self._on_text_change(area_type))
-        text_widget.bind("<<Paste>>", lambda e: self.app.root.after(10, lambda: self._on_text_change(area_type)))
+    def schedule_highlight(self, area_type):
+        """Zaplanuj odświeżenie podświetlenia zmienionych linii (wołane na <<Modified>>)"""
+        self.highlighters[area_type].schedule()
         
-    def _on_text_change(self, area_type):
-        """Obsługuj zmianę tekstu"""
-        if area_type == 'long':
-            SyntaxHighlighter.highlight_syntax(self.text_ai_long)
-        else:
-            SyntaxHighlighter.highlight_syntax(self.text_ai_short)
-            
     def load_html_content(self, frame_name, content):
         """Załaduj treść HTML do odpowiedniej ramki"""
-        frame = getattr(self, frame_name, None)
+        if frame_name not in self.html_containers:
+            return
+        if not content and getattr(self, frame_name) is None:
+            # Pusta ramka bez widgetu - nie ma czego czyścić
+            return
+            
+        frame = self._get_html_widget(frame_name)
         if frame:
             if hasattr(frame, 'load_html'):
                 # tkinterweb HtmlFrame
@@ -211,12 +215,18 @@ class ContentArea:
         if area_type == 'long':
             self.text_ai_long.delete(1.0, tk.END)
             self.text_ai_long.insert(1.0, content)
-            SyntaxHighlighter.highlight_syntax(self.text_ai_long)
+            self.highlighters['long'].highlight()
         elif area_type == 'short':
             self.text_ai_short.delete(1.0, tk.END)
             self.text_ai_short.insert(1.0, content)
-            SyntaxHighlighter.highlight_syntax(self.text_ai_short)
+            self.highlighters['short'].highlight()
             
+    def append_text_content(self, area_type, content):
+        """Dopisz fragment treści na końcu edytowalnego obszaru (strumieniowanie)"""
+        text_widget = self.text_ai_long if area_type == 'long' else self.text_ai_short
+        text_widget.insert(tk.END, content)
+        text_widget.see(tk.END)
+        
     def get_text_content(self, area_type):
         """Pobierz treść z edytowalnego obszaru tekstu"""
         if area_type == 'long':
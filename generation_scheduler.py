@@ -0,0 +1,279 @@
+# generation_scheduler.py
+"""Równoległe generowanie opisów z limitami RPM/TPM OpenAI"""
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from api_client import OpenAIClient, estimate_tokens
+
+# Domyślne limity (tier 1 dla gpt-4o-mini)
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Wiadro tokenów uzupełniane liniowo do pojemności na minutę"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+    def try_acquire(self, amount: float) -> float:
+        """
+        Spróbuj pobrać tokeny bez czekania
+        
+        Args:
+            amount: Liczba tokenów (obcinana do pojemności)
+            
+        Returns:
+            0 jeśli pobrano, w przeciwnym razie czas oczekiwania w sekundach
+        """
+        amount = min(amount, self.capacity)
+        with self.lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+            
+    def refund(self, amount: float) -> None:
+        """Zwróć niewykorzystane tokeny (rezerwacja większa niż zużycie)"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimitedOpenAIClient:
+    """
+    Klient OpenAI z limitami RPM/TPM i ponawianiem po 429/5xx i błędach połączenia
+    
+    Ma ten sam interfejs generate_content co OpenAIClient, więc można go
+    przekazać do AIDescriptionGenerator i używać z wielu wątków.
+    """
+    
+    def __init__(self, client: OpenAIClient,
+                 requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.client = client
+        self.model = client.model
+        self.max_tokens = client.max_tokens
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        # Wspólna pauza dla wszystkich wątków po 429
+        self._cooldown_until = 0.0
+        
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.retries = 0
+        self.rate_limited = 0
+        
+    def _wait_for_capacity(self, reserved_tokens: int) -> None:
+        """Czekaj na pauzę po 429 oraz na wolne miejsce w obu wiadrach"""
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                cooldown = self._cooldown_until - time.monotonic()
+                if cooldown > 0:
+                    time.sleep(cooldown)
+                    continue
+                    
+                wait = self.request_bucket.try_acquire(1)
+                if wait:
+                    time.sleep(wait)
+                    continue
+                    
+                wait = self.token_bucket.try_acquire(reserved_tokens)
+                if wait:
+                    self.request_bucket.refund(1)
+                    time.sleep(wait)
+                    continue
+                return
+        finally:
+            with self._lock:
+                self.waiting -= 1
+                
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Czas oczekiwania przed ponowieniem (Retry-After lub wykładniczy z jitterem)"""
+        try:
+            if retry_after is not None:
+                return float(retry_after) + random.uniform(0, self.base_delay)
+        except ValueError:
+            pass
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+        
+    @staticmethod
+    def _is_retryable(result: Dict[str, Any]) -> bool:
+        """Czy nieudane zapytanie można powtórzyć: 429/5xx albo błąd połączenia (timeout, reset)"""
+        if result.get('status_code') in RETRYABLE_STATUS_CODES:
+            return True
+        # Zerwany strumień po pierwszym fragmencie - ponowienie powtórzyłoby treść
+        return bool(result.get('transport_error')) and not result.get('partial')
+        
+    def generate_content(self, prompt: str) -> Dict[str, Any]:
+        """
+        Generuj treść z zachowaniem limitów
+        
+        Args:
+            prompt: Prompt do wysłania
+            
+        Returns:
+            Słownik jak w OpenAIClient.generate_content
+        """
+        # Trafienie w cache nie zużywa limitów
+        cached = self.client.get_cached(prompt)
+        if cached:
+            return cached
+            
+        return self._call_with_limits(
+            prompt, lambda: self.client.generate_content(prompt, check_cache=False)
+        )
+        
+    def generate_content_stream(self, prompt: str, on_delta: Callable[[str], None],
+                                cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Generuj treść strumieniowo z zachowaniem limitów
+        
+        Ponowienie po 429/5xx jest bezpieczne, bo błąd przychodzi przed
+        pierwszym fragmentem treści. Błąd połączenia jest ponawiany tylko,
+        jeśli żaden fragment nie dotarł jeszcze do on_delta.
+        
+        Args:
+            prompt: Prompt do wysłania
+            on_delta: Funkcja wywoływana z każdym fragmentem
+            cancel_event: Przerywa strumień
+            
+        Returns:
+            Słownik jak w OpenAIClient.generate_content_stream
+        """
+        cached = self.client.get_cached(prompt)
+        if cached:
+            on_delta(cached['content'])
+            return dict(cached, first_token_time=0.0)
+            
+        return self._call_with_limits(
+            prompt,
+            lambda: self.client.generate_content_stream(
+                prompt, on_delta, cancel_event, check_cache=False
+            )
+        )
+        
+    def _call_with_limits(self, prompt: str, call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Wykonaj zapytanie po zarezerwowaniu limitów, ponawiając po 429/5xx i błędach połączenia"""
+        # OpenAI wlicza max_tokens do limitu TPM
+        reserved = estimate_tokens(prompt) + self.max_tokens
+        
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_capacity(reserved)
+            
+            with self._lock:
+                self.in_flight += 1
+            try:
+                result = call()
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    
+            if result['success']:
+                usage = result.get('usage') or {}
+                used = usage.get('prompt_tokens', 0) + usage.get('completion_tokens', 0)
+                if used and used < reserved:
+                    self.token_bucket.refund(reserved - used)
+                return result
+                
+            # Nieudane zapytanie nie zużyło tokenów - zwróć rezerwację, inaczej
+            # seria 429 opróżnia wiadro TPM i dławi pozostałe wątki po pauzie
+            self.token_bucket.refund(reserved)
+            
+            status_code = result.get('status_code')
+            if not self._is_retryable(result) or attempt == self.max_retries:
+                return result
+                
+            delay = self._backoff_delay(attempt, result.get('retry_after'))
+            with self._lock:
+                self.retries += 1
+                if status_code == 429:
+                    self.rate_limited += 1
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            time.sleep(delay)
+            
+        return result
+
+
+class GenerationScheduler:
+    """Pula wątków dla zadań generowania z licznikami kolejki"""
+    
+    def __init__(self, max_workers: int = 8,
+                 client: Optional[RateLimitedOpenAIClient] = None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.client = client
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Dodaj zadanie do kolejki
+        
+        Args:
+            fn: Funkcja do wykonania (np. BatchProcessor.process_product)
+            
+        Returns:
+            Future z wynikiem funkcji
+        """
+        with self._lock:
+            self.queued += 1
+            
+        def task():
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    
+        return self.executor.submit(task)
+        
+    def stats(self) -> Dict[str, int]:
+        """Aktualny stan kolejki i limitera"""
+        with self._lock:
+            stats = {
+                'queued': self.queued,
+                'running': self.running,
+                'completed': self.completed
+            }
+        if self.client:
+            stats.update({
+                'in_flight': self.client.in_flight,
+                'waiting_for_limit': self.client.waiting,
+                'retries': self.client.retries,
+                'rate_limited': self.client.rate_limited
+            })
+        return stats
+        
+    def shutdown(self, wait: bool = True) -> None:
+        """Zatrzymaj pulę wątków"""
+        self.executor.shutdown(wait=wait)
@@ -1,4 +1,5 @@
 # height_manager.py
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
@@ -48,6 +49,14 @@ class HeightManager:
     MIN_HEIGHT = min(HEIGHT_TO_REMOTE_ID.keys())
     MAX_HEIGHT = max(HEIGHT_TO_REMOTE_ID.keys())
     
+    # Posortowane wzrosty i gotowe fragmenty <option> (te same indeksy) -
+    # zakres wzrostu to ciągły wycinek wyznaczany przez bisect
+    HEIGHTS = tuple(sorted(HEIGHT_TO_REMOTE_ID))
+    HEIGHT_OPTIONS_XML = tuple(
+        f'   <option name="Wzrost" remote_id="{remote_id}">{height}</option>'
+        for height, remote_id in sorted(HEIGHT_TO_REMOTE_ID.items())
+    )
+    
     def __init__(self):
         self.height_range: Optional[HeightRange] = None
         
@@ -83,20 +92,34 @@ class HeightManager:
         Returns:
             Lista słowników z danymi do XML
         """
+        start, end = self._selected_slice()
+        return [
+            {
+                'name': 'Wzrost',
+                'remote_id': self.HEIGHT_TO_REMOTE_ID[height],
+                'value': str(height)
+            }
+            for height in self.HEIGHTS[start:end]
+        ]
+        
+    def get_height_options_xml(self) -> Tuple[str, ...]:
+        """
+        Pobierz gotowe linie <option> wybranego zakresu wzrostu do XML
+        
+        Returns:
+            Wycinek przygotowanych fragmentów (pusty bez zakresu)
+        """
+        start, end = self._selected_slice()
+        return self.HEIGHT_OPTIONS_XML[start:end]
+        
+    def _selected_slice(self) -> Tuple[int, int]:
+        """Indeksy (początek, koniec) wybranego zakresu w HEIGHTS"""
         if not self.height_range:
-            return []
-            
-        height_options = []
-        
-        for height in range(self.height_range.min_height, self.height_range.max_height + 1):
-            if height in self.HEIGHT_TO_REMOTE_ID:
-                height_options.append({
-                    'name': 'Wzrost',
-                    'remote_id': self.HEIGHT_TO_REMOTE_ID[height],
-                    'value': str(height)
-                })
-                
-        return height_options
+            return 0, 0
+        return (
+            bisect_left(self.HEIGHTS, self.height_range.min_height),
+            bisect_right(self.HEIGHTS, self.height_range.max_height)
+        )
         
     def get_height_range_summary(self) -> str:
         """
@@ -117,15 +140,8 @@ class HeightManager:
         Returns:
             Liczba wartości w zakresie
         """
-        if not self.height_range:
-            return 0
-            
-        count = 0
-        for height in range(self.height_range.min_height, self.height_range.max_height + 1):
-            if height in self.HEIGHT_TO_REMOTE_ID:
-                count += 1
-                
-        return count
+        start, end = self._selected_slice()
+        return end - start
         
     def is_valid_height(self, height: int) -> bool:
         """
@@ -146,7 +162,7 @@ class HeightManager:
         Returns:
             Posortowana lista dostępnych wzrostów
         """
-        return sorted(self.HEIGHT_TO_REMOTE_ID.keys())
+        return list(self.HEIGHTS)
         
     def extract_height_from_api_data(self, api_data: Dict) -> Optional[HeightRange]:
         """
@@ -0,0 +1,381 @@
+# html_highlighter.py
+"""Podświetlanie składni HTML w widgetach tekstu: tokenizery, indeks linii i przyrostowe odświeżanie"""
+import re
+import time
+import tkinter as tk
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+HIGHLIGHT_TAGS = ("html_tag", "html_attribute", "html_value")
+# Tag tekstu wstawionego / sklejonego od ostatniego przebiegu (przesuwa się razem z tekstem)
+DIRTY_TAG = "html_dirty"
+HIGHLIGHT_DELAY_MS = 50
+# Porcja linii przebiegu z limitem czasu (limit sprawdzany między porcjami)
+HIGHLIGHT_CHUNK_LINES = 100
+
+TAG_PATTERN = re.compile(r'</?(\w+)(?:\s+[^>]*)?>|</\w+>')
+# Wartość atrybutu nie przechodzi do następnej linii - linie poza tagami tokenizują się niezależnie
+ATTRIBUTE_PATTERN = re.compile(r'(\w+)=(["\'])([^"\'\n]*)\2')
+
+# Reguły HTMLTextWidget: komentarze oraz nawiasy, nazwa i atrybuty tagu osobno
+MARKUP_TAGS = ("html_tag", "html_attribute", "html_value", "html_comment")
+MARKUP_COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.DOTALL)
+MARKUP_TAG_PATTERN = re.compile(
+    r'<(/?)(\w+)((?:\s+\w+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+))?)*)\s*(/?)>'
+)
+MARKUP_ATTRIBUTE_PATTERN = re.compile(r'(\w+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+# Komenda widgetu zastępująca oryginalną: insert / replace / delete są przekazywane
+# przez uplevel, więc błędy trafiają do wywołującego (np. catch w bindingach Tk),
+# a Python tylko zapamiętuje początek zmiany i oznacza zmieniony tekst
+DISPATCH_PROC = """
+proc %(widget)s {args} {
+    switch -exact -- [lindex $args 0] {
+        insert - replace - delete {
+            set start [%(before)s {*}$args]
+            set result [uplevel 1 [list %(command)s {*}$args]]
+            %(after)s $start {*}$args
+            return $result
+        }
+    }
+    uplevel 1 [list %(command)s {*}$args]
+}
+"""
+
+# (nazwa tagu Tk, początek, koniec) - przesunięcia znaków w tokenizowanym tekście
+Token = Tuple[str, int, int]
+Tokenizer = Callable[[str], Iterable[Token]]
+
+
+def tokenize_html(content: str) -> Iterator[Token]:
+    """
+    Podziel tekst na fragmenty do podświetlenia
+    
+    Args:
+        content: Tekst HTML (cały dokument lub pełne linie)
+        
+    Yields:
+        Trójki (tag, początek, koniec)
+    """
+    for match in TAG_PATTERN.finditer(content):
+        yield "html_tag", match.start(), match.end()
+        
+    for match in ATTRIBUTE_PATTERN.finditer(content):
+        yield "html_attribute", match.start(1), match.end(1)
+        # Wartość razem z cudzysłowem otwierającym
+        yield "html_value", match.start(2), match.end(3)
+
+
+def tokenize_markup(content: str) -> Iterator[Token]:
+    """
+    Podziel tekst na fragmenty do podświetlenia według reguł HTMLTextWidget
+    
+    Args:
+        content: Tekst HTML
+        
+    Yields:
+        Trójki (tag, początek, koniec)
+    """
+    for match in MARKUP_COMMENT_PATTERN.finditer(content):
+        yield "html_comment", match.start(), match.end()
+        
+    for match in MARKUP_TAG_PATTERN.finditer(content):
+        # Nawias otwierający, nazwa tagu i nawias zamykający
+        yield "html_tag", match.start(), match.start() + 1
+        yield "html_tag", match.start(2), match.end(2)
+        yield "html_tag", match.end() - 1, match.end()
+        
+        attributes_start = match.start(3)
+        for attribute in MARKUP_ATTRIBUTE_PATTERN.finditer(match.group(3)):
+            yield "html_attribute", attributes_start + attribute.start(1), attributes_start + attribute.end(1)
+            if attribute.group(2) is not None or attribute.group(3) is not None:
+                # Wartość w cudzysłowach - razem z cudzysłowami
+                group = 2 if attribute.group(2) is not None else 3
+                yield "html_value", attributes_start + attribute.start(group) - 1, attributes_start + attribute.end(group) + 1
+            elif attribute.group(4) is not None:
+                yield "html_value", attributes_start + attribute.start(4), attributes_start + attribute.end(4)
+
+
+class LineIndex:
+    """
+    Przeliczanie przesunięć znaków w tekście na indeksy Tk "linia.kolumna"
+    
+    Początki linii są liczone raz na przebieg, a przesunięcie zamieniane
+    w Pythonie przez bisect - bez wywołania index("1.0+Nc"), którego koszt
+    w Tk rośnie z przesunięciem.
+    """
+    
+    def __init__(self, lines: Sequence[str], first_line: int = 1):
+        """
+        Args:
+            lines: Linie tekstu (bez znaków nowej linii)
+            first_line: Numer linii Tk pierwszej z nich
+        """
+        self.first_line = first_line
+        self.starts = list(accumulate((len(line) + 1 for line in lines[:-1]), initial=0))
+        
+    @classmethod
+    def from_text(cls, content: str, first_line: int = 1) -> "LineIndex":
+        return cls(content.split("\n"), first_line)
+        
+    def index(self, offset: int) -> str:
+        """Indeks Tk znaku o danym przesunięciu"""
+        line = bisect_right(self.starts, offset) - 1
+        return f"{line + self.first_line}.{offset - self.starts[line]}"
+
+
+def apply_tokens(text_widget, tokens: Iterable[Token], line_index: LineIndex) -> None:
+    """
+    Nałóż tagi na fragmenty tekstu - jedno tag_add na tag ze wszystkimi zakresami
+    
+    Args:
+        text_widget: Widget tk.Text
+        tokens: Trójki (tag, początek, koniec) z tokenizera
+        line_index: Indeks linii tokenizowanego tekstu
+    """
+    ranges: Dict[str, List[str]] = {}
+    index = line_index.index
+    for tag, start, end in tokens:
+        ranges.setdefault(tag, []).extend((index(start), index(end)))
+        
+    for tag, indices in ranges.items():
+        text_widget.tag_add(tag, *indices)
+
+
+def highlight_lines(text_widget, lines: List[str], first: int, last: int,
+                    tokenize: Tokenizer = tokenize_html, tags: Sequence[str] = HIGHLIGHT_TAGS) -> None:
+    """
+    Odśwież podświetlenie linii [first, last) widgetu
+    
+    Args:
+        text_widget: Widget tk.Text ze skonfigurowanymi tagami
+        lines: Aktualne linie treści widgetu
+        first: Pierwsza linia (od 0)
+        last: Linia za ostatnią odświeżaną
+        tokenize: Tokenizer (domyślnie reguły HTML opisów AI)
+        tags: Tagi nakładane przez tokenizer
+    """
+    # Od znaku nowej linii przed zakresem - po usunięciu linii może nieść tag z jej końca
+    for tag in tags:
+        text_widget.tag_remove(tag, f"{first + 1}.0-1c", f"{last + 1}.0")
+        
+    region = lines[first:last]
+    apply_tokens(text_widget, tokenize("\n".join(region)), LineIndex(region, first + 1))
+
+
+def _last_bracket(line: str) -> Optional[str]:
+    """Ostatni nawias ostry w linii ('<', '>' lub None)"""
+    opening = line.rfind("<")
+    closing = line.rfind(">")
+    if opening > closing:
+        return "<"
+    return ">" if closing >= 0 else None
+
+
+def expand_to_tags(lines: List[str], first: int, last: int) -> Tuple[int, int]:
+    """
+    Poszerz zakres linii tak, żeby zaczynał się i kończył poza tagiem HTML
+    
+    Tag nie zawiera '>' przed swoim końcem, więc granica linii leży poza
+    tagiem, jeśli ostatni nawias przed nią to '>' (albo nie ma żadnego).
+    Dzięki temu tag rozpięty na kilka linii jest tokenizowany w całości.
+    
+    Returns:
+        Para (pierwsza, za ostatnią)
+    """
+    line = first - 1
+    while line >= 0:
+        bracket = _last_bracket(lines[line])
+        if bracket == ">":
+            break
+        if bracket == "<":
+            first = line
+        line -= 1
+        
+    state = None
+    for line in range(last - 1, first - 1, -1):
+        state = _last_bracket(lines[line])
+        if state:
+            break
+            
+    while state == "<" and last < len(lines):
+        state = _last_bracket(lines[last]) or state
+        last += 1
+        
+    return first, last
+
+
+def merge_regions(regions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Połącz nachodzące na siebie lub sąsiednie zakresy linii"""
+    merged: List[Tuple[int, int]] = []
+    for first, last in sorted(regions):
+        if merged and first <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+class IncrementalHighlighter:
+    """
+    Podświetlanie składni jednego widgetu, odświeżające tylko zmienione linie
+    
+    Komenda Tcl widgetu jest opakowana: każde insert / delete (klawiatura,
+    wklejanie, kod) oznacza dotknięty tekst tagiem DIRTY_TAG. schedule()
+    odkłada odświeżenie o delay_ms, więc kolejne zmiany w tym czasie są
+    łączone w jeden przebieg. Przebieg tokenizuje tylko linie z DIRTY_TAG,
+    dla HTML poszerzone do granic tagów (expand_to_tags) - koszt naciśnięcia
+    klawisza nie zależy od liczby tagów w dokumencie.
+    
+    Z budget_ms przebieg kończy się po przekroczeniu limitu czasu (porcjami
+    po HIGHLIGHT_CHUNK_LINES linii), a resztę dokańczają kolejne przebiegi
+    w czasie bezczynności Tk. Czas ostatniego przebiegu: last_duration.
+    """
+    
+    def __init__(self, text_widget, delay_ms: int = HIGHLIGHT_DELAY_MS,
+                 tokenize: Tokenizer = tokenize_html, tags: Sequence[str] = HIGHLIGHT_TAGS,
+                 line_local: bool = False, budget_ms: Optional[float] = None):
+        """
+        Args:
+            text_widget: Widget tk.Text ze skonfigurowanymi tagami
+            delay_ms: Opóźnienie odświeżenia po zmianie [ms]
+            tokenize: Tokenizer (domyślnie reguły HTML opisów AI)
+            tags: Tagi nakładane przez tokenizer
+            line_local: Fragmenty nie przechodzą przez koniec linii - bez poszerzania do granic tagów HTML
+            budget_ms: Limit czasu jednego przebiegu [ms] (None - bez limitu)
+        """
+        self.text_widget = text_widget
+        self.delay_ms = delay_ms
+        self.tokenize = tokenize
+        self.tags = tuple(tags)
+        self.line_local = line_local
+        self.budget_ms = budget_ms
+        self.last_duration = 0.0
+        self._after_id = None
+        
+        # Oryginalna komenda widgetu pod nową nazwą, pod starą - DISPATCH_PROC
+        self._command = f"{text_widget._w}_highlighted"
+        before = f"{self._command}_before"
+        after = f"{self._command}_after"
+        text_widget.tk.call("rename", text_widget._w, self._command)
+        text_widget.tk.createcommand(before, self._before_change)
+        text_widget.tk.createcommand(after, self._mark_dirty)
+        text_widget.tk.eval(DISPATCH_PROC % {
+            "widget": text_widget._w, "command": self._command, "before": before, "after": after
+        })
+        
+    def schedule(self) -> None:
+        """Zaplanuj odświeżenie (debounce - odkłada już zaplanowane)"""
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+        self._after_id = self.text_widget.after(self.delay_ms, self.update)
+        
+    def highlight(self) -> None:
+        """Podświetl cały dokument od razu, bez limitu czasu (np. po wczytaniu nowej treści)"""
+        self._call("tag", "add", DIRTY_TAG, "1.0", "end")
+        self.update(limited=False)
+        
+    def update(self, limited: bool = True) -> List[Tuple[int, int]]:
+        """
+        Odśwież podświetlenie linii zmienionych od poprzedniego przebiegu
+        
+        Args:
+            limited: Przestrzegaj budget_ms (reszta linii w kolejnym przebiegu)
+            
+        Returns:
+            Odświeżone zakresy linii (pierwsza, za ostatnią; od 0)
+        """
+        self.cancel()
+        started = time.perf_counter()
+        ranges = self.text_widget.tag_ranges(DIRTY_TAG)
+        if not ranges:
+            return []
+        self._call("tag", "remove", DIRTY_TAG, "1.0", "end")
+        
+        lines = self.text_widget.get("1.0", "end-1c").split("\n")
+        regions = []
+        for start, end in zip(ranges[::2], ranges[1::2]):
+            first = int(str(start).split(".")[0]) - 1
+            last = min(int(str(end).split(".")[0]), len(lines))
+            regions.append(self._expand(lines, first, max(last, first + 1)))
+            
+        deadline = None
+        if limited and self.budget_ms is not None:
+            deadline = started + self.budget_ms / 1000
+            
+        done = []
+        remaining = False
+        for first, last in merge_regions(regions):
+            while first < last:
+                if deadline is not None and done and time.perf_counter() > deadline:
+                    # Poza limitem - reszta zostaje oznaczona do następnego przebiegu
+                    self._call("tag", "add", DIRTY_TAG, f"{first + 1}.0", f"{last}.end")
+                    remaining = True
+                    break
+                end = min(first + HIGHLIGHT_CHUNK_LINES, last)
+                if not self.line_local:
+                    end = min(expand_to_tags(lines, first, end)[1], last)
+                highlight_lines(self.text_widget, lines, first, end, self.tokenize, self.tags)
+                done.append((first, end))
+                first = end
+                
+        if remaining:
+            self._after_id = self.text_widget.after_idle(self.update)
+        self.last_duration = time.perf_counter() - started
+        return merge_regions(done)
+        
+    def cancel(self) -> None:
+        """Anuluj zaplanowane odświeżenie"""
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+            
+    def _expand(self, lines: List[str], first: int, last: int) -> Tuple[int, int]:
+        """
+        Poszerz zakres do granic tagów w nowej treści oraz o resztę starego tagu
+        
+        Usunięcie '<' nie zmienia linii za zakresem, ale zdejmuje z nich
+        tag, który wcześniej ciągnął się przez kolejne linie.
+        """
+        if self.line_local:
+            return first, last
+            
+        while True:
+            first, last = expand_to_tags(lines, first, last)
+            boundary = f"{last}.end"
+            if last >= len(lines) or "html_tag" not in self.text_widget.tag_names(boundary):
+                return first, last
+            _, end = self.text_widget.tag_prevrange("html_tag", f"{boundary}+1c")
+            last = max(last + 1, int(str(end).split(".")[0]))
+            
+    def _call(self, *args):
+        return self.text_widget.tk.call((self._command,) + args)
+        
+    def _before_change(self, operation, *args):
+        """Indeks początku zmiany, liczony przed operacją ("" jeśli nie da się go ustalić)"""
+        # Wyjątek z komendy wywołanej przez Tcl wróciłby dopiero w mainloop - błędy tylko tutaj
+        try:
+            start = self._call("index", args[0])
+            if operation != "delete" and self.text_widget.tk.getboolean(self._call("compare", start, "==", "end")):
+                # Tk wstawia na końcu przed ostatnim znakiem nowej linii
+                start = self._call("index", "end-1c")
+            return start
+        except (tk.TclError, IndexError):
+            return ""
+            
+    def _mark_dirty(self, start, operation, *args):
+        """Oznacz tekst zmieniony przez udaną operację tagiem DIRTY_TAG"""
+        if not start:
+            return
+        try:
+            if operation == "delete":
+                # Znaki po obu stronach sklejenia - ich linie wymagają odświeżenia
+                self._call("tag", "add", DIRTY_TAG, f"{start}-1c", f"{start}+1c")
+                return
+            # insert index tekst ?tagi tekst...?, replace index1 index2 tekst ?tagi...?
+            texts = args[1::2] if operation == "insert" else args[2::2]
+            length = sum(len(chars) for chars in texts)
+            self._call("tag", "add", DIRTY_TAG, start, f"{start}+{length}c")
+        except tk.TclError:
+            pass
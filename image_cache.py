@@ -0,0 +1,181 @@
+# image_cache.py
+"""Cache obrazów produktów: zdekodowane obrazy w pamięci (LRU) + surowe pliki na dysku"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from PIL import Image
+
+from cache_directory import CacheDirectory
+
+DEFAULT_IMAGE_CACHE_DIR = os.path.join("cache", "images")
+DEFAULT_IMAGE_TTL = 24 * 3600
+DEFAULT_MEMORY_IMAGES = 64
+# Limity plików na dysku (przeterminowane obrazy służą tylko do rewalidacji)
+DEFAULT_IMAGE_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_IMAGE_MAX_AGE = 30 * 24 * 3600
+
+
+class ImageCache:
+    """
+    Dwupoziomowy cache obrazów
+    
+    Pamięć trzyma max_entries ostatnio używanych, już przeskalowanych obrazów
+    PIL (klucz: URL + rozmiar ramki). Dysk trzyma surowe bajty pobranych plików
+    (klucz: URL) razem z ETag / Last-Modified. Wpisy młodsze niż ttl są
+    używane bez zapytania do serwera; starsze są rewalidowane zapytaniem
+    warunkowym. Pliki starsze niż max_age są usuwane z dysku, a po
+    przekroczeniu max_bytes - najdawniej zapisane (CacheDirectory).
+    
+    Obrazy zwracane z pamięci są współdzielone - nie wolno ich modyfikować.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_IMAGE_CACHE_DIR,
+                 ttl: float = DEFAULT_IMAGE_TTL, max_entries: int = DEFAULT_MEMORY_IMAGES,
+                 max_bytes: int = DEFAULT_IMAGE_MAX_BYTES, max_age: float = DEFAULT_IMAGE_MAX_AGE):
+        """
+        Args:
+            cache_dir: Folder na pliki obrazów (None - tylko pamięć)
+            ttl: Czas świeżości obrazu w sekundach
+            max_entries: Liczba zdekodowanych obrazów trzymanych w pamięci
+            max_bytes: Limit rozmiaru plików na dysku
+            max_age: Wiek pliku [s], po którym obraz jest usuwany z dysku
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.memory: "OrderedDict[Hashable, Tuple[float, Image.Image]]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        
+        self.disk = CacheDirectory(cache_dir, max_bytes, max_age, label="image cache") if cache_dir else None
+        
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest)
+        
+    def is_fresh(self, fetched: float) -> bool:
+        """Czy obraz pobrany w chwili fetched jest młodszy niż ttl"""
+        return time.time() - fetched <= self.ttl
+        
+    # Poziom 1: zdekodowane obrazy w pamięci
+    
+    def get_image(self, key: Hashable) -> Optional[Tuple[float, Image.Image]]:
+        """
+        Pobierz przeskalowany obraz z pamięci
+        
+        Args:
+            key: Klucz obrazu (URL i parametry skalowania)
+            
+        Returns:
+            Para (czas pobrania, obraz) lub None
+        """
+        with self.lock:
+            cached = self.memory.get(key)
+            if cached is not None:
+                self.memory.move_to_end(key)
+            return cached
+            
+    def put_image(self, key: Hashable, image: Image.Image, fetched: Optional[float] = None) -> None:
+        """Zapamiętaj przeskalowany obraz"""
+        with self.lock:
+            self.memory[key] = (fetched if fetched is not None else time.time(), image)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+                
+    def record_memory_hit(self) -> None:
+        with self.lock:
+            self.memory_hits += 1
+            
+    # Poziom 2: surowe bajty na dysku
+    
+    def get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadane pliku z dysku
+        
+        Args:
+            url: URL obrazu
+            
+        Returns:
+            Słownik z kluczami fetched, etag, last_modified lub None
+        """
+        if not self.cache_dir:
+            return None
+        try:
+            with open(f"{self._path(url)}.json", "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+            
+    def read_bytes(self, url: str) -> Optional[bytes]:
+        """Surowe bajty obrazu z dysku (None jeśli brak)"""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(url), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+            
+    def put_bytes(self, url: str, content: bytes,
+                  etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Zapisz pobrany plik obrazu
+        
+        Args:
+            url: URL obrazu
+            content: Bajty odpowiedzi
+            etag: Nagłówek ETag odpowiedzi (jeśli był)
+            last_modified: Nagłówek Last-Modified odpowiedzi (jeśli był)
+        """
+        with self.lock:
+            self.downloads += 1
+        if not self.disk:
+            return
+        path = self._path(url)
+        # Najpierw bajty, potem metadane - wpis bez pliku .json jest pomijany
+        if self.disk.write(path, content):
+            self._write_entry(path, {"url": url, "fetched": time.time(), "etag": etag, "last_modified": last_modified})
+        
+    def touch(self, url: str, entry: Dict[str, Any]) -> None:
+        """Odnów świeżość pliku po odpowiedzi 304 Not Modified"""
+        with self.lock:
+            self.revalidated += 1
+        if self.disk:
+            path = self._path(url)
+            # Bajty i metadane starzeją się razem - evict nie zostawi samego .json
+            self.disk.touch(path)
+            self._write_entry(path, dict(entry, fetched=time.time()))
+            
+    def record_disk_hit(self) -> None:
+        with self.lock:
+            self.disk_hits += 1
+            
+    def clear(self) -> None:
+        """Usuń wszystkie obrazy z pamięci i dysku"""
+        with self.lock:
+            self.memory.clear()
+        if self.disk:
+            self.disk.clear()
+            
+    def stats(self) -> Dict[str, int]:
+        """Liczniki trafień (pamięć / dysk), rewalidacji i pobrań"""
+        with self.lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "revalidated": self.revalidated,
+                "downloads": self.downloads,
+                "memory_entries": len(self.memory)
+            }
+            
+    def _write_entry(self, path: str, entry: Dict[str, Any]) -> None:
+        self.disk.write(f"{path}.json", json.dumps(entry).encode("utf-8"))
@@ -1,31 +1,51 @@
 # image_manager.py
 import tkinter as tk
-import requests
 from PIL import Image, ImageTk
-from io import BytesIO
-from typing import Optional, Tuple
+from typing import Callable, Hashable, Optional
+from image_cache import ImageCache
+from image_service import ImageService, QUALITY_BALANCED
+from task_executor import Task, TaskExecutor
+
+# Rozmiar obrazu w oknie podglądu
+PREVIEW_MAX_WIDTH = 580
+PREVIEW_MAX_HEIGHT = 550
 
 class ImageManager:
     """Manager obrazów produktów"""
     
-    def __init__(self):
+    def __init__(self, executor: Optional[TaskExecutor] = None, cache: Optional[ImageCache] = None,
+                 quality: str = QUALITY_BALANCED):
+        """
+        Args:
+            executor: Wykonawca zadań w tle (bez niego obrazy są pobierane synchronicznie)
+            cache: Cache obrazów (domyślnie pamięć + cache/images)
+            quality: Jakość skalowania obrazów (image_service.QUALITY_*)
+        """
         self.image_base_path: Optional[str] = None
+        self.service = ImageService(executor, cache, quality)
         
     def load_and_display_image(self, image_label: tk.Label, image_path: str, 
-                             frame_width: int = 120, frame_height: int = 120) -> bool:
+                             frame_width: int = 120, frame_height: int = 120,
+                             on_loaded: Optional[Callable[[], None]] = None,
+                             group: Optional[Hashable] = None) -> bool:
         """
         Załaduj i wyświetl obraz produktu w miniaturze
         
+        Z executorem obraz jest pobierany w tle, a label pokazuje "[Ładowanie...]".
+        
         Args:
             image_label: Label do wyświetlenia obrazu
             image_path: Ścieżka do obrazu
             frame_width: Szerokość ramki
             frame_height: Wysokość ramki
+            on_loaded: Wywoływane w wątku UI po wyświetleniu obrazu
+            group: Grupa zadań executora (wynik odrzucany po invalidate)
             
         Returns:
-            True jeśli obraz został załadowany pomyślnie
+            True jeśli obraz został załadowany (lub ładowanie rozpoczęte)
         """
         if not image_path:
+            self.image_base_path = None
             image_label.config(text="[Brak obrazu]", image='', cursor="")
             if hasattr(image_label, 'unbind'):
                 image_label.unbind("<Button-1>")
@@ -35,61 +55,34 @@ class ImageManager:
         image_url = f"https://www.gsport.pl{image_path}_100.jpg"
         self.image_base_path = f"https://www.gsport.pl{image_path}"
         
-        try:
-            # Pobierz obraz
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            
-            # Otwórz obraz z PIL
-            img = Image.open(BytesIO(response.content))
-            
-            # Oblicz rozmiar zachowując proporcje
-            new_width, new_height = self._calculate_image_size(
-                img.size, frame_width, frame_height
-            )
-            
-            # Zmień rozmiar obrazu
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Konwertuj do PhotoImage
-            photo = ImageTk.PhotoImage(img)
-            
-            # Aktualizuj label
-            image_label.config(text='', image=photo, cursor="hand2")
-            image_label.image = photo  # Zachowaj referencję
-            
-            return True
-            
-        except Exception as e:
+        def on_success(img):
+            self._display_thumbnail(image_label, img)
+            if on_loaded:
+                on_loaded()
+                
+        def on_error(e):
             print(f"Error loading image: {e}")
             image_label.config(text="[Błąd ładowania]", image='', cursor="")
-            return False
             
-    def _calculate_image_size(self, original_size: Tuple[int, int], 
-                            max_width: int, max_height: int) -> Tuple[int, int]:
-        """
-        Oblicz nowy rozmiar obrazu zachowując proporcje
+        image_label.config(text="[Ładowanie...]", image='', cursor="")
+        self.service.request(
+            image_url, frame_width, frame_height, on_success,
+            on_error=on_error, group=group
+        )
+        return True
         
-        Args:
-            original_size: Oryginalny rozmiar (width, height)
-            max_width: Maksymalna szerokość
-            max_height: Maksymalna wysokość
-            
-        Returns:
-            Nowy rozmiar (width, height)
-        """
-        width, height = original_size
-        aspect_ratio = width / height
-        
-        if aspect_ratio > 1:  # Szerszy niż wysoki
-            new_width = max_width
-            new_height = int(max_width / aspect_ratio)
-        else:  # Wyższy niż szeroki
-            new_height = max_height
-            new_width = int(max_height * aspect_ratio)
+    def _display_thumbnail(self, image_label: tk.Label, img: Optional[Image.Image]) -> None:
+        """Wyświetl pobrany obraz w labelu (wątek UI)"""
+        if img is None:
+            return
             
-        return new_width, new_height
+        # Konwertuj do PhotoImage
+        photo = ImageTk.PhotoImage(img)
         
+        # Aktualizuj label
+        image_label.config(text='', image=photo, cursor="hand2")
+        image_label.image = photo  # Zachowaj referencję
+            
     def show_image_preview(self, parent_window: tk.Tk) -> None:
         """
         Pokaż podgląd obrazu w większym rozmiarze
@@ -111,29 +104,26 @@ class ImageManager:
         y = (preview_window.winfo_screenheight() - 600) // 2
         preview_window.geometry(f"600x600+{x}+{y}")
         
-        try:
-            # Użyj większego obrazu (500px szerokości)
-            large_image_url = f"{self.image_base_path}_500.jpg"
-            
-            # Pobierz obraz
-            response = requests.get(large_image_url, timeout=10)
-            response.raise_for_status()
-            
-            # Otwórz obraz z PIL
-            img = Image.open(BytesIO(response.content))
-            
-            # Oblicz rozmiar dla okna podglądu
-            max_width = 580
-            max_height = 550
-            
-            width, height = img.size
-            new_width, new_height = self._calculate_image_size(
-                (width, height), max_width, max_height
-            )
-            
-            # Zmień rozmiar tylko jeśli konieczne
-            if width > max_width or height > max_height:
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Użyj większego obrazu (500px szerokości)
+        large_image_url = f"{self.image_base_path}_500.jpg"
+        
+        # Rozmiar dla okna podglądu
+        max_width = PREVIEW_MAX_WIDTH
+        max_height = PREVIEW_MAX_HEIGHT
+        
+        status_label = tk.Label(
+            preview_window,
+            text="Ładowanie...",
+            bg="#F9F9F9",
+            fg="#666666",
+            font=("Helvetica", 10)
+        )
+        status_label.pack(expand=True)
+        
+        def on_success(img):
+            if img is None or not preview_window.winfo_exists():
+                return
+            status_label.destroy()
             
             # Konwertuj do PhotoImage
             photo = ImageTk.PhotoImage(img)
@@ -156,16 +146,39 @@ class ImageManager:
             )
             close_btn.pack(pady=10)
             
-        except Exception as e:
-            error_label = tk.Label(
-                preview_window,
-                text=f"Nie można załadować obrazu:\n{str(e)}",
-                bg="#F9F9F9",
-                fg="#E24B38",
-                font=("Helvetica", 10)
-            )
-            error_label.pack(expand=True)
+        def on_error(e):
+            if not preview_window.winfo_exists():
+                return
+            status_label.config(text=f"Nie można załadować obrazu:\n{str(e)}", fg="#E24B38")
             
+        # Obraz pobrany wcześniej (np. przez prefetch_preview) jest wyświetlany od razu
+        self.service.request(
+            large_image_url, max_width, max_height, on_success,
+            on_error=on_error, shrink_only=True
+        )
+        
+    def prefetch_preview(self, group: Optional[Hashable] = None) -> Optional[Task]:
+        """
+        Pobierz i przeskaluj obraz podglądu w tle, zanim operator kliknie miniaturę
+        
+        Wynik trafia tylko do cache - show_image_preview otwiera się bez
+        czekania na sieć. Zadanie jest przerywane przez executor.invalidate(group).
+        
+        Args:
+            group: Grupa zadań executora (zwykle zadania aktualnego produktu)
+            
+        Returns:
+            Zadanie prefetchu lub None (brak obrazu / executora, obraz już w pamięci)
+        """
+        if not self.image_base_path:
+            return None
+            
+        return self.service.prefetch(
+            f"{self.image_base_path}_500.jpg",
+            PREVIEW_MAX_WIDTH, PREVIEW_MAX_HEIGHT, shrink_only=True,
+            group=group
+        )
+        
     def bind_preview_click(self, image_label: tk.Label, parent_window: tk.Tk) -> None:
         """
         Powiąż kliknięcie obrazu z podglądem
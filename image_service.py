@@ -0,0 +1,297 @@
+# image_service.py
+"""Asynchroniczna usługa obrazów: pobieranie, dekodowanie, skalowanie, anulowanie i cache"""
+import threading
+import time
+from io import BytesIO
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from PIL import Image
+
+from api_client import get_shared_session
+from image_cache import ImageCache
+from task_executor import Task, TaskExecutor
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+KEY_LOCK_STRIPES = 16
+
+# Jakość skalowania obrazów
+QUALITY_BEST = "best"          # pełne dekodowanie + LANCZOS
+QUALITY_BALANCED = "balanced"  # dekodowanie JPEG w skali >= 2x docelowej (draft) + LANCZOS
+QUALITY_FAST = "fast"          # dekodowanie JPEG w skali >= docelowej (draft) + BILINEAR
+QUALITY_MODES = (QUALITY_BEST, QUALITY_BALANCED, QUALITY_FAST)
+
+ImageKey = Tuple[str, int, int, bool]
+
+
+class ImageService:
+    """
+    Jedno miejsce ładowania obrazów dla całego UI
+    
+    request() dostarcza przeskalowany obraz PIL do callbacku w wątku Tk:
+    od razu, jeśli jest świeży w pamięci, inaczej po pobraniu w tle.
+    Zmniejszanie JPEG zależy od quality: Image.draft dekoduje plik od razu
+    w skali 1/2, 1/4 lub 1/8, więc duże zdjęcie nie jest rozpakowywane
+    w pełnej rozdzielczości. Bez executora wszystko dzieje się synchronicznie.
+    """
+    
+    def __init__(self, executor: Optional[TaskExecutor] = None, cache: Optional[ImageCache] = None,
+                 quality: str = QUALITY_BALANCED):
+        """
+        Args:
+            executor: Wykonawca zadań w tle (None - ładowanie synchroniczne)
+            cache: Cache obrazów (domyślnie pamięć + cache/images)
+            quality: Jakość skalowania (QUALITY_BEST / QUALITY_BALANCED / QUALITY_FAST)
+        """
+        if quality not in QUALITY_MODES:
+            raise ValueError(f"Unknown image quality: {quality}")
+        self.executor = executor
+        self.cache = cache if cache is not None else ImageCache()
+        self.quality = quality
+        # Jedno pobieranie na obraz: drugie żądanie czeka na trwające zamiast pobierać drugi raz
+        self._key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        self.lock = threading.Lock()
+        self.download_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.decodes = 0
+        
+    def request(self, url: str, max_width: int, max_height: int,
+                on_success: Callable[[Image.Image], None],
+                on_error: Optional[Callable[[Exception], None]] = None,
+                shrink_only: bool = False,
+                group: Optional[Hashable] = None) -> Optional[Task]:
+        """
+        Załaduj obraz dopasowany do ramki i przekaż go do callbacku (wątek UI)
+        
+        Args:
+            url: URL obrazu
+            max_width: Szerokość ramki
+            max_height: Wysokość ramki
+            on_success: Wywoływane z obrazem PIL (nie wywoływane po anulowaniu)
+            on_error: Wywoływane z wyjątkiem pobierania / dekodowania
+            shrink_only: Nie powiększaj obrazów mniejszych niż ramka
+            group: Grupa zadań executora (wynik odrzucany po invalidate)
+            
+        Returns:
+            Zadanie w tle lub None (obraz z pamięci / tryb synchroniczny)
+        """
+        key = (url, max_width, max_height, shrink_only)
+        
+        img = self.get_cached(key)
+        if img is not None:
+            on_success(img)
+            return None
+            
+        def deliver(result: Optional[Image.Image]) -> None:
+            if result is not None:
+                on_success(result)
+                
+        if self.executor is not None:
+            return self.executor.submit(
+                self.load, url, max_width, max_height, shrink_only,
+                group=group, on_success=deliver, on_error=on_error
+            )
+            
+        try:
+            result = self.load(None, url, max_width, max_height, shrink_only)
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            return None
+        deliver(result)
+        return None
+        
+    def prefetch(self, url: str, max_width: int, max_height: int, shrink_only: bool = False,
+                 group: Optional[Hashable] = None) -> Optional[Task]:
+        """
+        Załaduj obraz w tle tylko do cache (np. zanim operator go zażąda)
+        
+        Returns:
+            Zadanie prefetchu lub None (brak executora / obraz już w pamięci)
+        """
+        if self.executor is None or self.get_cached((url, max_width, max_height, shrink_only)) is not None:
+            return None
+            
+        return self.executor.submit(
+            self.load, url, max_width, max_height, shrink_only,
+            group=group,
+            on_error=lambda e: print(f"Error prefetching image {url}: {e}")
+        )
+        
+    def get_cached(self, key: ImageKey) -> Optional[Image.Image]:
+        """Świeży, przeskalowany obraz z pamięci (bez I/O, można wołać z wątku UI)"""
+        cached = self.cache.get_image(key)
+        if cached is not None and self.cache.is_fresh(cached[0]):
+            self.cache.record_memory_hit()
+            return cached[1]
+        return None
+        
+    def load(self, task: Optional[Task], url: str, max_width: int, max_height: int,
+             shrink_only: bool = False) -> Optional[Image.Image]:
+        """
+        Pobierz i przeskaluj obraz (bez Tk, bezpieczne w wątku roboczym)
+        
+        Args:
+            task: Zadanie executora (None przy wywołaniu synchronicznym)
+            url: URL obrazu
+            max_width: Szerokość ramki
+            max_height: Wysokość ramki
+            shrink_only: Nie powiększaj obrazów mniejszych niż ramka
+            
+        Returns:
+            Obraz PIL (None jeśli zadanie anulowano)
+        """
+        key = (url, max_width, max_height, shrink_only)
+        with self._key_locks[hash(key) % len(self._key_locks)]:
+            return self._load_locked(task, key)
+            
+    def _load_locked(self, task: Optional[Task], key: ImageKey) -> Optional[Image.Image]:
+        """Pobierz obraz z cache lub sieci (wywoływane pod blokadą klucza)"""
+        url, max_width, max_height, shrink_only = key
+        
+        fresh = self.get_cached(key)
+        if fresh is not None:
+            return fresh
+            
+        if task is not None and task.cancelled:
+            return None
+            
+        cached = self.cache.get_image(key)
+        start = time.perf_counter()
+        downloaded = self._download(url, task)
+        if downloaded is None:
+            return None
+        content, not_modified = downloaded
+        download_time = time.perf_counter() - start
+        
+        # Plik się nie zmienił - przeskalowany obraz z pamięci jest nadal aktualny
+        if not_modified and cached is not None:
+            self.cache.put_image(key, cached[1])
+            self._record_timing(download_time, None)
+            return cached[1]
+            
+        start = time.perf_counter()
+        img = self.decode(content, max_width, max_height, shrink_only)
+        self._record_timing(download_time, time.perf_counter() - start)
+        
+        self.cache.put_image(key, img)
+        return img
+        
+    def decode(self, content: bytes, max_width: int, max_height: int,
+               shrink_only: bool = False, quality: Optional[str] = None) -> Image.Image:
+        """
+        Zdekoduj obraz i dopasuj go do ramki z zachowaniem proporcji
+        
+        Args:
+            content: Bajty pliku obrazu
+            max_width: Szerokość ramki
+            max_height: Wysokość ramki
+            shrink_only: Nie powiększaj obrazów mniejszych niż ramka
+            quality: Jakość skalowania (domyślnie self.quality)
+            
+        Returns:
+            Obraz PIL (zdekodowany, niezależny od content)
+        """
+        quality = quality or self.quality
+        img = Image.open(BytesIO(content))
+        size = self.fit_size(img.size, max_width, max_height)
+        
+        if size[0] >= img.width or size[1] >= img.height:
+            if shrink_only or size == img.size:
+                img.load()
+                return img
+            # Miniatura mniejsza niż ramka - powiększ
+            return img.resize(size, Image.Resampling.LANCZOS)
+            
+        if quality == QUALITY_BEST:
+            return img.resize(size, Image.Resampling.LANCZOS)
+            
+        if quality == QUALITY_FAST:
+            # JPEG: najmniejsza skala dekodowania nie mniejsza niż docelowa
+            img.draft(img.mode, size)
+            return img.resize(size, Image.Resampling.BILINEAR)
+            
+        # JPEG: zapas 2x nad docelowym rozmiarem, żeby LANCZOS miał z czego wygładzać
+        img.draft(img.mode, (size[0] * 2, size[1] * 2))
+        return img.resize(size, Image.Resampling.LANCZOS)
+        
+    @staticmethod
+    def fit_size(original_size: Tuple[int, int], max_width: int, max_height: int) -> Tuple[int, int]:
+        """
+        Rozmiar wypełniający ramkę z zachowaniem proporcji
+        
+        Args:
+            original_size: Oryginalny rozmiar (width, height)
+            max_width: Szerokość ramki
+            max_height: Wysokość ramki
+            
+        Returns:
+            Nowy rozmiar (width, height)
+        """
+        width, height = original_size
+        scale = min(max_width / width, max_height / height)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+        
+    def stats(self) -> Dict[str, float]:
+        """Liczniki cache oraz łączny czas pobierania i dekodowania"""
+        stats: Dict[str, float] = dict(self.cache.stats())
+        with self.lock:
+            stats.update({
+                "decodes": self.decodes,
+                "download_seconds": round(self.download_seconds, 3),
+                "decode_seconds": round(self.decode_seconds, 3)
+            })
+        return stats
+        
+    def _record_timing(self, download_time: float, decode_time: Optional[float]) -> None:
+        with self.lock:
+            self.download_seconds += download_time
+            if decode_time is not None:
+                self.decodes += 1
+                self.decode_seconds += decode_time
+                
+    def _download(self, url: str, task: Optional[Task] = None) -> Optional[Tuple[bytes, bool]]:
+        """
+        Pobierz bajty obrazu: z dysku, jeśli są świeże, inaczej zapytaniem warunkowym
+        
+        Args:
+            url: URL obrazu
+            task: Zadanie executora - anulowanie przerywa pobieranie między fragmentami
+            
+        Returns:
+            Para (bajty obrazu, czy serwer odpowiedział 304 Not Modified) lub None po anulowaniu
+        """
+        entry = self.cache.get_entry(url)
+        content = self.cache.read_bytes(url) if entry is not None else None
+        
+        if content is not None and self.cache.is_fresh(entry.get("fetched", 0)):
+            self.cache.record_disk_hit()
+            return content, False
+            
+        headers = {}
+        if content is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+                
+        with get_shared_session().get(url, headers=headers, timeout=10, stream=True) as response:
+            if response.status_code == 304 and content is not None:
+                self.cache.touch(url, entry)
+                return content, True
+                
+            response.raise_for_status()
+            
+            chunks = []
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                if task is not None and task.cancelled:
+                    return None
+                chunks.append(chunk)
+            content = b"".join(chunks)
+            
+            self.cache.put_bytes(
+                url,
+                content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        return content, False
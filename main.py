@@ -2,8 +2,8 @@
 import tkinter as tk
 from tkinter import ttk
 from product_manager import ProductManager
-from prompt_editor import PromptEditor, PromptManager
-from ui_components import ProductInfoPanel, ControlPanel, HTMLPreviewManager, SyntaxHighlighter
+from prompt_templates import get_prompt_manager
+from ui_components import ProductInfoPanel, ControlPanel, HTMLPreviewManager
 from content_area import ContentArea
 from styles import StyleManager
 
@@ -18,7 +18,10 @@ class ProductManagerApp:
         self.style_manager = StyleManager()
         self.style_manager.setup_styles()
         
-        self.prompt_manager = PromptManager()
+        # Wspólny z generatorem opisów; pierwszy skan folderu i kolejne zmiany
+        # wczytuje watcher w tle, więc okno nie czeka na odczyt promptów
+        self.prompt_manager = get_prompt_manager()
+        self.prompt_manager.start_watching()
         self.product_manager = ProductManager(self)
         
         # Utwórz interfejs
@@ -27,6 +30,8 @@ class ProductManagerApp:
         # Skonfiguruj powiązania
         self.setup_bindings()
         
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
     def setup_window(self):
         """Skonfiguruj główne okno"""
         self.root.configure(background="#FFFFFF", padx=0, pady=0)
@@ -62,6 +67,11 @@ class ProductManagerApp:
             '<Return>', 
             lambda e: self.product_manager.load_product_data()
         )
+        # Shift+Enter pobiera dane z pominięciem cache produktów
+        self.product_info_panel.input_product_link.bind(
+            '<Shift-Return>', 
+            lambda e: self.product_manager.load_product_data(use_cache=False)
+        )
         self.product_info_panel.input_product_link.bind(
             '<FocusOut>', 
             lambda e: self.on_product_input_change()
@@ -87,14 +97,16 @@ class ProductManagerApp:
     def on_text_modified(self, field_type):
         """Obsługuj modyfikację tekstu"""
         if field_type == 'long' and self.content_area.text_ai_long.edit_modified():
-            SyntaxHighlighter.highlight_syntax(self.content_area.text_ai_long)
+            self.content_area.schedule_highlight('long')
             self.content_area.text_ai_long.edit_modified(False)
         elif field_type == 'short' and self.content_area.text_ai_short.edit_modified():
-            SyntaxHighlighter.highlight_syntax(self.content_area.text_ai_short)
+            self.content_area.schedule_highlight('short')
             self.content_area.text_ai_short.edit_modified(False)
             
     def open_prompt_editor(self):
         """Otwórz edytor promptów"""
+        # Import przy pierwszym otwarciu - edytor nie jest potrzebny do startu
+        from prompt_editor import PromptEditor
         PromptEditor(self.root, self.prompt_manager)
         
     def preview_html(self, description_type):
@@ -119,6 +131,16 @@ class ProductManagerApp:
         """Wyłącz przycisk aktualizacji"""
         self.control_panel.btn_update.config(state='disabled')
         
+    def set_task_running(self, running, status=""):
+        """Przełącz przyciski i postęp na czas zadania w tle"""
+        self.control_panel.btn_generate.config(state='disabled' if running else 'normal')
+        self.control_panel.btn_cancel.config(state='normal' if running else 'disabled')
+        if running:
+            self.disable_update_button()
+            self.control_panel.show_progress(status)
+        else:
+            self.control_panel.hide_progress()
+        
     def clear_all_fields(self):
         """Wyczyść wszystkie pola"""
         self.product_info_panel.clear_all_fields()
@@ -126,6 +148,12 @@ class ProductManagerApp:
         self.control_panel.lbl_cost.config(text="")
         self.disable_update_button()
         
+    def on_close(self):
+        """Zamknij aplikację, przerywając zadania w tle"""
+        self.product_manager.shutdown()
+        self.prompt_manager.stop_watching()
+        self.root.destroy()
+        
     def run(self):
         """Uruchom aplikację"""
         self.root.mainloop()
@@ -0,0 +1,171 @@
+# product_cache.py
+"""Cache danych produktów z getProductData: LRU w pamięci + pliki na dysku"""
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from cache_directory import CacheDirectory
+
+DEFAULT_PRODUCT_CACHE_DIR = os.path.join("cache", "products")
+DEFAULT_PRODUCT_TTL = 10 * 60
+DEFAULT_MEMORY_ENTRIES = 256
+# Limity plików na dysku (przeterminowane wpisy służą tylko do rewalidacji)
+DEFAULT_PRODUCT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_PRODUCT_MAX_AGE = 7 * 24 * 3600
+
+
+class ProductCache:
+    """
+    Cache odpowiedzi getProductData
+    
+    Wpisy młodsze niż ttl są zwracane bez zapytania do API. Starsze wpisy
+    zostają zachowane jako podstawa rewalidacji (ETag / Last-Modified), jeśli
+    serwer je podał. Pamięć trzyma max_entries ostatnio używanych produktów.
+    Pliki na dysku starsze niż max_age są usuwane (przy starcie i odczycie),
+    a po przekroczeniu max_bytes - najdawniej zapisane (CacheDirectory).
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_PRODUCT_CACHE_DIR,
+                 ttl: float = DEFAULT_PRODUCT_TTL, max_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_bytes: int = DEFAULT_PRODUCT_MAX_BYTES, max_age: float = DEFAULT_PRODUCT_MAX_AGE):
+        """
+        Args:
+            cache_dir: Folder na pliki JSON (None - tylko pamięć)
+            ttl: Czas świeżości wpisu w sekundach
+            max_entries: Liczba produktów trzymanych w pamięci
+            max_bytes: Limit rozmiaru plików na dysku
+            max_age: Wiek pliku [s], po którym wpis jest usuwany z dysku
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        
+        self.disk = CacheDirectory(cache_dir, max_bytes, max_age, label="product cache") if cache_dir else None
+            
+    def _path(self, product_id: str) -> str:
+        safe_id = re.sub(r"[^0-9A-Za-z_-]", "_", product_id)
+        return os.path.join(self.cache_dir, f"{safe_id}.json")
+        
+    def get(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Pobierz wpis produktu (świeży lub przeterminowany)
+        
+        Args:
+            product_id: ID produktu
+            
+        Returns:
+            Wpis z kluczami data, fetched, etag, last_modified lub None
+        """
+        with self.lock:
+            entry = self.memory.get(product_id)
+            if entry is not None:
+                self.memory.move_to_end(product_id)
+                return entry
+                
+        if not self.cache_dir:
+            return None
+            
+        path = self._path(product_id)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+            
+        if time.time() - entry.get("fetched", 0) > self.max_age:
+            self.disk.remove(path)
+            return None
+            
+        self._remember(product_id, entry)
+        return entry
+        
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Czy wpis jest młodszy niż ttl"""
+        return time.time() - entry.get("fetched", 0) <= self.ttl
+        
+    def get_data(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Kopia danych produktu (wywołujący może ją modyfikować)"""
+        return copy.deepcopy(entry["data"])
+        
+    def record_hit(self) -> None:
+        with self.lock:
+            self.hits += 1
+            
+    def record_miss(self) -> None:
+        with self.lock:
+            self.misses += 1
+            
+    def put(self, product_id: str, data: Dict[str, Any],
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Zapisz dane produktu
+        
+        Args:
+            product_id: ID produktu
+            data: Odpowiedź getProductData
+            etag: Nagłówek ETag odpowiedzi (jeśli był)
+            last_modified: Nagłówek Last-Modified odpowiedzi (jeśli był)
+        """
+        entry = {
+            "data": data,
+            "fetched": time.time(),
+            "etag": etag,
+            "last_modified": last_modified
+        }
+        self._remember(product_id, entry)
+        self._write(product_id, entry)
+        
+    def touch(self, product_id: str, entry: Dict[str, Any]) -> None:
+        """Odnów świeżość wpisu po odpowiedzi 304 Not Modified"""
+        entry = dict(entry, fetched=time.time())
+        with self.lock:
+            self.revalidated += 1
+        self._remember(product_id, entry)
+        self._write(product_id, entry)
+        
+    def invalidate(self, product_id: str) -> None:
+        """Usuń produkt z cache (np. po aktualizacji w sklepie)"""
+        with self.lock:
+            self.memory.pop(product_id, None)
+        if self.disk:
+            self.disk.remove(self._path(product_id))
+            
+    def clear(self) -> None:
+        """Usuń wszystkie wpisy"""
+        with self.lock:
+            self.memory.clear()
+        if self.disk:
+            self.disk.clear()
+            
+    def stats(self) -> Dict[str, int]:
+        """Liczniki trafień, chybień i rewalidacji"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "memory_entries": len(self.memory)
+            }
+            
+    def _remember(self, product_id: str, entry: Dict[str, Any]) -> None:
+        with self.lock:
+            self.memory[product_id] = entry
+            self.memory.move_to_end(product_id)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+                
+    def _write(self, product_id: str, entry: Dict[str, Any]) -> None:
+        """Zapisz wpis na dysk (atomowo, przez plik tymczasowy)"""
+        if self.disk:
+            self.disk.write(self._path(product_id), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
@@ -63,6 +63,14 @@ class ProductDataManager:
         self.original_info_options: List[OriginalOption] = []
         self.original_options: List[OriginalOption] = []
         
+    def load_from_api(self, api_data: Dict[str, Any]) -> None:
+        """Ustaw wszystkie dane produktu, producenta i parametrów z odpowiedzi API"""
+        self.set_product_data(api_data)
+        self.set_producer_data(api_data)
+        self.extract_original_parameters(api_data)
+        self.extract_color_parameter(api_data)
+        self.extract_height_parameter(api_data)
+        
     def set_product_data(self, api_data: Dict[str, Any]) -> None:
         """Ustaw dane produktu z odpowiedzi API"""
         self.product_data = ProductData(
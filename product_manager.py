@@ -1,7 +1,7 @@
 # product_manager.py - Refaktoryzowany
 from tkinter import messagebox
 import tkinter as tk
-from typing import List
+from typing import Any, Callable, Dict, List, Optional
 
 from config import (
     GSPORT_API_URL, 
@@ -10,12 +10,17 @@ from config import (
     MAX_TOKENS, 
     MODEL
 )
-from utils import extract_product_id, save_xml_copy
+from utils import extract_product_id, format_cost_display
 from api_client import GSportAPIClient, OpenAIClient
+from response_cache import ResponseCache, CACHE_USE, CACHE_REFRESH
+from product_cache import ProductCache
 from product_data_manager import ProductDataManager
-from image_manager import ImageManager
 from ai_description_generator import AIDescriptionGenerator
-from xml_builder import XMLBuilder
+from product_publisher import ProductPublisher, PublishChunk
+from task_executor import Task, TaskExecutor
+
+# Grupa zadań związanych z aktualnym produktem (unieważniana przy zmianie produktu)
+PRODUCT_TASKS = "product"
 
 class ProductManager:
     """Główny manager produktów - koordynuje wszystkie operacje"""
@@ -24,19 +29,44 @@ class ProductManager:
         self.app = app
         
         # Inicjalizuj klientów API
-        self.gsport_client = GSportAPIClient(GSPORT_API_URL, GSPORT_API_KEY)
-        self.openai_client = OpenAIClient(GPT_API_KEY, MODEL, MAX_TOKENS)
+        self.gsport_client = GSportAPIClient(
+            GSPORT_API_URL, GSPORT_API_KEY, cache=ProductCache()
+        )
+        self.openai_client = OpenAIClient(
+            GPT_API_KEY, MODEL, MAX_TOKENS, cache=ResponseCache()
+        )
+        
+        # Operacje sieciowe w tle, wyniki wracają do wątku Tk
+        self.executor = TaskExecutor(app.root)
         
         # Inicjalizuj managery
         self.data_manager = ProductDataManager()
-        self.image_manager = ImageManager()
+        self._image_manager = None
         self.ai_generator = AIDescriptionGenerator(self.openai_client)
+        self.publisher = ProductPublisher(self.gsport_client)
         
         # ID aktualnego produktu
         self.current_product_id = None
         
-    def load_product_data(self):
-        """Załaduj dane produktu na podstawie input"""
+        # Zadanie widoczne dla operatora (postęp + przycisk Stop)
+        self._current_task: Optional[Task] = None
+        self._can_update = False
+        
+    @property
+    def image_manager(self):
+        """Manager obrazów - tworzony (razem z importem Pillow) przy pierwszym obrazie produktu"""
+        if self._image_manager is None:
+            from image_manager import ImageManager
+            self._image_manager = ImageManager(self.executor)
+        return self._image_manager
+        
+    def load_product_data(self, use_cache=True):
+        """
+        Załaduj dane produktu na podstawie input
+        
+        Args:
+            use_cache: False wymusza pełne pobranie z API (pomija cache produktów)
+        """
         input_text = self.app.product_info_panel.input_product_link.get().strip()
         if not input_text:
             return
@@ -51,27 +81,37 @@ class ProductManager:
         self.current_product_id = product_id
         self.data_manager.product_data.product_id = product_id
         
-        try:
-            # Pobierz dane produktu
-            api_data = self.gsport_client.get_product_data(product_id)
-            
-            if not api_data:
-                messagebox.showinfo("Brak danych", "Nie znaleziono danych dla podanego ID.")
-                return
-                
-            # Ustaw dane w managerze
-            self.data_manager.set_product_data(api_data)
-            self.data_manager.set_producer_data(api_data)
-            self.data_manager.extract_original_parameters(api_data)
-            self.data_manager.extract_color_parameter(api_data)
-            self.data_manager.extract_height_parameter(api_data)
-            
-            # Aktualizuj UI
-            self._update_ui_with_product_data()
+        self._start_task(
+            "Pobieranie danych produktu...",
+            self._fetch_product_data, product_id, use_cache,
+            on_success=self._on_product_data_loaded,
+            on_error=lambda e: messagebox.showerror(
+                "Błąd", f"Nie udało się pobrać danych produktu: {str(e)}"
+            )
+        )
+        
+    def _fetch_product_data(self, task: Task, product_id: str,
+                            use_cache: bool) -> Optional[ProductDataManager]:
+        """Pobierz i przetwórz dane produktu (wątek roboczy)"""
+        api_data = self.gsport_client.get_product_data(product_id, use_cache=use_cache)
+        if not api_data:
+            return None
             
-        except Exception as e:
-            messagebox.showerror("Błąd", f"Nie udało się pobrać danych produktu: {str(e)}")
+        # Nowa instancja - zadania poprzedniego produktu nadal mają swoją
+        data_manager = ProductDataManager()
+        data_manager.load_from_api(api_data)
+        data_manager.product_data.product_id = product_id
+        return data_manager
+        
+    def _on_product_data_loaded(self, data_manager: Optional[ProductDataManager]):
+        """Wyświetl pobrane dane produktu (wątek UI)"""
+        if data_manager is None:
+            messagebox.showinfo("Brak danych", "Nie znaleziono danych dla podanego ID.")
+            return
             
+        self.data_manager = data_manager
+        self._update_ui_with_product_data()
+        
     def _update_ui_with_product_data(self):
         """Aktualizuj UI z danymi produktu"""
         # Aktualizuj panel informacji o produkcie
@@ -80,18 +120,19 @@ class ProductManager:
             self.data_manager.producer_data.__dict__
         )
         
-        # Załaduj i wyświetl obraz
-        success = self.image_manager.load_and_display_image(
+        # Załaduj obraz w tle i po wyświetleniu powiąż kliknięcie z podglądem
+        self.image_manager.load_and_display_image(
             self.app.product_info_panel.lbl_product_image,
-            self.data_manager.product_data.image
-        )
-        
-        # Powiąż kliknięcie obrazu z podglądem
-        if success:
-            self.image_manager.bind_preview_click(
+            self.data_manager.product_data.image,
+            on_loaded=lambda: self.image_manager.bind_preview_click(
                 self.app.product_info_panel.lbl_product_image,
                 self.app.root
-            )
+            ),
+            group=PRODUCT_TASKS
+        )
+        
+        # Podgląd otwiera prawie każdy operator - pobierz duży obraz od razu
+        self.image_manager.prefetch_preview(group=PRODUCT_TASKS)
         
         # Ustaw kolor jeśli został wyodrębniony
         if self.data_manager.parameters.color_remote_id:
@@ -146,40 +187,127 @@ class ProductManager:
             messagebox.showwarning("Błąd", "Nie można odczytać zawartości schowka")
             
     def generate_description(self):
-        """Generuj opis produktu przy użyciu AI"""
+        """Generuj opis produktu przy użyciu AI (strumieniowo, bez blokowania UI)"""
         if not self.data_manager.product_data.name:
             messagebox.showwarning("Błąd", "Najpierw załaduj dane produktu")
             return
             
+        if self._current_task is not None:
+            return
+            
         # Sprawdź czy to rower na podstawie checkboxa
         is_bike = self.app.control_panel.is_bike_var.get()
         
-        try:
-            # Generuj opisy
-            result = self.ai_generator.generate_descriptions(self.data_manager, is_bike)
+        # Bez cache wymuś nowe odpowiedzi (zapisywane do cache)
+        use_cache = self.app.control_panel.use_cache_var.get()
+        self.openai_client.cache_mode = CACHE_USE if use_cache else CACHE_REFRESH
+        
+        self.app.content_area.set_text_content('long', "")
+        self.app.content_area.set_text_content('short', "")
+        self.app.update_cost_display("Generowanie...")
+        self._can_update = False
+        
+        self._start_task(
+            "Generowanie opisu...",
+            self._generate, self.data_manager, is_bike,
+            on_success=self._finish_generation,
+            on_error=lambda e: self._finish_generation({
+                'success': False,
+                'error': f"Wystąpił błąd podczas generowania opisu: {str(e)}",
+                'cost': 0
+            }),
+            # Jedno wstawienie na cykl zamiast jednego na token
+            on_progress=lambda deltas: self.app.content_area.append_text_content('long', ''.join(deltas))
+        )
+        
+    def _generate(self, task: Task, data_manager: ProductDataManager, is_bike: bool) -> Dict[str, Any]:
+        """Generuj opisy strumieniowo (wątek roboczy)"""
+        return self.ai_generator.generate_descriptions(
+            data_manager,
+            is_bike,
+            on_delta=task.report_progress,
+            cancel_event=task.cancel_event
+        )
+        
+    def cancel_current_task(self):
+        """Przerwij zadanie widoczne dla operatora (generowanie, zapis)"""
+        if self._current_task is not None:
+            self._current_task.cancel()
+            self.app.control_panel.show_progress("Przerywanie...")
             
-            if result['success']:
-                # Wyświetl długi opis
-                self.app.content_area.set_text_content('long', result['long_description'])
-                
-                # Wyświetl krótki opis jeśli został wygenerowany
-                if result.get('short_description'):
-                    self.app.content_area.set_text_content('short', result['short_description'])
-                
-                # Aktualizuj wyświetlanie kosztów
-                cost = result['cost'] * 100
-                self.app.update_cost_display(f"Koszt: {cost:.5f}¢ USD")
-                
-                # Włącz przycisk aktualizacji
-                self.app.enable_update_button()
-                
-                print(f"Użyto pliku z promptem: {result.get('prompt_file', 'unknown')}")
+    def _start_task(self, status: str, fn: Callable[..., Any], *args,
+                    on_success: Callable[[Any], None],
+                    on_error: Callable[[Exception], None],
+                    on_progress: Optional[Callable[[List[Any]], None]] = None,
+                    group: Optional[str] = PRODUCT_TASKS) -> Task:
+        """
+        Uruchom zadanie w tle z postępem i przyciskiem Stop w panelu kontrolnym
+        
+        Args:
+            status: Tekst postępu wyświetlany w trakcie
+            fn: Funkcja zadania fn(task, *args)
+            on_success: Obsługa wyniku (wątek UI)
+            on_error: Obsługa wyjątku (wątek UI)
+            on_progress: Obsługa postępu (wątek UI)
+            group: Grupa zadania (PRODUCT_TASKS - odrzucane przy zmianie produktu)
+        """
+        def finished(callback):
+            def handler(payload):
+                self._end_task(task)
+                callback(payload)
+            return handler
+            
+        task = self.executor.submit(
+            fn, *args,
+            group=group,
+            on_success=finished(on_success),
+            on_error=finished(on_error),
+            on_progress=on_progress
+        )
+        self._current_task = task
+        self.app.set_task_running(True, status)
+        return task
+        
+    def _end_task(self, task: Task):
+        """Przywróć przyciski po zakończeniu zadania operatora"""
+        if task is not self._current_task:
+            return
+        self._current_task = None
+        self.app.set_task_running(False)
+        if self._can_update:
+            self.app.enable_update_button()
+            
+    def _finish_generation(self, result):
+        """Wyświetl wynik generowania po zakończeniu strumienia"""
+        if result['success']:
+            # Wyświetl długi opis (z sekcją producenta)
+            self.app.content_area.set_text_content('long', result['long_description'])
+            
+            # Wyświetl krótki opis jeśli został wygenerowany
+            if result.get('short_description'):
+                self.app.content_area.set_text_content('short', result['short_description'])
+            elif result.get('short_error'):
+                print(f"Nie udało się wygenerować krótkiego opisu: {result['short_error']}")
                 
-            else:
-                messagebox.showerror("Błąd", result['error'])
+            # Aktualizuj wyświetlanie kosztów
+            self.app.update_cost_display(
+                format_cost_display(result['cost'], result.get('saved_cost', 0))
+            )
+            
+            # Włącz przycisk aktualizacji
+            self._can_update = True
+            self.app.enable_update_button()
+            
+            print(f"Użyto pliku z promptem: {result.get('prompt_file', 'unknown')}")
+            if result.get('first_token_time') is not None:
+                print(f"Pierwszy token po {result['first_token_time']:.2f}s")
                 
-        except Exception as e:
-            messagebox.showerror("Błąd", f"Wystąpił błąd podczas generowania opisu: {str(e)}")
+        elif result.get('cancelled'):
+            self.app.update_cost_display(f"{format_cost_display(result['cost'])} (przerwano)")
+            
+        else:
+            self.app.update_cost_display("")
+            messagebox.showerror("Błąd", result['error'])
             
     def update_products(self):
         """Aktualizuj produkty w systemie"""
@@ -195,31 +323,68 @@ class ProductManager:
             messagebox.showwarning("Błąd", "Brak opisu do zapisania")
             return
             
+        if self._current_task is not None:
+            return
+            
         # Aktualizuj dane w managerze
         self.data_manager.set_generated_description('long', long_desc)
         self.data_manager.set_generated_description('short', short_desc)
         
-        try:
-            # Aktualizuj główny produkt
-            success = self._update_single_product(self.current_product_id)
-            
+        # Główny produkt i podobne produkty (te same opisy) w jednym zapytaniu
+        product_ids = [self.current_product_id] + self._get_similar_product_ids()
+        
+        # XML budowany w wątku UI - zmiana produktu w trakcie zapisu nie zmieni wysyłanych danych
+        chunks = self.publisher.build_chunks(
+            (product_id, self.data_manager) for product_id in product_ids
+        )
+        data_manager = self.data_manager
+        
+        self.app.disable_update_button()
+        self._start_task(
+            "Zapisywanie w sklepie...",
+            self._publish_products, chunks,
+            on_success=lambda result: self._finish_update(data_manager, product_ids, *result),
+            on_error=lambda e: messagebox.showerror(
+                "Błąd", f"Wystąpił błąd podczas aktualizacji: {str(e)}"
+            ),
+            on_progress=lambda progress: self.app.control_panel.show_progress(
+                f"Zapisywanie {progress[-1][0]}/{progress[-1][1]}...",
+                progress[-1][0] / progress[-1][1]
+            ),
+            # Zapis dotyczy już zbudowanych XML, więc nie jest unieważniany zmianą produktu
+            group=None
+        )
+        
+    def _publish_products(self, task: Task, chunks: List[PublishChunk]) -> tuple:
+        """Wyślij paczki XML do sklepu (wątek roboczy)"""
+        results = self.publisher.send_chunks(
+            chunks,
+            cancel_event=task.cancel_event,
+            on_chunk=lambda index, total, _: task.report_progress((index, total))
+        )
+        return results, task.cancelled
+        
+    def _finish_update(self, data_manager: ProductDataManager, product_ids: List[str],
+                       results: Dict[str, bool], cancelled: bool):
+        """Pokaż wynik zapisu (wątek UI)"""
+        for product_id, success in results.items():
             if success:
-                self.data_manager.add_processed_id(self.current_product_id)
+                data_manager.add_processed_id(product_id)
                 
-            # Aktualizuj podobne produkty jeśli istnieją
-            similar_ids = self._get_similar_product_ids()
-            for similar_id in similar_ids:
-                if self._update_single_product(similar_id):
-                    self.data_manager.add_processed_id(similar_id)
-                    
-            messagebox.showinfo(
-                "Sukces", 
-                f"Zaktualizowano produkty: {', '.join(self.data_manager.processed_ids)}"
-            )
-            
-        except Exception as e:
-            messagebox.showerror("Błąd", f"Wystąpił błąd podczas aktualizacji: {str(e)}")
+        failed_ids = [product_id for product_id in product_ids if results.get(product_id) is False]
+        skipped_ids = [product_id for product_id in product_ids if product_id not in results]
+        
+        message = f"Zaktualizowano produkty: {', '.join(data_manager.processed_ids)}"
+        if failed_ids:
+            message += f"\n\nNie udało się zaktualizować: {', '.join(failed_ids)}"
+        if cancelled and skipped_ids:
+            message += f"\n\nZapis przerwano, nie wysłano: {', '.join(skipped_ids)}"
             
+        if failed_ids:
+            messagebox.showwarning("Błąd", message)
+        else:
+            messagebox.showinfo("Sukces", message)
+        
     def _get_similar_product_ids(self) -> List[str]:
         """Pobierz ID podobnych produktów z UI"""
         similar_ids = []
@@ -234,20 +399,6 @@ class ProductManager:
                         
         return similar_ids
         
-    def _update_single_product(self, product_id: str) -> bool:
-        """Aktualizuj pojedynczy produkt"""
-        # Zbuduj XML
-        xml_content = XMLBuilder.build_product_xml(product_id, self.data_manager)
-        
-        # Wyślij aktualizację
-        success = self.gsport_client.update_product(xml_content)
-        
-        # Zapisz kopię XML
-        status = "ok" if success else "errors"
-        save_xml_copy(xml_content, product_id, f"output/{status}")
-        
-        return success
-        
     def set_product_color(self, color_key, remote_id):
         """Ustaw wybrany kolor produktu"""
         self.data_manager.set_product_color(color_key, remote_id)
@@ -255,11 +406,22 @@ class ProductManager:
         
     def clear_all_fields(self):
         """Wyczyść wszystkie pola i zresetuj stan"""
+        # Przerwij zadania poprzedniego produktu i odrzuć ich wyniki
+        self.executor.invalidate(PRODUCT_TASKS)
+        if self._current_task is not None and self._current_task.group == PRODUCT_TASKS:
+            self._current_task = None
+            self.app.set_task_running(False)
+        self._can_update = False
+        
         # Zresetuj ID
         self.current_product_id = None
         
-        # Wyczyść dane
-        self.data_manager.clear_all_data()
+        # Nowe dane (stara instancja zostaje przy anulowanych zadaniach w tle)
+        self.data_manager = ProductDataManager()
         
         # Wyczyść UI przez główną aplikację
-        self.app.clear_all_fields()
\ No newline at end of file
+        self.app.clear_all_fields()
+        
+    def shutdown(self):
+        """Przerwij zadania w tle przy zamykaniu aplikacji"""
+        self.executor.shutdown()
\ No newline at end of file
@@ -0,0 +1,173 @@
+# product_publisher.py
+"""Publikacja wielu produktów w paczkach - jedno wywołanie addUpdateProducts na paczkę"""
+import os
+import threading
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from api_client import GSportAPIClient
+from product_data_manager import ProductDataManager
+from xml_builder import XMLBuilder
+from utils import save_xml_copy, write_xml_file, xml_copy_path
+
+# Liczba produktów w jednym XML (rozmiar zapytania rośnie z długością opisów)
+DEFAULT_PUBLISH_BATCH_SIZE = 50
+
+PublishChunk = Tuple[List[str], str]
+
+
+class ProductPublisher:
+    """Buduje XML z wieloma produktami i wysyła je paczkami"""
+    
+    def __init__(self, gsport_client: GSportAPIClient,
+                 batch_size: int = DEFAULT_PUBLISH_BATCH_SIZE, output_dir: str = "output"):
+        """
+        Args:
+            gsport_client: Klient API sklepu
+            batch_size: Maksymalna liczba produktów w jednym zapytaniu
+            output_dir: Folder na kopie wysłanych XML (podfoldery ok / errors, sending w trakcie wysyłki)
+        """
+        self.gsport_client = gsport_client
+        self.batch_size = max(1, batch_size)
+        self.output_dir = output_dir
+        
+    def build_chunks(self, items: Iterable[Tuple[str, ProductDataManager]]) -> List[PublishChunk]:
+        """
+        Podziel produkty na paczki i zbuduj XML każdej z nich
+        
+        Args:
+            items: Pary (ID produktu, manager danych produktu)
+            
+        Returns:
+            Lista par (ID produktów w paczce, XML paczki)
+        """
+        return [
+            ([product_id for product_id, _ in batch], XMLBuilder.build_products_xml(batch))
+            for batch in self._batches(items)
+        ]
+        
+    def send_chunk(self, product_ids: List[str], xml_content: str) -> Dict[str, bool]:
+        """
+        Wyślij jedną paczkę i zapisz kopię XML
+        
+        Args:
+            product_ids: ID produktów w paczce
+            xml_content: XML paczki
+            
+        Returns:
+            Słownik ID produktu -> czy aktualizacja się powiodła
+        """
+        results = self.gsport_client.update_products(xml_content, product_ids)
+        
+        status = "ok" if all(results.values()) else "errors"
+        try:
+            save_xml_copy(xml_content, self._chunk_name(product_ids), os.path.join(self.output_dir, status))
+        except OSError as e:
+            # Paczka już wysłana - brak kopii nie może zgubić wyników
+            print(f"Warning: Could not save XML copy: {e}")
+            
+        return results
+        
+    def send_items(self, items: List[Tuple[str, ProductDataManager]]) -> Dict[str, bool]:
+        """
+        Wyślij jedną paczkę strumieniowo: XML trafia prosto do pliku i jest wysyłany z dysku
+        
+        Dokument nie jest nigdy składany w pamięci - pamięć nie rośnie
+        z liczbą produktów ani długością opisów. Plik zostaje jako kopia
+        w ok / errors. Błąd zapisu lub odczytu pliku (OSError) oznacza całą
+        paczkę jako nieudaną, a niepełny plik trafia do errors.
+        
+        Args:
+            items: Pary (ID produktu, manager danych produktu) w paczce
+            
+        Returns:
+            Słownik ID produktu -> czy aktualizacja się powiodła
+        """
+        product_ids = [product_id for product_id, _ in items]
+        xml_path = None
+        try:
+            xml_path = xml_copy_path(self._chunk_name(product_ids), os.path.join(self.output_dir, "sending"))
+            write_xml_file(XMLBuilder.iter_products_xml(items), xml_path)
+            print(f"XML saved as: {xml_path}")
+            results = self.gsport_client.update_products_file(xml_path, product_ids)
+        except OSError as e:
+            print(f"Error sending chunk {self._chunk_name(product_ids)}: {e}")
+            results = {product_id: False for product_id in product_ids}
+            if xml_path is None or not os.path.exists(xml_path):
+                return results
+                
+        status = "ok" if all(results.values()) else "errors"
+        status_dir = os.path.join(self.output_dir, status)
+        try:
+            os.makedirs(status_dir, exist_ok=True)
+            os.replace(xml_path, os.path.join(status_dir, os.path.basename(xml_path)))
+        except OSError as e:
+            print(f"Warning: Could not move XML copy to {status_dir}: {e}")
+            
+        return results
+        
+    def publish(self, items: Iterable[Tuple[str, ProductDataManager]],
+                cancel_event: Optional[threading.Event] = None,
+                on_chunk: Optional[Callable[[int, int, Dict[str, bool]], None]] = None) -> Dict[str, bool]:
+        """
+        Wyślij wszystkie produkty paczkami, każdą strumieniowo (send_items)
+        
+        Args:
+            items: Pary (ID produktu, manager danych produktu)
+            cancel_event: Przerywa wysyłanie przed kolejną paczką
+            on_chunk: Wywoływane po każdej paczce (numer, liczba paczek, wyniki paczki)
+            
+        Returns:
+            Słownik ID produktu -> czy aktualizacja się powiodła (tylko wysłane)
+        """
+        batches = list(self._batches(items))
+        results = {}
+        for index, batch in enumerate(batches, 1):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            chunk_results = self.send_items(batch)
+            results.update(chunk_results)
+            if on_chunk:
+                on_chunk(index, len(batches), chunk_results)
+        return results
+        
+    def send_chunks(self, chunks: List[PublishChunk],
+                    cancel_event: Optional[threading.Event] = None,
+                    on_chunk: Optional[Callable[[int, int, Dict[str, bool]], None]] = None) -> Dict[str, bool]:
+        """
+        Wyślij gotowe paczki po kolei
+        
+        Args:
+            chunks: Paczki z build_chunks
+            cancel_event: Przerywa wysyłanie przed kolejną paczką
+            on_chunk: Wywoływane po każdej paczce (numer, liczba paczek, wyniki paczki)
+            
+        Returns:
+            Słownik ID produktu -> czy aktualizacja się powiodła (tylko wysłane)
+        """
+        results = {}
+        for index, (product_ids, xml_content) in enumerate(chunks, 1):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            chunk_results = self.send_chunk(product_ids, xml_content)
+            results.update(chunk_results)
+            if on_chunk:
+                on_chunk(index, len(chunks), chunk_results)
+        return results
+        
+    def _batches(self, items: Iterable[Tuple[str, ProductDataManager]]
+                 ) -> Iterator[List[Tuple[str, ProductDataManager]]]:
+        """Podziel produkty na paczki po batch_size"""
+        items = iter(items)
+        while True:
+            batch = list(islice(items, self.batch_size))
+            if not batch:
+                return
+            yield batch
+            
+    @staticmethod
+    def _chunk_name(product_ids: List[str]) -> str:
+        """Nazwa kopii XML: ID produktu lub zakres ID paczki"""
+        if len(product_ids) == 1:
+            return product_ids[0]
+        return f"{product_ids[0]}-{product_ids[-1]}_x{len(product_ids)}"
@@ -1,9 +1,35 @@
 # prompt_editor.py
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import os
+from tkinter import font as tkfont
 import json
-from datetime import datetime
+from html_highlighter import IncrementalHighlighter
+
+PROMPT_TAGS = ("header", "variable", "string", "comment")
+PROMPT_HEADER_PATTERN = re.compile(r'^(?=### ).*(?<= ###)$', re.MULTILINE)
+PROMPT_VARIABLE_PATTERN = re.compile(r'\{\{?\w+\}?\}')
+# Strings end at the line break, so every rule is line-local
+PROMPT_STRING_PATTERN = re.compile(r'"[^"\n]*"')
+# Highlighting time per keystroke; larger changes continue in idle passes
+PROMPT_HIGHLIGHT_BUDGET_MS = 8
+GUTTER_FONT = ("Consolas", 11)
+
+
+def tokenize_prompt(content):
+    """Split prompt text into highlighted fragments: (tag, start, end) offsets"""
+    # Headers (### TEXT ###)
+    for match in PROMPT_HEADER_PATTERN.finditer(content):
+        yield "header", match.start(), match.end()
+        
+    # Variables ({{variable}} and {variable})
+    for match in PROMPT_VARIABLE_PATTERN.finditer(content):
+        yield "variable", match.start(), match.end()
+        
+    # Strings in quotes
+    for match in PROMPT_STRING_PATTERN.finditer(content):
+        yield "string", match.start(), match.end()
+
 
 class PromptEditor:
     """A window for editing prompt templates"""
@@ -178,40 +204,37 @@ class PromptEditor:
         text_frame = tk.Frame(raw_frame)
         text_frame.pack(fill="both", expand=True)
         
-        # Line numbers
-        self.line_numbers = tk.Text(
+        # Line numbers (only the visible lines are drawn)
+        self.gutter_width = tkfont.Font(root=self.window, font=GUTTER_FONT).measure("0000") + 10
+        self.line_numbers = tk.Canvas(
             text_frame,
-            width=4,
-            padx=3,
+            width=self.gutter_width,
             takefocus=0,
-            border=0,
-            state='disabled',
-            wrap='none',
-            bg="#F0F0F0",
-            fg="#666666"
+            highlightthickness=0,
+            bg="#F0F0F0"
         )
         self.line_numbers.pack(side="left", fill="y")
+        self._gutter_state = None
         
         # Main text editor
-        editor_scroll = tk.Scrollbar(text_frame)
-        editor_scroll.pack(side="right", fill="y")
+        self.editor_scroll = tk.Scrollbar(text_frame)
+        self.editor_scroll.pack(side="right", fill="y")
         
         self.text_editor = tk.Text(
             text_frame,
             wrap="none",
             undo=True,
-            yscrollcommand=editor_scroll.set,
+            yscrollcommand=self.on_editor_scroll,
             font=("Consolas", 11),
             padx=10,
             pady=10
         )
         self.text_editor.pack(side="left", fill="both", expand=True)
-        editor_scroll.config(command=self.sync_scroll)
+        self.editor_scroll.config(command=self.sync_scroll)
         
         # Bind events
         self.text_editor.bind('<<Modified>>', self.on_text_modified)
-        self.text_editor.bind('<KeyRelease>', self.update_line_numbers)
-        self.text_editor.bind('<MouseWheel>', self.sync_scroll)
+        self.text_editor.bind('<Configure>', self.update_line_numbers)
         
         # Configure syntax highlighting tags
         self.setup_syntax_highlighting()
@@ -241,6 +264,15 @@ class PromptEditor:
         # Comments
         self.text_editor.tag_configure("comment", foreground="#666666", font=("Consolas", 11, "italic"))
         
+        # Only lines changed since the last pass are re-tokenized, within a time budget
+        self.highlighter = IncrementalHighlighter(
+            self.text_editor,
+            tokenize=tokenize_prompt,
+            tags=PROMPT_TAGS,
+            line_local=True,
+            budget_ms=PROMPT_HIGHLIGHT_BUDGET_MS
+        )
+        
     def create_structured_editor(self, parent):
         """Create structured editor for prompt sections"""
         # Scrollable frame
@@ -388,36 +420,31 @@ class PromptEditor:
         """Load list of prompt files"""
         self.prompt_listbox.delete(0, tk.END)
         
-        # Create prompts folder if it doesn't exist
-        if not os.path.exists('prompts'):
-            os.makedirs('prompts')
-            # Move existing prompt files to the new folder
-            for f in os.listdir('.'):
-                if f.startswith('prompt_') and f.endswith('.txt'):
-                    os.rename(f, os.path.join('prompts', f))
-        
-        # Get all .txt files starting with "prompt_" from prompts folder
-        prompt_files = []
-        prompts_dir = 'prompts'
-        if os.path.exists(prompts_dir):
-            prompt_files = [f for f in os.listdir(prompts_dir) 
-                          if f.startswith('prompt_') and f.endswith('.txt')]
-        prompt_files.sort()
+        # Prompt files from the shared PromptManager (in memory, no folder scan)
+        prompt_files = self.prompt_manager.get_prompt_list()
         
         for file in prompt_files:
             # Extract readable name
             name = file.replace('prompt_', '').replace('.txt', '').replace('_', ' ').title()
             self.prompt_listbox.insert(tk.END, name)
             
-        # Store file mapping with full path
-        self.file_mapping = {i: os.path.join('prompts', prompt_files[i]) 
-                           for i in range(len(prompt_files))}
+        # Store file mapping (prompt file names)
+        self.file_mapping = {i: prompt_files[i] for i in range(len(prompt_files))}
         
         # Select first item if available
         if prompt_files:
             self.prompt_listbox.selection_set(0)
             self.load_prompt_file(self.file_mapping[0])
             
+    def select_prompt(self, filename):
+        """Select and load prompt by file name"""
+        for i, mapped_file in self.file_mapping.items():
+            if mapped_file == filename:
+                self.prompt_listbox.selection_clear(0, tk.END)
+                self.prompt_listbox.selection_set(i)
+                self.load_prompt_file(filename)
+                break
+                
     def on_prompt_select(self, event):
         """Handle prompt selection"""
         selection = self.prompt_listbox.curselection()
@@ -439,11 +466,12 @@ class PromptEditor:
     def load_prompt_file(self, filename):
         """Load a prompt file into the editor"""
         self.current_file = filename
-        self.file_label.config(text=f"Edycja: {filename}")
+        self.file_label.config(text=f"Edycja: {self.prompt_manager.get_path(filename)}")
         
         try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                content = file.read()
+            content = self.prompt_manager.get_prompt_content(filename)
+            if content is None:
+                raise FileNotFoundError(self.prompt_manager.get_path(filename))
                 
             # Load into raw editor
             self.text_editor.delete(1.0, tk.END)
@@ -496,52 +524,51 @@ class PromptEditor:
             editor.edit_modified(False)
             
     def apply_syntax_highlighting(self):
-        """Apply syntax highlighting to the text"""
-        # Remove all tags
-        for tag in ["header", "variable", "string", "comment"]:
-            self.text_editor.tag_remove(tag, 1.0, tk.END)
-            
-        content = self.text_editor.get(1.0, tk.END)
+        """Apply syntax highlighting to the whole text immediately"""
+        self.highlighter.highlight()
         
-        # Highlight headers (### TEXT ###)
-        for i, line in enumerate(content.split('\n'), 1):
-            if line.startswith('### ') and line.endswith(' ###'):
-                self.text_editor.tag_add("header", f"{i}.0", f"{i}.end")
-                
-        # Highlight variables ({{variable}} and {variable})
-        import re
-        for match in re.finditer(r'\{\{?\w+\}?\}', content):
-            start = self.text_editor.index(f"1.0+{match.start()}c")
-            end = self.text_editor.index(f"1.0+{match.end()}c")
-            self.text_editor.tag_add("variable", start, end)
-            
-        # Highlight strings in quotes
-        for match in re.finditer(r'"[^"]*"', content):
-            start = self.text_editor.index(f"1.0+{match.start()}c")
-            end = self.text_editor.index(f"1.0+{match.end()}c")
-            self.text_editor.tag_add("string", start, end)
-            
     def update_line_numbers(self, event=None):
-        """Update line numbers"""
-        lines = self.text_editor.get(1.0, tk.END).count('\n')
-        line_numbers_text = '\n'.join(str(i) for i in range(1, lines + 1))
-        
-        self.line_numbers.config(state='normal')
-        self.line_numbers.delete(1.0, tk.END)
-        self.line_numbers.insert(1.0, line_numbers_text)
-        self.line_numbers.config(state='disabled')
+        """Draw the numbers of the visible lines (only when the view or line count changed)"""
+        first_line = int(self.text_editor.index("@0,0").split(".")[0])
+        line_count = int(self.text_editor.index("end-1c").split(".")[0])
+        # y of the first line changes when the view scrolls by part of a line (scrollbar drag)
+        first_info = self.text_editor.dlineinfo(f"{first_line}.0")
+        first_y = first_info[1] if first_info else None
+        state = (first_line, first_y, line_count, self.text_editor.winfo_height())
+        if state == self._gutter_state:
+            return
+        self._gutter_state = state
+        
+        self.line_numbers.delete("all")
+        for line in range(first_line, line_count + 1):
+            info = self.text_editor.dlineinfo(f"{line}.0")
+            if info is None:
+                break
+            self.line_numbers.create_text(
+                self.gutter_width - 5, info[1],
+                anchor="ne",
+                text=str(line),
+                font=GUTTER_FONT,
+                fill="#666666"
+            )
+            
+    def on_editor_scroll(self, first, last):
+        """Update the scrollbar and the line numbers when the editor view moves"""
+        self.editor_scroll.set(first, last)
+        self.update_line_numbers()
         
     def sync_scroll(self, *args):
-        """Synchronize scrolling between text editor and line numbers"""
+        """Scroll the text editor from the scrollbar (line numbers follow the view)"""
         self.text_editor.yview(*args)
-        self.line_numbers.yview(*args)
         
     def on_text_modified(self, event=None):
         """Handle text modification"""
         if self.text_editor.edit_modified():
-            self.modified = True
-            self.update_save_indicator()
-            self.apply_syntax_highlighting()
+            if not self.modified:
+                self.modified = True
+                self.update_save_indicator()
+            self.highlighter.schedule()
+            self.update_line_numbers()
             self.text_editor.edit_modified(False)
             
     def on_structured_modified(self):
@@ -570,28 +597,15 @@ class PromptEditor:
                 # Structured editor - rebuild content
                 content = self.build_structured_content()
                 
-            # Create backup
-            backup_dir = os.path.join("prompts", "backups")
-            os.makedirs(backup_dir, exist_ok=True)
-            backup_file = os.path.join(
-                backup_dir,
-                f"{os.path.basename(self.current_file)}.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
-            )
-            
-            # Copy current file to backup
-            if os.path.exists(self.current_file):
-                with open(self.current_file, 'r', encoding='utf-8') as f:
-                    backup_content = f.read()
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    f.write(backup_content)
-                    
-            # Save new content
-            with open(self.current_file, 'w', encoding='utf-8') as file:
-                file.write(content)
+            # Save new content (backup in prompts/backups, generator sees it immediately)
+            backup_file = self.prompt_manager.save_prompt(self.current_file, content)
                 
             self.modified = False
             self.update_save_indicator()
-            messagebox.showinfo("Zapisano", f"Plik {self.current_file} został zapisany.\nBackup: {backup_file}")
+            messagebox.showinfo(
+                "Zapisano",
+                f"Plik {self.prompt_manager.get_path(self.current_file)} został zapisany.\nBackup: {backup_file}"
+            )
             
         except Exception as e:
             messagebox.showerror("Błąd", f"Nie można zapisać pliku: {str(e)}")
@@ -681,10 +695,7 @@ class PromptEditor:
             if not filename.endswith('.txt'):
                 filename += '.txt'
                 
-            # Create in prompts folder
-            full_path = os.path.join('prompts', filename)
-                
-            if os.path.exists(full_path):
+            if self.prompt_manager.exists(filename):
                 messagebox.showerror("Błąd", "Plik już istnieje")
                 return
                 
@@ -711,19 +722,17 @@ Formatowanie tekstu: W opisie możesz dodawać następujące tagi HTML: h2, h3,
 2. Specyfikacja: "Opis struktury specyfikacji"
 """
             
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(template)
+            try:
+                self.prompt_manager.create_prompt(filename, template)
+            except OSError as e:
+                messagebox.showerror("Błąd", f"Nie można utworzyć pliku: {str(e)}")
+                return
                 
             dialog.destroy()
             self.load_prompt_list()
             
             # Select new file
-            for i, mapped_file in self.file_mapping.items():
-                if mapped_file == full_path:
-                    self.prompt_listbox.selection_clear(0, tk.END)
-                    self.prompt_listbox.selection_set(i)
-                    self.load_prompt_file(full_path)
-                    break
+            self.select_prompt(filename)
                     
         ttk.Button(dialog, text="Utwórz", command=create_file).pack(pady=10)
         
@@ -737,22 +746,14 @@ Formatowanie tekstu: W opisie możesz dodawać następujące tagi HTML: h2, h3,
         index = selection[0]
         original_file = self.file_mapping[index]
         
-        # Generate new filename
-        base_name = os.path.basename(original_file).replace('.txt', '')
-        counter = 1
-        while os.path.exists(os.path.join('prompts', f"{base_name}_copy{counter}.txt")):
-            counter += 1
-            
-        new_file = os.path.join('prompts', f"{base_name}_copy{counter}.txt")
-        
-        # Copy file
-        with open(original_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        with open(new_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        try:
+            new_file = self.prompt_manager.duplicate_prompt(original_file)
+        except OSError as e:
+            messagebox.showerror("Błąd", f"Nie można skopiować pliku: {str(e)}")
+            return
             
         self.load_prompt_list()
-        messagebox.showinfo("Sukces", f"Utworzono kopię: {new_file}")
+        messagebox.showinfo("Sukces", f"Utworzono kopię: {self.prompt_manager.get_path(new_file)}")
         
     def delete_prompt(self):
         """Delete selected prompt"""
@@ -766,19 +767,13 @@ Formatowanie tekstu: W opisie możesz dodawać następujące tagi HTML: h2, h3,
         
         response = messagebox.askyesno(
             "Potwierdź usunięcie",
-            f"Czy na pewno chcesz usunąć plik {filename}?\nOperacja jest nieodwracalna!"
+            f"Czy na pewno chcesz usunąć plik {self.prompt_manager.get_path(filename)}?\nOperacja jest nieodwracalna!"
         )
         
         if response:
             try:
                 # Move to trash instead of deleting
-                trash_dir = os.path.join("prompts", "trash")
-                os.makedirs(trash_dir, exist_ok=True)
-                
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                trash_file = os.path.join(trash_dir, f"{os.path.basename(filename)}.{timestamp}")
-                
-                os.rename(filename, trash_file)
+                self.prompt_manager.delete_prompt(filename)
                 
                 self.load_prompt_list()
                 messagebox.showinfo("Usunięto", f"Plik został przeniesiony do kosza")
@@ -799,63 +794,3 @@ Formatowanie tekstu: W opisie możesz dodawać następujące tagi HTML: h2, h3,
                 self.save_prompt()
                 
         self.window.destroy()
-
-
-class PromptManager:
-    """Manages prompt files and templates"""
-    
-    def __init__(self):
-        self.prompt_files = {}
-        self.load_prompts()
-        
-    def load_prompts(self):
-        """Load all prompt files"""
-        # Create prompts folder if it doesn't exist
-        if not os.path.exists('prompts'):
-            os.makedirs('prompts')
-            
-        # Check prompts folder
-        prompts_dir = 'prompts'
-        prompt_files = []
-        
-        if os.path.exists(prompts_dir):
-            prompt_files = [os.path.join(prompts_dir, f) for f in os.listdir(prompts_dir) 
-                          if f.startswith('prompt_') and f.endswith('.txt')]
-        
-        for file_path in prompt_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                self.prompt_files[file_path] = content
-            except Exception as e:
-                print(f"Error loading {file_path}: {e}")
-                
-    def get_prompt_list(self):
-        """Get list of available prompts"""
-        return list(self.prompt_files.keys())
-        
-    def get_prompt_content(self, filename):
-        """Get content of a specific prompt"""
-        return self.prompt_files.get(filename, "")
-        
-    def save_prompt(self, filename, content):
-        """Save prompt content"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
-        self.prompt_files[filename] = content
-        
-    def create_backup(self, filename):
-        """Create backup of prompt file"""
-        if os.path.exists(filename):
-            backup_dir = "prompt_backups"
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_file = os.path.join(backup_dir, f"{filename}.{timestamp}.bak")
-            
-            with open(filename, 'r', encoding='utf-8') as source:
-                with open(backup_file, 'w', encoding='utf-8') as backup:
-                    backup.write(source.read())
-                    
-            return backup_file
-        return None
\ No newline at end of file
@@ -0,0 +1,387 @@
+# prompt_templates.py
+"""Prompty aplikacji: wspólny, obserwowany cache plików i szablony kompilowane raz"""
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+PROMPTS_DIR = "prompts"
+
+# Odstęp między sprawdzeniami plików promptów przez watcher [s]
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Zmienne podstawiane w promptach
+TEMPLATE_VARIABLES = ("prod_name", "prod_desclongription", "product_specification")
+
+_SLOT_PATTERN = re.compile(r"\{(" + "|".join(TEMPLATE_VARIABLES) + r")\}")
+
+
+class CompiledTemplate:
+    """
+    Szablon podzielony na stałe fragmenty i miejsca na zmienne
+    
+    Podstawione wartości nie są ponownie przeszukiwane, więc np. nazwa
+    produktu zawierająca "{product_specification}" zostaje bez zmian.
+    """
+    
+    def __init__(self, text: str):
+        # re.split z grupą daje naprzemiennie: tekst, nazwa zmiennej, tekst, ...
+        parts = _SLOT_PATTERN.split(text)
+        self.parts: List[str] = parts
+        self.slots: Tuple[Tuple[int, str], ...] = tuple(
+            (index, parts[index]) for index in range(1, len(parts), 2)
+        )
+        self.variables = frozenset(name for _, name in self.slots)
+        
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Wstaw wartości zmiennych
+        
+        Args:
+            values: Wartości zmiennych (brakujące są zastępowane pustym tekstem)
+            
+        Returns:
+            Gotowy prompt
+        """
+        parts = self.parts.copy()
+        for index, name in self.slots:
+            parts[index] = values.get(name) or ""
+        return "".join(parts)
+
+
+class PromptManager:
+    """
+    Jedno źródło treści promptów dla całej aplikacji (edytor i generator)
+    
+    Pliki prompt_*.txt z folderu prompts są trzymane w pamięci razem ze
+    skompilowanymi szablonami. Watcher co poll_interval sekund porównuje
+    mtime/rozmiar plików i wczytuje ponownie tylko zmienione. Zapis przez
+    save_prompt od razu aktualizuje pamięć, bez ponownego skanowania folderu.
+    
+    Folder jest skanowany dopiero przy pierwszej potrzebie (lista promptów,
+    start watchera) - pojedyncze szablony są wczytywane na żądanie.
+    """
+    
+    def __init__(self, prompts_dir: str = PROMPTS_DIR, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            prompts_dir: Folder z plikami promptów
+            poll_interval: Odstęp między sprawdzeniami plików przez watcher [s]
+        """
+        self.prompts_dir = prompts_dir
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        # nazwa pliku -> (ścieżka, mtime_ns, rozmiar, treść, szablon)
+        self.entries: Dict[str, Tuple[str, int, int, str, CompiledTemplate]] = {}
+        self.loads = 0
+        self._stop_event = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._loaded = False
+        
+    def ensure_loaded(self) -> None:
+        """Wczytaj folder promptów, jeśli nie był jeszcze skanowany"""
+        if not self._loaded:
+            self.load_prompts()
+            
+    def load_prompts(self) -> None:
+        """Wczytaj wszystkie pliki promptów"""
+        # Utwórz folder prompts i przenieś do niego prompty z bieżącego folderu
+        if not os.path.exists(self.prompts_dir):
+            os.makedirs(self.prompts_dir)
+            for name in os.listdir('.'):
+                if self._is_prompt_file(name):
+                    os.rename(name, os.path.join(self.prompts_dir, name))
+                    
+        self.refresh()
+        self._loaded = True
+        
+    def refresh(self) -> List[str]:
+        """
+        Wczytaj ponownie pliki zmienione na dysku
+        
+        Returns:
+            Nazwy plików dodanych, zmienionych lub usuniętych
+        """
+        changed = []
+        seen = set()
+        
+        try:
+            scan = list(os.scandir(self.prompts_dir))
+        except OSError:
+            scan = []
+            
+        for entry in scan:
+            if not self._is_prompt_file(entry.name):
+                continue
+            seen.add(entry.name)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if self._load(entry.name, entry.path, stat):
+                changed.append(entry.name)
+                
+        with self.lock:
+            known = list(self.entries.items())
+            
+        for name, cached in known:
+            if name in seen:
+                continue
+            # Pliki spoza folderu prompts (kompatybilność wsteczna) sprawdzane pojedynczo
+            if cached[0] == name:
+                try:
+                    if self._load(name, name, os.stat(name)):
+                        changed.append(name)
+                    continue
+                except OSError:
+                    pass
+            with self.lock:
+                self.entries.pop(name, None)
+            changed.append(name)
+            
+        return changed
+        
+    def get_prompt_list(self) -> List[str]:
+        """Posortowane nazwy plików promptów z folderu prompts"""
+        self.ensure_loaded()
+        with self.lock:
+            return sorted(
+                name for name, cached in self.entries.items()
+                if cached[0] != name
+            )
+            
+    def get_path(self, filename: str) -> str:
+        """Ścieżka pliku promptu"""
+        with self.lock:
+            cached = self.entries.get(filename)
+        return cached[0] if cached else os.path.join(self.prompts_dir, filename)
+        
+    def get_prompt_content(self, filename: str) -> Optional[str]:
+        """
+        Treść promptu z pamięci
+        
+        Args:
+            filename: Nazwa pliku promptu
+            
+        Returns:
+            Treść pliku lub None jeśli pliku nie ma
+        """
+        cached = self._get_entry(filename)
+        return cached[3] if cached else None
+        
+    def get_template(self, filename: str) -> Optional[CompiledTemplate]:
+        """
+        Skompilowany szablon promptu (bez nowych linii - prompty są wysyłane jako jedna linia)
+        
+        Args:
+            filename: Nazwa pliku promptu (szukany w folderze prompts, potem w bieżącym)
+            
+        Returns:
+            CompiledTemplate lub None jeśli pliku nie ma
+        """
+        cached = self._get_entry(filename)
+        return cached[4] if cached else None
+        
+    def exists(self, filename: str) -> bool:
+        """Czy prompt o tej nazwie istnieje w folderze prompts"""
+        return os.path.exists(os.path.join(self.prompts_dir, filename))
+        
+    def save_prompt(self, filename: str, content: str, backup: bool = True) -> Optional[str]:
+        """
+        Zapisz treść promptu (atomowo) i od razu zaktualizuj pamięć
+        
+        Args:
+            filename: Nazwa pliku promptu
+            content: Nowa treść
+            backup: Czy zrobić kopię zapasową poprzedniej wersji
+            
+        Returns:
+            Ścieżka kopii zapasowej lub None
+        """
+        backup_file = self.create_backup(filename) if backup else None
+        
+        path = os.path.join(self.prompts_dir, filename)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+        
+        self._load(filename, path, os.stat(path), content)
+        return backup_file
+        
+    def create_prompt(self, filename: str, content: str) -> str:
+        """
+        Utwórz nowy plik promptu
+        
+        Raises:
+            FileExistsError: Jeśli plik już istnieje
+            
+        Returns:
+            Ścieżka utworzonego pliku
+        """
+        if self.exists(filename):
+            raise FileExistsError(filename)
+        self.save_prompt(filename, content, backup=False)
+        return self.get_path(filename)
+        
+    def duplicate_prompt(self, filename: str) -> str:
+        """
+        Skopiuj prompt pod wolną nazwą <nazwa>_copyN.txt
+        
+        Returns:
+            Nazwa nowego pliku
+        """
+        content = self.get_prompt_content(filename)
+        if content is None:
+            raise FileNotFoundError(filename)
+            
+        base_name = filename[:-len('.txt')]
+        counter = 1
+        while self.exists(f"{base_name}_copy{counter}.txt"):
+            counter += 1
+            
+        new_filename = f"{base_name}_copy{counter}.txt"
+        self.save_prompt(new_filename, content, backup=False)
+        return new_filename
+        
+    def delete_prompt(self, filename: str) -> str:
+        """
+        Przenieś prompt do kosza (prompts/trash)
+        
+        Returns:
+            Ścieżka pliku w koszu
+        """
+        trash_dir = os.path.join(self.prompts_dir, "trash")
+        os.makedirs(trash_dir, exist_ok=True)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        trash_file = os.path.join(trash_dir, f"{filename}.{timestamp}")
+        os.rename(self.get_path(filename), trash_file)
+        
+        with self.lock:
+            self.entries.pop(filename, None)
+        return trash_file
+        
+    def create_backup(self, filename: str) -> Optional[str]:
+        """
+        Utwórz kopię zapasową pliku promptu (prompts/backups)
+        
+        Returns:
+            Ścieżka kopii lub None jeśli pliku nie ma
+        """
+        path = os.path.join(self.prompts_dir, filename)
+        if not os.path.exists(path):
+            return None
+            
+        backup_dir = os.path.join(self.prompts_dir, "backups")
+        os.makedirs(backup_dir, exist_ok=True)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        backup_file = os.path.join(backup_dir, f"{filename}.{timestamp}.bak")
+        shutil.copyfile(path, backup_file)
+        return backup_file
+        
+    def start_watching(self) -> None:
+        """Uruchom watcher w wątku w tle (sprawdzanie co poll_interval)"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch, name="prompt-watcher", daemon=True)
+        self._watcher.start()
+        
+    def stop_watching(self) -> None:
+        """Zatrzymaj watcher"""
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
+            
+    def _watch(self) -> None:
+        try:
+            self.ensure_loaded()
+        except Exception as e:
+            print(f"Error loading prompts: {e}")
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                changed = self.refresh()
+            except Exception as e:
+                print(f"Error refreshing prompts: {e}")
+                continue
+            if changed:
+                print(f"Prompts reloaded: {', '.join(sorted(changed))}")
+                
+    def _get_entry(self, filename: str) -> Optional[Tuple[str, int, int, str, CompiledTemplate]]:
+        """
+        Wpis z pamięci; nieznany plik jest wczytywany z dysku przy pierwszym użyciu
+        
+        Bez działającego watchera (np. batch_processor) każdy odczyt porównuje
+        mtime/rozmiar pliku i wczytuje go ponownie, jeśli się zmienił.
+        """
+        with self.lock:
+            cached = self.entries.get(filename)
+        if cached is not None:
+            if self._watcher is not None and self._watcher.is_alive():
+                return cached
+            try:
+                self._load(filename, cached[0], os.stat(cached[0]))
+            except OSError:
+                # Plik usunięty - zostaje ostatnia wczytana treść
+                return cached
+            with self.lock:
+                return self.entries.get(filename, cached)
+                
+        for path in (os.path.join(self.prompts_dir, filename), filename):
+            try:
+                if self._load(filename, path, os.stat(path)) is not None:
+                    with self.lock:
+                        return self.entries.get(filename)
+            except OSError:
+                continue
+        return None
+        
+    def _load(self, filename: str, path: str, stat: os.stat_result,
+              content: Optional[str] = None) -> Optional[bool]:
+        """
+        Wczytaj plik, jeśli zmienił się od ostatniego odczytu
+        
+        Returns:
+            True - wczytano, False - bez zmian, None - błąd odczytu
+        """
+        with self.lock:
+            cached = self.entries.get(filename)
+        if (content is None and cached and cached[0] == path
+                and cached[1] == stat.st_mtime_ns and cached[2] == stat.st_size):
+            return False
+            
+        if content is None:
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    content = file.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error loading {path}: {e}")
+                return None
+                
+        template = CompiledTemplate(content.replace("\n", ""))
+        with self.lock:
+            self.entries[filename] = (path, stat.st_mtime_ns, stat.st_size, content, template)
+            self.loads += 1
+        return True
+        
+    @staticmethod
+    def _is_prompt_file(name: str) -> bool:
+        return name.startswith('prompt_') and name.endswith('.txt')
+
+
+_prompt_manager: Optional[PromptManager] = None
+_prompt_manager_lock = threading.Lock()
+
+
+def get_prompt_manager() -> PromptManager:
+    """Wspólny manager promptów aplikacji (tworzony przy pierwszym użyciu)"""
+    global _prompt_manager
+    with _prompt_manager_lock:
+        if _prompt_manager is None:
+            _prompt_manager = PromptManager()
+        return _prompt_manager
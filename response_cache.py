@@ -0,0 +1,108 @@
+# response_cache.py
+"""Trwały cache odpowiedzi OpenAI adresowany treścią zapytania"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from cache_directory import CacheDirectory
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "openai")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+# Tryby pracy cache
+CACHE_USE = "use"          # odczyt i zapis
+CACHE_REFRESH = "refresh"  # pomiń odczyt, zapisz nową odpowiedź
+CACHE_OFF = "off"          # bez odczytu i zapisu
+CACHE_MODES = (CACHE_USE, CACHE_REFRESH, CACHE_OFF)
+
+
+def make_cache_key(model: str, max_tokens: int, prompt: str) -> str:
+    """
+    Zbuduj klucz cache z parametrów zapytania
+    
+    Args:
+        model: Nazwa modelu
+        max_tokens: Limit tokenów odpowiedzi
+        prompt: Pełny, wyrenderowany prompt
+        
+    Returns:
+        Hash SHA-256 (hex)
+    """
+    payload = json.dumps([model, max_tokens, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache na dysku: jeden plik JSON na odpowiedź
+    
+    Wpisy starsze niż max_age są usuwane przy odczycie. Po przekroczeniu
+    max_bytes usuwane są najdawniej używane wpisy (mtime odświeżany przy
+    trafieniu, limity pilnuje CacheDirectory).
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_age: float = DEFAULT_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        self.disk = CacheDirectory(cache_dir, max_bytes, max_age, label="response cache")
+        
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+        
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Pobierz wpis z cache
+        
+        Args:
+            key: Klucz z make_cache_key
+            
+        Returns:
+            Zapisany wpis lub None (brak / przeterminowany / uszkodzony)
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+            
+        if time.time() - entry.get("created", 0) > self.max_age:
+            self.disk.remove(path)
+            with self.lock:
+                self.misses += 1
+            return None
+            
+        self.disk.touch(path)
+        
+        with self.lock:
+            self.hits += 1
+        return entry
+        
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Zapisz wpis (atomowo, przez plik tymczasowy)
+        
+        Zapis jest najlepszą próbą: błąd dysku (np. brak miejsca) tylko
+        pomija cache - odpowiedź została już opłacona i trafia do wywołującego.
+        
+        Args:
+            key: Klucz z make_cache_key
+            entry: Dane odpowiedzi (content, usage, cost)
+        """
+        entry = dict(entry, created=time.time())
+        self.disk.write(self._path(key), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        
+    def clear(self) -> None:
+        """Usuń wszystkie wpisy"""
+        self.disk.clear()
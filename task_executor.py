@@ -0,0 +1,193 @@
+# task_executor.py
+"""Wykonywanie operacji sieciowych w tle z wynikami przekazywanymi do wątku Tk"""
+import queue
+import threading
+import tkinter as tk
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+# Co ile ms wątek UI odbiera wyniki i postęp zadań
+DEFAULT_POLL_MS = 50
+DEFAULT_TASK_WORKERS = 4
+
+
+class Task:
+    """
+    Pojedyncze zadanie uruchomione w tle
+    
+    Funkcja zadania dostaje obiekt Task jako pierwszy argument: może sprawdzać
+    task.cancelled i zgłaszać postęp przez task.report_progress.
+    """
+    
+    def __init__(self, executor: "TaskExecutor", group: Optional[Hashable], generation: int,
+                 on_success: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 on_progress: Optional[Callable[[List[Any]], None]] = None):
+        self.executor = executor
+        self.group = group
+        self.generation = generation
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+        
+    @property
+    def stale(self) -> bool:
+        """Czy grupa zadania została unieważniona (np. załadowano inny produkt)"""
+        return self.executor.is_stale(self)
+        
+    def cancel(self) -> None:
+        """Poproś zadanie o przerwanie (zadanie samo sprawdza cancelled)"""
+        self.cancel_event.set()
+        
+    def report_progress(self, payload: Any) -> None:
+        """
+        Zgłoś postęp z wątku roboczego
+        
+        Wszystkie zgłoszenia z jednego cyklu trafiają do on_progress jako lista.
+        """
+        if self.on_progress is not None:
+            self.executor._post(self, 'progress', payload)
+
+
+class TaskExecutor:
+    """
+    Pula wątków dla operacji blokujących (HTTP) uruchamianych z interfejsu Tk
+    
+    Callbacki on_success / on_error / on_progress są wywoływane w wątku Tk
+    (przez root.after). Zadania z grupą (np. "product") są unieważniane przez
+    invalidate(group) - ich wyniki są wtedy odrzucane, więc odpowiedź dla
+    poprzedniego produktu nie nadpisze danych nowego.
+    """
+    
+    def __init__(self, root: tk.Misc, max_workers: int = DEFAULT_TASK_WORKERS,
+                 poll_ms: int = DEFAULT_POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self.results: "queue.Queue" = queue.Queue()
+        self.lock = threading.Lock()
+        self.generations: Dict[Hashable, int] = {}
+        self.active: List[Task] = []
+        self._poll_scheduled = False
+        self._closed = False
+        
+    def submit(self, fn: Callable[..., Any], *args,
+               group: Optional[Hashable] = None,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_progress: Optional[Callable[[List[Any]], None]] = None) -> Task:
+        """
+        Uruchom fn(task, *args) w tle (wywoływać z wątku Tk)
+        
+        Args:
+            fn: Funkcja zadania
+            group: Grupa do unieważniania (None - wynik zawsze dostarczany)
+            on_success: Wywoływane z wynikiem fn
+            on_error: Wywoływane z wyjątkiem rzuconym przez fn
+            on_progress: Wywoływane z listą zgłoszeń postępu z ostatniego cyklu
+            
+        Returns:
+            Obiekt zadania (do anulowania)
+        """
+        with self.lock:
+            generation = self.generations.get(group, 0)
+        task = Task(self, group, generation, on_success, on_error, on_progress)
+        self.active.append(task)
+        self.pool.submit(self._run, task, fn, args)
+        self._schedule_poll()
+        return task
+        
+    def invalidate(self, group: Hashable) -> None:
+        """Anuluj zadania grupy i odrzuć ich przyszłe wyniki"""
+        with self.lock:
+            self.generations[group] = self.generations.get(group, 0) + 1
+        for task in self.active:
+            if task.group == group:
+                task.cancel()
+                
+    def is_stale(self, task: Task) -> bool:
+        if task.group is None:
+            return False
+        with self.lock:
+            return task.generation != self.generations.get(task.group, 0)
+            
+    def cancel_all(self) -> None:
+        """Poproś wszystkie aktywne zadania o przerwanie"""
+        for task in self.active:
+            task.cancel()
+            
+    def shutdown(self) -> None:
+        """Anuluj zadania i zamknij pulę (przy zamykaniu aplikacji)"""
+        self._closed = True
+        self.cancel_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        
+    def _run(self, task: Task, fn: Callable[..., Any], args: tuple) -> None:
+        """Wątek roboczy: wykonaj zadanie i przekaż wynik do kolejki"""
+        try:
+            result = fn(task, *args)
+        except Exception as e:
+            self._post(task, 'error', e)
+        else:
+            self._post(task, 'success', result)
+            
+    def _post(self, task: Task, kind: str, payload: Any) -> None:
+        self.results.put((task, kind, payload))
+        
+    def _schedule_poll(self) -> None:
+        if not self._poll_scheduled and not self._closed:
+            self._poll_scheduled = True
+            self.root.after(self.poll_ms, self._poll)
+            
+    def _poll(self) -> None:
+        """Wątek Tk: dostarcz postęp i wyniki zadań do callbacków"""
+        self._poll_scheduled = False
+        if self._closed:
+            return
+            
+        progress: Dict[Task, List[Any]] = {}
+        finished = []
+        try:
+            while True:
+                task, kind, payload = self.results.get_nowait()
+                if kind == 'progress':
+                    progress.setdefault(task, []).append(payload)
+                else:
+                    finished.append((task, kind, payload))
+        except queue.Empty:
+            pass
+            
+        # Postęp przed wynikiem, jedno wywołanie na zadanie w cyklu
+        for task, payloads in progress.items():
+            if not task.stale:
+                self._dispatch(task.on_progress, payloads)
+                
+        for task, kind, payload in finished:
+            self.active.remove(task)
+            if task.stale:
+                continue
+            callback = task.on_success if kind == 'success' else task.on_error
+            if callback is None and kind == 'error':
+                print(f"Błąd zadania w tle: {payload}")
+            self._dispatch(callback, payload)
+            
+        if self.active:
+            self._schedule_poll()
+            
+    def _dispatch(self, callback: Optional[Callable[[Any], None]], payload: Any) -> None:
+        if callback is None:
+            return
+        try:
+            callback(payload)
+        except tk.TclError as e:
+            # Widget zniszczony w międzyczasie (np. zamknięte okno podglądu)
+            print(f"Pominięto wynik zadania: {e}")
+        except Exception:
+            # Błąd w callbacku nie może zatrzymać odbierania kolejnych wyników
+            traceback.print_exc()
@@ -0,0 +1,13 @@
+# tests/conftest.py
+"""Wspólne ustawienia testów: bez config.py moduły aplikacji korzystają z config_sample.py"""
+import importlib
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+try:
+    import config  # noqa: F401
+except ImportError:
+    sys.modules["config"] = importlib.import_module("config_sample")
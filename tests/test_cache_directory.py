@@ -0,0 +1,90 @@
+# tests/test_cache_directory.py
+"""Testy CacheDirectory: zapis atomowy, licznik rozmiaru, usuwanie po wieku i rozmiarze"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from cache_directory import STALE_TEMP_AGE, CacheDirectory
+
+
+def set_age(path, seconds):
+    """Cofnij mtime pliku o podaną liczbę sekund"""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+class CacheDirectoryTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = self.temp_dir.name
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def file(self, name):
+        return os.path.join(self.path, name)
+        
+    def test_write_tracks_total_bytes(self):
+        disk = CacheDirectory(self.path, max_bytes=1000)
+        self.assertTrue(disk.write(self.file("a"), b"x" * 100))
+        self.assertTrue(disk.write(self.file("b"), b"x" * 50))
+        # Nadpisanie liczy tylko różnicę
+        self.assertTrue(disk.write(self.file("a"), b"x" * 30))
+        self.assertEqual(disk.total_bytes, 80)
+        
+        self.assertTrue(disk.remove(self.file("b")))
+        self.assertFalse(disk.remove(self.file("b")))
+        self.assertEqual(disk.total_bytes, 30)
+        
+    def test_failed_write_removes_temp_file(self):
+        disk = CacheDirectory(self.path, max_bytes=1000)
+        # os.replace nie nadpisze folderu - zapis kończy się OSError po utworzeniu pliku tymczasowego
+        os.mkdir(self.file("entry"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(disk.write(self.file("entry"), b"data"))
+            
+        self.assertEqual(sorted(os.listdir(self.path)), ["entry"])
+        self.assertEqual(disk.total_bytes, 0)
+        
+    def test_over_limit_removes_oldest_down_to_90_percent(self):
+        disk = CacheDirectory(self.path, max_bytes=300)
+        for age, name in ((30, "old"), (20, "middle"), (10, "new")):
+            disk.write(self.file(name), b"x" * 100)
+            set_age(self.file(name), age)
+            
+        disk.write(self.file("latest"), b"x" * 100)
+        
+        self.assertEqual(sorted(os.listdir(self.path)), ["latest", "new"])
+        self.assertEqual(disk.total_bytes, 200)
+        
+    def test_startup_removes_expired_files_and_stale_temp(self):
+        for name in ("expired", "fresh", "abandoned.123.tmp", "writing.456.tmp"):
+            with open(self.file(name), "wb") as file:
+                file.write(b"x" * 10)
+        set_age(self.file("expired"), 3600)
+        set_age(self.file("abandoned.123.tmp"), STALE_TEMP_AGE + 60)
+        
+        disk = CacheDirectory(self.path, max_bytes=1000, max_age=600)
+        
+        # Świeży plik tymczasowy może należeć do trwającego zapisu
+        self.assertEqual(sorted(os.listdir(self.path)), ["fresh", "writing.456.tmp"])
+        self.assertEqual(disk.total_bytes, 10)
+        
+    def test_clear(self):
+        disk = CacheDirectory(self.path, max_bytes=1000)
+        disk.write(self.file("a"), b"x" * 10)
+        disk.write(self.file("b.json"), b"{}")
+        disk.clear()
+        self.assertEqual(os.listdir(self.path), [])
+        self.assertEqual(disk.total_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
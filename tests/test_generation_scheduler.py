@@ -0,0 +1,119 @@
+# tests/test_generation_scheduler.py
+"""Testy TokenBucket i ponawiania w RateLimitedOpenAIClient (bez sieci)"""
+import os
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from generation_scheduler import RateLimitedOpenAIClient, TokenBucket
+
+PROMPT = "Opisz rower " * 50
+MAX_TOKENS = 1000
+USED = 300
+
+# 6000 tokenów/min = 100/s - uzupełnienie w trakcie testu jest pomijalne
+TOKENS_PER_MINUTE = 6000
+
+
+class FakeClient:
+    """Zastępuje OpenAIClient: zwraca kolejne wyniki z listy"""
+    
+    def __init__(self, results):
+        self.model = "test-model"
+        self.max_tokens = MAX_TOKENS
+        self.results = list(results)
+        self.calls = 0
+        
+    def get_cached(self, prompt):
+        return None
+        
+    def generate_content(self, prompt, check_cache=True):
+        self.calls += 1
+        return self.results.pop(0)
+
+
+def failure(**fields):
+    return dict({'success': False, 'error': 'błąd', 'content': ''}, **fields)
+
+
+def success():
+    return {
+        'success': True, 'content': 'opis',
+        'usage': {'prompt_tokens': USED - 100, 'completion_tokens': 100}
+    }
+
+
+def make_client(results, max_retries=5):
+    fake = FakeClient(results)
+    client = RateLimitedOpenAIClient(
+        fake, requests_per_minute=6000, tokens_per_minute=TOKENS_PER_MINUTE,
+        max_retries=max_retries, base_delay=0.001, max_delay=0.005
+    )
+    return fake, client
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_acquire_and_wait_time(self):
+        bucket = TokenBucket(60)
+        self.assertEqual(bucket.try_acquire(50), 0.0)
+        # Zostało ~10 tokenów, uzupełnianie 1/s
+        self.assertAlmostEqual(bucket.try_acquire(20), 10.0, delta=0.1)
+        self.assertAlmostEqual(bucket.tokens, 10.0, delta=0.1)
+        
+    def test_amount_is_capped_at_capacity(self):
+        bucket = TokenBucket(60)
+        self.assertEqual(bucket.try_acquire(1000), 0.0)
+        self.assertAlmostEqual(bucket.tokens, 0.0, delta=0.1)
+        
+    def test_refund_does_not_exceed_capacity(self):
+        bucket = TokenBucket(60)
+        bucket.try_acquire(10)
+        bucket.refund(100)
+        self.assertEqual(bucket.tokens, 60.0)
+
+
+class RetryTest(unittest.TestCase):
+    def test_rate_limited_attempts_refund_reservation(self):
+        fake, client = make_client([
+            failure(status_code=429), failure(status_code=429), success()
+        ])
+        result = client.generate_content(PROMPT)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(fake.calls, 3)
+        self.assertEqual(client.retries, 2)
+        self.assertEqual(client.rate_limited, 2)
+        # Z wiadra ubyło tylko to, co zużyło udane zapytanie
+        self.assertAlmostEqual(client.token_bucket.tokens, TOKENS_PER_MINUTE - USED, delta=5)
+        
+    def test_final_failure_refunds_reservation(self):
+        fake, client = make_client([failure(status_code=503)] * 3, max_retries=2)
+        result = client.generate_content(PROMPT)
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(fake.calls, 3)
+        self.assertAlmostEqual(client.token_bucket.tokens, TOKENS_PER_MINUTE, delta=5)
+        
+    def test_non_retryable_error_is_returned_at_once(self):
+        fake, client = make_client([failure(status_code=400)])
+        result = client.generate_content(PROMPT)
+        
+        self.assertEqual(result['status_code'], 400)
+        self.assertEqual(fake.calls, 1)
+        self.assertEqual(client.retries, 0)
+        self.assertAlmostEqual(client.token_bucket.tokens, TOKENS_PER_MINUTE, delta=5)
+        
+    def test_transport_error_is_retried_unless_partial(self):
+        fake, client = make_client([failure(transport_error=True), success()])
+        self.assertTrue(client.generate_content(PROMPT)['success'])
+        self.assertEqual(fake.calls, 2)
+        
+        fake, client = make_client([failure(transport_error=True, partial=True)])
+        self.assertFalse(client.generate_content(PROMPT)['success'])
+        self.assertEqual(fake.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
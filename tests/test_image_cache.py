@@ -0,0 +1,74 @@
+# tests/test_image_cache.py
+"""Testy dyskowego poziomu ImageCache: limity rozmiaru i wieku, sprzątanie po nieudanym zapisie"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from image_cache import ImageCache
+
+
+class ImageCacheDiskTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = self.temp_dir.name
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def age_entry(self, cache, url, seconds):
+        then = time.time() - seconds
+        for path in (cache._path(url), f"{cache._path(url)}.json"):
+            os.utime(path, (then, then))
+            
+    def test_round_trip(self):
+        cache = ImageCache(self.path)
+        cache.put_bytes("https://example.com/a.jpg", b"jpeg", etag='"1"')
+        self.assertEqual(cache.read_bytes("https://example.com/a.jpg"), b"jpeg")
+        self.assertEqual(cache.get_entry("https://example.com/a.jpg")["etag"], '"1"')
+        
+    def test_write_over_limit_removes_oldest_images(self):
+        cache = ImageCache(self.path, max_bytes=5000)
+        for i in range(4):
+            url = f"https://example.com/{i}.jpg"
+            cache.put_bytes(url, b"x" * 1000)
+            self.age_entry(cache, url, 100 - i)
+            
+        cache.put_bytes("https://example.com/new.jpg", b"x" * 1000)
+        
+        self.assertIsNone(cache.read_bytes("https://example.com/0.jpg"))
+        self.assertIsNone(cache.get_entry("https://example.com/0.jpg"))
+        self.assertEqual(cache.read_bytes("https://example.com/new.jpg"), b"x" * 1000)
+        self.assertLessEqual(cache.disk.total_bytes, 5000 * 0.9)
+        
+    def test_expired_images_are_removed_at_startup(self):
+        cache = ImageCache(self.path, max_age=600)
+        cache.put_bytes("https://example.com/old.jpg", b"old")
+        cache.put_bytes("https://example.com/new.jpg", b"new")
+        self.age_entry(cache, "https://example.com/old.jpg", 3600)
+        
+        cache = ImageCache(self.path, max_age=600)
+        
+        self.assertIsNone(cache.read_bytes("https://example.com/old.jpg"))
+        self.assertEqual(cache.read_bytes("https://example.com/new.jpg"), b"new")
+        
+    def test_failed_write_leaves_no_temp_file(self):
+        cache = ImageCache(self.path)
+        url = "https://example.com/a.jpg"
+        # Folder w miejscu pliku - os.replace kończy się OSError
+        os.mkdir(cache._path(url))
+        with contextlib.redirect_stdout(io.StringIO()):
+            cache.put_bytes(url, b"jpeg")
+            
+        self.assertEqual(os.listdir(self.path), [os.path.basename(cache._path(url))])
+        self.assertIsNone(cache.get_entry(url))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# tests/test_parse_update_response.py
+"""Testy parse_update_response: odpowiedź JSON (słownik, lista) i zwykły tekst"""
+import os
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from api_client import parse_update_response
+
+IDS = ["101", "102", "103"]
+
+
+class JsonDictResponseTest(unittest.TestCase):
+    def test_keyed_by_product_id(self):
+        text = '{"101": {"status": "ok"}, "102": {"error": "Brak produktu"}, "103": true}'
+        self.assertEqual(parse_update_response(text, IDS), {"101": True, "102": False, "103": True})
+        
+    def test_missing_product_fails_only_that_product(self):
+        text = '{"101": "updated", "102": "updated"}'
+        self.assertEqual(parse_update_response(text, IDS), {"101": True, "102": True, "103": False})
+        
+    def test_global_status_applies_to_all(self):
+        self.assertEqual(
+            parse_update_response('{"status": "ok", "errors": []}', IDS),
+            {"101": True, "102": True, "103": True}
+        )
+        self.assertEqual(
+            parse_update_response('{"error": "Nieprawidłowy klucz API"}', IDS),
+            {"101": False, "102": False, "103": False}
+        )
+        
+    def test_zero_error_summary_is_success(self):
+        self.assertEqual(
+            parse_update_response('{"result": "3 updated, 0 errors"}', IDS),
+            {"101": True, "102": True, "103": True}
+        )
+
+
+class JsonListResponseTest(unittest.TestCase):
+    def test_items_with_prod_id(self):
+        text = '[{"prod_id": 101, "status": "ok"}, {"prod_id": "102", "status": "failed"}]'
+        self.assertEqual(parse_update_response(text, IDS), {"101": True, "102": False, "103": False})
+        
+    def test_list_without_prod_id(self):
+        self.assertEqual(parse_update_response('["ok", "ok"]', IDS), {"101": True, "102": True, "103": True})
+        self.assertEqual(
+            parse_update_response('["ok", "error"]', IDS),
+            {"101": False, "102": False, "103": False}
+        )
+
+
+class PlainTextResponseTest(unittest.TestCase):
+    def test_success_without_error_payload(self):
+        self.assertEqual(
+            parse_update_response("Zaktualizowano 3 produkty", IDS),
+            {"101": True, "102": True, "103": True}
+        )
+        self.assertEqual(parse_update_response("", IDS), {"101": True, "102": True, "103": True})
+        
+    def test_zero_error_summary_is_success(self):
+        text = "Updated: 3\n0 errors\nErrors: 0"
+        self.assertEqual(parse_update_response(text, IDS), {"101": True, "102": True, "103": True})
+        
+    def test_error_line_with_ids_fails_only_those_products(self):
+        text = "Updated: 2\nError: product 102 not found\n1 error"
+        self.assertEqual(parse_update_response(text, IDS), {"101": True, "102": False, "103": True})
+        
+    def test_id_must_match_whole_number(self):
+        text = "Error: products 1010, 102 not found"
+        self.assertEqual(parse_update_response(text, IDS), {"101": True, "102": False, "103": True})
+        
+    def test_error_message_without_ids_fails_all(self):
+        for text in ("Error: invalid XML", "Błąd: nieprawidłowy klucz API", "Failed - timeout"):
+            with self.subTest(text=text):
+                self.assertEqual(
+                    parse_update_response(text, IDS),
+                    {"101": False, "102": False, "103": False}
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# tests/test_prompt_templates.py
+"""Testy CompiledTemplate: renderowanie wszystkich promptów zgodne z dawnym łańcuchem str.replace"""
+import os
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from prompt_templates import CompiledTemplate, PromptManager
+
+PROMPTS_DIR = os.path.join(ROOT_DIR, "prompts")
+
+VALUES = {
+    "prod_name": "Rower SCOTT Spark 930 & \"Trail\" 29\"",
+    "prod_desclongription": "<p>Opis produktu testowego.</p>\n<ul><li>Rama: aluminium</li></ul>" * 3,
+    "product_specification": "<table><tr><td>Waga</td><td>13,5 kg</td></tr></table>"
+}
+
+
+def legacy_prepare(path: str, values: dict) -> str:
+    """Dawna implementacja PromptProcessor.load_and_prepare_prompt (odczyt pliku + trzy str.replace)"""
+    with open(path, "r", encoding="utf-8") as file:
+        prompt = file.read().replace("\n", "")
+    prompt = prompt.replace("{prod_name}", values["prod_name"])
+    prompt = prompt.replace("{prod_desclongription}", values["prod_desclongription"])
+    prompt = prompt.replace("{product_specification}", values["product_specification"])
+    return prompt
+
+
+def legacy_prepare_short(path: str, long_description_ul: str) -> str:
+    """Dawna implementacja ShortDescriptionGenerator (tylko {prod_desclongription})"""
+    with open(path, "r", encoding="utf-8") as file:
+        prompt = file.read().replace("\n", "")
+    return prompt.replace("{prod_desclongription}", long_description_ul)
+
+
+class PromptRenderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.manager = PromptManager(PROMPTS_DIR)
+        cls.prompt_files = cls.manager.get_prompt_list()
+        
+    def test_prompts_folder_is_not_empty(self):
+        self.assertIn("prompt_newdesc.txt", self.prompt_files)
+        self.assertIn("prompt_shortdesc.txt", self.prompt_files)
+        
+    def test_every_prompt_matches_replace_chain(self):
+        for prompt_file in self.prompt_files:
+            with self.subTest(prompt=prompt_file):
+                template = self.manager.get_template(prompt_file)
+                expected = legacy_prepare(os.path.join(PROMPTS_DIR, prompt_file), VALUES)
+                self.assertEqual(template.render(VALUES), expected)
+                
+    def test_short_prompts_match_single_replace(self):
+        first_ul = "<ul><li>Rama: aluminium</li><li>Napęd: Shimano</li></ul>"
+        for prompt_file in ("prompt_shortdesc.txt", "prompt_shortdesc_short.txt"):
+            with self.subTest(prompt=prompt_file):
+                template = self.manager.get_template(prompt_file)
+                expected = legacy_prepare_short(os.path.join(PROMPTS_DIR, prompt_file), first_ul)
+                self.assertEqual(template.render({"prod_desclongription": first_ul}), expected)
+
+
+class CompiledTemplateTest(unittest.TestCase):
+    def test_repeated_and_missing_variables(self):
+        template = CompiledTemplate("{prod_name}: {prod_name} / {product_specification}")
+        self.assertEqual(template.render({"prod_name": "Spark"}), "Spark: Spark / ")
+        self.assertEqual(template.variables, frozenset({"prod_name", "product_specification"}))
+        
+    def test_substituted_values_are_not_rescanned(self):
+        template = CompiledTemplate("{prod_name}|{product_specification}")
+        rendered = template.render({"prod_name": "{product_specification}", "product_specification": "spec"})
+        self.assertEqual(rendered, "{product_specification}|spec")
+        
+    def test_unknown_braces_are_kept(self):
+        template = CompiledTemplate("{{prod_name}} {other} {prod_name}")
+        self.assertEqual(template.render(VALUES), "{" + VALUES["prod_name"] + "} {other} " + VALUES["prod_name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
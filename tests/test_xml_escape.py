@@ -0,0 +1,76 @@
+# tests/test_xml_escape.py
+"""Testy xml_escape: escapowanie znaków specjalnych i dzielenie "]]>" w sekcjach CDATA"""
+import os
+import sys
+import unittest
+import xml.etree.ElementTree as ET
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from xml_escape import cdata, escape_cdata, escape_xml, escape_xml_cached
+
+
+class CdataTest(unittest.TestCase):
+    def assert_round_trip(self, text):
+        element = ET.fromstring(f"<desc>{cdata(text)}</desc>")
+        self.assertEqual(element.text or "", text)
+        
+    def test_text_without_cdata_end_is_unchanged(self):
+        text = "<p>Rower &amp; akcesoria</p>"
+        self.assertIs(escape_cdata(text), text)
+        self.assert_round_trip(text)
+        
+    def test_cdata_end_is_split(self):
+        for text in (
+            "a]]>b",
+            "]]>",
+            "a]]]>b",
+            "]]>]]>",
+            "x]]>]]>y",
+            "]]]]>>",
+            "<p>tablica[i[j]]>0</p>"
+        ):
+            with self.subTest(text=text):
+                self.assert_round_trip(text)
+                
+    def test_empty_text(self):
+        self.assertEqual(escape_cdata(None), "")
+        self.assertEqual(cdata(""), "<![CDATA[]]>")
+        self.assert_round_trip("")
+
+
+class EscapeXmlTest(unittest.TestCase):
+    def test_special_characters(self):
+        self.assertEqual(escape_xml("&"), "&amp;")
+        self.assertEqual(escape_xml("<"), "&lt;")
+        self.assertEqual(escape_xml(">"), "&gt;")
+        self.assertEqual(escape_xml('"'), "&quot;")
+        self.assertEqual(escape_xml("'"), "&#39;")
+        
+    def test_ampersand_is_escaped_once(self):
+        self.assertEqual(escape_xml("Trail & <Enduro>"), "Trail &amp; &lt;Enduro&gt;")
+        self.assertEqual(escape_xml("&lt;"), "&amp;lt;")
+        
+    def test_plain_and_empty_text(self):
+        self.assertEqual(escape_xml("Kolor dominujący"), "Kolor dominujący")
+        self.assertEqual(escape_xml(""), "")
+        self.assertIsNone(escape_xml(None))
+        
+    def test_round_trip_in_attribute_and_text(self):
+        for text in ('Maxxis Rekon 2.4"', "Shimano Deore <12s>", "Trail & Enduro", "it's", "a&b<c>d\"e'f"):
+            with self.subTest(text=text):
+                element = ET.fromstring(f'<option name="{escape_xml(text)}">{escape_xml(text)}</option>')
+                self.assertEqual(element.get("name"), text)
+                self.assertEqual(element.text, text)
+                
+    def test_cached_matches_uncached(self):
+        for text in ("Wzrost", 'Rozmiar koła 29"', "a&b<c>d\"e'f", "", None):
+            with self.subTest(text=text):
+                self.assertEqual(escape_xml_cached(text), escape_xml(text))
+                # Drugie wywołanie z pamięci wyników
+                self.assertEqual(escape_xml_cached(text), escape_xml(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,9 @@
 # ui_components.py
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
 import tempfile
 import webbrowser
+from html_highlighter import IncrementalHighlighter, highlight_lines
 from utils import extract_product_id
 
 class ProductInfoPanel:
@@ -597,126 +595,12 @@ class ProductInfoPanel:
         
     def update_product_image(self, image_manager, image_path):
         """Aktualizuj obraz produktu używając ImageManager"""
-        success = image_manager.load_and_display_image(
+        image_manager.load_and_display_image(
             self.lbl_product_image, 
-            image_path
+            image_path,
+            on_loaded=lambda: image_manager.bind_preview_click(self.lbl_product_image, self.app.root)
         )
-        if success:
-            image_manager.bind_preview_click(self.lbl_product_image, self.app.root)
         
-    def _load_and_display_image(self, image_path):
-        """Załaduj i wyświetl obraz produktu"""
-        if not image_path:
-            self.lbl_product_image.config(text="[Brak obrazu]", image='')
-            return
-            
-        image_url = f"https://www.gsport.pl{image_path}_100.jpg"
-        self.image_base_path = f"https://www.gsport.pl{image_path}"
-            
-        try:
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            
-            img = Image.open(BytesIO(response.content))
-            
-            # Oblicz rozmiar
-            frame_width = 120
-            frame_height = 120
-            
-            width, height = img.size
-            aspect_ratio = width / height
-            
-            if aspect_ratio > 1:
-                new_width = frame_width
-                new_height = int(frame_width / aspect_ratio)
-            else:
-                new_height = frame_height
-                new_width = int(frame_height * aspect_ratio)
-                
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            
-            self.lbl_product_image.config(text='', image=photo, cursor="hand2")
-            self.lbl_product_image.image = photo
-            
-            self.lbl_product_image.bind("<Button-1>", lambda e: self._show_image_preview())
-            
-        except Exception as e:
-            print(f"Error loading image: {e}")
-            self.lbl_product_image.config(text="[Błąd ładowania]", image='', cursor="")
-            self.lbl_product_image.unbind("<Button-1>")
-            
-    def _show_image_preview(self):
-        """Pokaż podgląd obrazu"""
-        if not hasattr(self, 'image_base_path'):
-            return
-            
-        preview_window = tk.Toplevel(self.app.root)
-        preview_window.title("Podgląd obrazu produktu")
-        preview_window.geometry("600x600")
-        preview_window.configure(bg="#F9F9F9")
-        
-        # Wycentruj okno
-        preview_window.update_idletasks()
-        x = (preview_window.winfo_screenwidth() - 600) // 2
-        y = (preview_window.winfo_screenheight() - 600) // 2
-        preview_window.geometry(f"600x600+{x}+{y}")
-        
-        try:
-            large_image_url = f"{self.image_base_path}_500.jpg"
-            
-            response = requests.get(large_image_url, timeout=10)
-            response.raise_for_status()
-            
-            img = Image.open(BytesIO(response.content))
-            
-            max_width = 580
-            max_height = 550
-            
-            width, height = img.size
-            aspect_ratio = width / height
-            
-            if width > max_width or height > max_height:
-                if aspect_ratio > max_width / max_height:
-                    new_width = max_width
-                    new_height = int(max_width / aspect_ratio)
-                else:
-                    new_height = max_height
-                    new_width = int(max_height * aspect_ratio)
-            else:
-                new_width = width
-                new_height = height
-                
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            
-            image_label = tk.Label(preview_window, image=photo, bg="#F9F9F9")
-            image_label.image = photo
-            image_label.pack(expand=True, pady=10)
-            
-            close_btn = tk.Button(
-                preview_window,
-                text="Zamknij",
-                command=preview_window.destroy,
-                bg="#E24B38",
-                fg="white",
-                font=("Helvetica", 10),
-                padx=20,
-                pady=5
-            )
-            close_btn.pack(pady=10)
-            
-        except Exception as e:
-            error_label = tk.Label(
-                preview_window,
-                text=f"Nie można załadować obrazu:\n{str(e)}",
-                bg="#F9F9F9",
-                fg="#E24B38",
-                font=("Helvetica", 10)
-            )
-            error_label.pack(expand=True)
-    
-            
     def clear_all_fields(self):
         """Wyczyść wszystkie pola"""
         self.lbl_prod_name.config(text="[Nazwa produktu]")
@@ -759,6 +643,9 @@ class ControlPanel:
         # Wyświetlanie kosztów
         self._create_cost_display(inner)
         
+        # Postęp zadań w tle
+        self._create_progress_display(inner)
+        
     def _create_import_section(self, parent):
         """Utwórz sekcję importu danych"""
         import_frame = tk.Frame(parent, bg="#FFFFFF")
@@ -828,6 +715,17 @@ class ControlPanel:
         )
         self.chk_is_bike.pack(side="left", padx=(0, 15))
         
+        # Checkbox cache odpowiedzi AI
+        self.use_cache_var = tk.BooleanVar(value=True)
+        self.chk_use_cache = tk.Checkbutton(
+            gen_controls,
+            text="Cache",
+            variable=self.use_cache_var,
+            bg="#FFFFFF",
+            font=("Arial", 9)
+        )
+        self.chk_use_cache.pack(side="left", padx=(0, 15))
+        
         self.btn_generate = ttk.Button(
             gen_controls,
             text='Generuj AI',
@@ -836,6 +734,15 @@ class ControlPanel:
         )
         self.btn_generate.pack(side="left")
         
+        self.btn_cancel = ttk.Button(
+            gen_controls,
+            text='Stop',
+            command=self.app.product_manager.cancel_current_task,
+            style='Danger.TButton',
+            state=tk.DISABLED
+        )
+        self.btn_cancel.pack(side="left", padx=(5, 0))
+        
     def _create_save_section(self, parent):
         """Utwórz sekcję zapisu"""
         save_frame = tk.Frame(parent, bg="#FFFFFF")
@@ -869,6 +776,50 @@ class ControlPanel:
             fg="#666666"
         )
         self.lbl_cost.pack(side="right", padx=20)
+        
+    def _create_progress_display(self, parent):
+        """Utwórz wskaźnik postępu zadań w tle (ukryty gdy nic nie trwa)"""
+        self.progress_frame = tk.Frame(parent, bg="#FFFFFF")
+        
+        self.lbl_progress = tk.Label(
+            self.progress_frame,
+            text="",
+            bg="#FFFFFF",
+            font=("Arial", 9),
+            fg="#666666"
+        )
+        self.lbl_progress.pack(anchor="w")
+        
+        self.progress_bar = ttk.Progressbar(self.progress_frame, length=140, maximum=1.0)
+        self.progress_bar.pack(anchor="w", pady=(3, 0))
+        
+    def show_progress(self, text, fraction=None):
+        """
+        Pokaż postęp zadania
+        
+        Args:
+            text: Opis bieżącej operacji
+            fraction: Ułamek ukończenia 0-1 (None - postęp nieokreślony)
+        """
+        if not self.progress_frame.winfo_manager():
+            self.progress_frame.pack(side="right", padx=20)
+            
+        self.lbl_progress.config(text=text)
+        
+        if fraction is None:
+            if self.progress_bar.cget('mode') != 'indeterminate':
+                self.progress_bar.config(mode='indeterminate')
+                self.progress_bar.start(15)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', value=fraction)
+            
+    def hide_progress(self):
+        """Ukryj wskaźnik postępu"""
+        self.progress_bar.stop()
+        self.progress_bar.config(mode='determinate', value=0)
+        self.lbl_progress.config(text="")
+        self.progress_frame.pack_forget()
 
 
 class HTMLPreviewManager:
@@ -922,38 +873,21 @@ class SyntaxHighlighter:
     """Manager podświetlania składni HTML"""
     
     @staticmethod
-    def setup_text_widget(text_widget):
-        """Skonfiguruj podświetlanie składni dla widgetu tekstu"""
+    def setup_text_widget(text_widget) -> IncrementalHighlighter:
+        """
+        Skonfiguruj podświetlanie składni dla widgetu tekstu
+        
+        Returns:
+            Przyrostowy highlighter widgetu (schedule() po każdej zmianie)
+        """
         text_widget.tag_configure("html_tag", foreground="#0066CC", font=("Consolas", 11, "bold"))
         text_widget.tag_configure("html_attribute", foreground="#009900")
         text_widget.tag_configure("html_value", foreground="#CC0000")
         text_widget.tag_configure("html_content", foreground="#333333")
+        return IncrementalHighlighter(text_widget)
         
     @staticmethod
     def highlight_syntax(text_widget):
-        """Zastosuj podświetlanie składni"""
-        import re
-        
-        # Usuń istniejące tagi
-        for tag in ["html_tag", "html_attribute", "html_value"]:
-            text_widget.tag_remove(tag, "1.0", "end")
-            
-        content = text_widget.get("1.0", "end-1c")
-        
-        # Podświetl tagi HTML
-        for match in re.finditer(r'</?(\w+)(?:\s+[^>]*)?>|</\w+>', content):
-            start = text_widget.index(f"1.0+{match.start()}c")
-            end = text_widget.index(f"1.0+{match.end()}c")
-            text_widget.tag_add("html_tag", start, end)
-            
-        # Podświetl atrybuty i wartości
-        for match in re.finditer(r'(\w+)=(["\'])([^"\']*)\2', content):
-            # Nazwa atrybutu
-            attr_start = text_widget.index(f"1.0+{match.start(1)}c")
-            attr_end = text_widget.index(f"1.0+{match.end(1)}c")
-            text_widget.tag_add("html_attribute", attr_start, attr_end)
-            
-            # Wartość atrybutu (z cudzysłowami)
-            val_start = text_widget.index(f"1.0+{match.start(2)}c")
-            val_end = text_widget.index(f"1.0+{match.end(3)}c")
-            text_widget.tag_add("html_value", val_start, val_end)
\ No newline at end of file
+        """Zastosuj podświetlanie składni do całego dokumentu"""
+        lines = text_widget.get("1.0", "end-1c").split("\n")
+        highlight_lines(text_widget, lines, 0, len(lines))
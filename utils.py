@@ -2,12 +2,11 @@
 import re
 import os
 import datetime
-from tkinter import messagebox
-from typing import Optional
+from typing import Iterable, Optional, Union
 
-def extract_product_id(text: str) -> Optional[str]:
+def parse_product_id(text: str) -> Optional[str]:
     """
-    Extract product ID from Sky-Shop link or return it if it's just a number.
+    Parse product ID from Sky-Shop link or plain number (no UI side effects).
     
     Args:
         text: Input text containing link or ID
@@ -16,7 +15,6 @@ def extract_product_id(text: str) -> Optional[str]:
         Product ID as string or None if invalid
     """
     if not text:
-        messagebox.showerror("Błąd", "Pole jest puste. Wklej link do produktu lub numer ID.")
         return None
         
     text = text.strip()
@@ -30,47 +28,105 @@ def extract_product_id(text: str) -> Optional[str]:
     if text.isdigit():
         return text
         
+    return None
+
+
+def extract_product_id(text: str) -> Optional[str]:
+    """
+    Extract product ID from Sky-Shop link or return it if it's just a number.
+    
+    Args:
+        text: Input text containing link or ID
+        
+    Returns:
+        Product ID as string or None if invalid
+    """
+    from tkinter import messagebox
+    
+    if not text:
+        messagebox.showerror("Błąd", "Pole jest puste. Wklej link do produktu lub numer ID.")
+        return None
+        
+    product_id = parse_product_id(text)
+    if product_id:
+        return product_id
+        
     # Otherwise: invalid input
     messagebox.showerror("Nieprawidłowe dane", "Wklej link do produktu Sky-Shop lub numer ID produktu.")
     return None
     
 
-def save_xml_copy(xml_content: str, product_id: str, save_path: str) -> None:
+def xml_copy_path(product_id: str, save_path: str) -> str:
     """
-    Save a copy of XML to file with timestamp and product ID.
+    Path for a copy of XML: <save_path>/<timestamp>_<product ID>.xml
     
     Args:
-        xml_content: XML content as string
         product_id: Product ID for filename
-        save_path: Directory path where to save the file
+        save_path: Directory path where to save the file (created if missing)
+        
+    Returns:
+        File path
     """
     # Ensure directory exists
     os.makedirs(save_path, exist_ok=True)
     
     # Create filename with timestamp
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{product_id}.xml"
-    file_path = os.path.join(save_path, filename)
+    return os.path.join(save_path, f"{timestamp}_{product_id}.xml")
+
+
+def write_xml_file(xml_content: Union[str, Iterable[str]], file_path: str) -> None:
+    """
+    Write XML to a file exactly as it will be sent
     
-    # Write file
-    with open(file_path, "w", encoding="utf-8") as file:
-        file.write(xml_content)
+    Args:
+        xml_content: XML content as string, or an iterable of chunks written one by one
+        file_path: Destination file
+    """
+    # newline="" - saved exactly as sent
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        if isinstance(xml_content, str):
+            file.write(xml_content)
+        else:
+            for chunk in xml_content:
+                file.write(chunk)
+
+
+def save_xml_copy(xml_content: Union[str, Iterable[str]], product_id: str, save_path: str) -> str:
+    """
+    Save a copy of XML to file with timestamp and product ID.
+    
+    Args:
+        xml_content: XML content as string, or an iterable of chunks written one by one
+        product_id: Product ID for filename
+        save_path: Directory path where to save the file
         
+    Returns:
+        Path of the saved file
+    """
+    file_path = xml_copy_path(product_id, save_path)
+    write_xml_file(xml_content, file_path)
+    
     print(f"XML saved as: {file_path}")
+    return file_path
     
 
-def format_cost_display(cost_in_dollars: float) -> str:
+def format_cost_display(cost_in_dollars: float, saved_in_dollars: float = 0) -> str:
     """
     Format cost for display in cents.
     
     Args:
         cost_in_dollars: Cost in dollars
+        saved_in_dollars: Cost avoided thanks to cached responses
         
     Returns:
         Formatted string with cost in cents
     """
     cost_in_cents = cost_in_dollars * 100
-    return f"Koszt: {cost_in_cents:.5f}¢ USD"
+    text = f"Koszt: {cost_in_cents:.5f}¢ USD"
+    if saved_in_dollars:
+        text += f" (zaoszczędzono z cache: {saved_in_dollars * 100:.5f}¢)"
+    return text
     
 
 def clean_html_for_display(html_content: str) -> str:
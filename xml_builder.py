@@ -1,34 +1,8 @@
 # xml_builder.py
 import datetime
-from typing import List
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
 from product_data_manager import ProductDataManager
-
-def escape_xml(text: str) -> str:
-    """
-    Escape znaków specjalnych dla XML
-    
-    Args:
-        text: Tekst do escapowania
-        
-    Returns:
-        Tekst z escapowanymi znakami XML
-    """
-    if not text:
-        return text
-        
-    # Mapowanie znaków specjalnych XML
-    xml_escape_table = {
-        "&": "&amp;",
-        "<": "&lt;",
-        ">": "&gt;",
-        '"': "&quot;",
-        "'": "&#39;"
-    }
-    
-    for char, escape_seq in xml_escape_table.items():
-        text = text.replace(char, escape_seq)
-        
-    return text
+from xml_escape import escape_xml, escape_xml_cached, escape_cdata
 
 class XMLBuilder:
     """Builder do tworzenia XML dla aktualizacji produktów"""
@@ -45,16 +19,107 @@ class XMLBuilder:
         Returns:
             XML jako string
         """
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return XMLBuilder.build_products_xml([(product_id, data_manager)])
+        
+    @staticmethod
+    def build_products_xml(items: Iterable[Tuple[str, ProductDataManager]]) -> str:
+        """
+        Zbuduj jeden XML z wieloma produktami (każdy z własnymi danymi)
+        
+        Args:
+            items: Pary (ID produktu, manager danych produktu)
+            
+        Returns:
+            XML jako string
+        """
+        return ''.join(XMLBuilder.iter_products_xml(items))
+        
+    @staticmethod
+    def iter_products_xml(items: Iterable[Tuple[str, ProductDataManager]],
+                          now: Optional[str] = None) -> Iterator[str]:
+        """
+        Generuj XML z wieloma produktami kawałkami (bez składania całego dokumentu)
+        
+        Złączenie kawałków daje dokładnie wynik build_products_xml. Opisy są
+        zwracane jako osobne kawałki, bez kopiowania do większych napisów,
+        więc pamięć nie rośnie z liczbą produktów.
+        
+        Args:
+            items: Pary (ID produktu, manager danych produktu) - może być generatorem
+            now: Data dokumentu (domyślnie bieżąca)
+            
+        Yields:
+            Kolejne fragmenty XML
+        """
+        now = now or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        yield (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<products xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" version="1" date="{now}">'
+        )
+        
+        for product_id, data_manager in items:
+            yield from XMLBuilder._iter_item_chunks(product_id, data_manager)
+            
+        yield '\n</products>'
+        
+    @staticmethod
+    def write_products_xml(items: Iterable[Tuple[str, ProductDataManager]], file: IO[str]) -> int:
+        """
+        Zapisz XML z wieloma produktami prosto do pliku (strumieniowo)
+        
+        Args:
+            items: Pary (ID produktu, manager danych produktu) - może być generatorem
+            file: Plik otwarty do zapisu w trybie tekstowym (UTF-8)
+            
+        Returns:
+            Liczba zapisanych znaków
+        """
+        written = 0
+        for chunk in XMLBuilder.iter_products_xml(items):
+            written += file.write(chunk)
+        return written
+        
+    @staticmethod
+    def _iter_item_chunks(product_id: str, data_manager: ProductDataManager) -> Iterator[str]:
+        """
+        Generuj element <item> jednego produktu (opisy jako osobne kawałki)
+        
+        Args:
+            product_id: ID produktu
+            data_manager: Manager danych produktu
+            
+        Yields:
+            Fragmenty XML, każdy element poprzedzony nową linią
+        """
+        descriptions = data_manager.generated_descriptions
+        
+        yield (
+            '\n    <item>'
+            f'\n        <prod_id>{escape_xml(product_id)}</prod_id>'
+            '\n        <prod_shortdesc_pl><![CDATA['
+        )
+        yield escape_cdata(descriptions.short)
+        yield ']]></prod_shortdesc_pl>\n        <prod_desc_pl><![CDATA['
+        yield escape_cdata(descriptions.long)
+        yield ']]></prod_desc_pl>'
+        
+        option_lines = XMLBuilder._build_option_lines(data_manager)
+        option_lines.append('    </item>')
+        yield '\n' + '\n'.join(option_lines)
+        
+    @staticmethod
+    def _build_option_lines(data_manager: ProductDataManager) -> List[str]:
+        """
+        Zbuduj linie sekcji info_options i options jednego produktu
         
-        xml_parts = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            f'<products xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" version="1" date="{now}">',
-            '    <item>',
-            f'        <prod_id>{product_id}</prod_id>',
-            f'        <prod_shortdesc_pl><![CDATA[{data_manager.generated_descriptions.short}]]></prod_shortdesc_pl>',
-            f'        <prod_desc_pl><![CDATA[{data_manager.generated_descriptions.long}]]></prod_desc_pl>'
-        ]
+        Args:
+            data_manager: Manager danych produktu
+            
+        Returns:
+            Lista linii XML
+        """
+        xml_parts = []
         
         # Przygotuj parametry informacyjne (info_options)
         has_info_options = False
@@ -62,8 +127,8 @@ class XMLBuilder:
         
         # Dodaj oryginalne info_options (wykluczając wzrost)
         for original_option in data_manager.get_filtered_info_options():
-            escaped_name = escape_xml(original_option.name)
-            escaped_value = escape_xml(original_option.value)
+            escaped_name = escape_xml_cached(original_option.name)
+            escaped_value = escape_xml_cached(original_option.value)
             
             if original_option.type:
                 info_options_xml.append(
@@ -76,12 +141,9 @@ class XMLBuilder:
             has_info_options = True
         
         # Dodaj parametry wzrostu jeśli zostały wybrane (do info_options)
-        height_options = data_manager.height_manager.get_height_values_for_xml()
+        height_options = data_manager.height_manager.get_height_options_xml()
         if height_options:
-            for height_option in height_options:
-                info_options_xml.append(
-                    f'   <option name="{height_option["name"]}" remote_id="{height_option["remote_id"]}">{height_option["value"]}</option>'
-                )
+            info_options_xml.extend(height_options)
             has_info_options = True
             
         # Dodaj sekcję info_options jeśli są parametry wzrostu
@@ -96,8 +158,8 @@ class XMLBuilder:
         
         # Dodaj oryginalne options (wykluczając kolor dominujący)
         for original_option in data_manager.get_filtered_options():
-            escaped_name = escape_xml(original_option.name)
-            escaped_value = escape_xml(original_option.value)
+            escaped_name = escape_xml_cached(original_option.name)
+            escaped_value = escape_xml_cached(original_option.value)
             
             if original_option.type:
                 options_xml.append(f'            <options>')
@@ -113,7 +175,7 @@ class XMLBuilder:
         if data_manager.parameters.color and data_manager.parameters.color_remote_id:
             options_xml.extend([
                 '            <options>',
-                f'                <option name="Kolor dominujący" remote_id="{data_manager.parameters.color_remote_id}" required="1">{data_manager.parameters.color}</option>',
+                f'                <option name="Kolor dominujący" remote_id="{data_manager.parameters.color_remote_id}" required="1">{escape_xml_cached(data_manager.parameters.color)}</option>',
                 '            </options>'
             ])
             has_options = True
@@ -123,18 +185,13 @@ class XMLBuilder:
             xml_parts.append('        <options>')
             xml_parts.extend(options_xml)
             xml_parts.append('        </options>')
-        
-        xml_parts.extend([
-            '    </item>',
-            '</products>'
-        ])
-        
-        return '\n'.join(xml_parts)
+            
+        return xml_parts
         
     @staticmethod
     def build_multiple_products_xml(product_ids: List[str], data_manager: ProductDataManager) -> str:
         """
-        Zbuduj XML dla aktualizacji wielu produktów
+        Zbuduj XML dla aktualizacji wielu produktów z tymi samymi danymi
         
         Args:
             product_ids: Lista ID produktów
@@ -143,86 +200,6 @@ class XMLBuilder:
         Returns:
             XML jako string
         """
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        xml_parts = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            f'<products xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" version="1" date="{now}">'
-        ]
-        
-        # Dodaj każdy produkt
-        for product_id in product_ids:
-            xml_parts.extend([
-                '    <item>',
-                f'        <prod_id>{product_id}</prod_id>',
-                f'        <prod_shortdesc_pl><![CDATA[{data_manager.generated_descriptions.short}]]></prod_shortdesc_pl>',
-                f'        <prod_desc_pl><![CDATA[{data_manager.generated_descriptions.long}]]></prod_desc_pl>'
-            ])
-            
-            # Przygotuj parametry informacyjne (info_options)
-            has_info_options = False
-            info_options_xml = []
-            
-            # Dodaj oryginalne info_options (wykluczając wzrost)
-            for original_option in data_manager.get_filtered_info_options():
-                if original_option.type:
-                    info_options_xml.append(
-                        f'       <option name="{original_option.name}" remote_id="{original_option.remote_id}" type="{original_option.type}">{original_option.value}</option>'
-                    )
-                else:
-                    info_options_xml.append(
-                        f'       <option name="{original_option.name}" remote_id="{original_option.remote_id}">{original_option.value}</option>'
-                    )
-                has_info_options = True
-            
-            # Dodaj parametry wzrostu jeśli zostały wybrane (do info_options)
-            height_options = data_manager.height_manager.get_height_values_for_xml()
-            if height_options:
-                for height_option in height_options:
-                    info_options_xml.append(
-                        f'               <option name="{height_option["name"]}" remote_id="{height_option["remote_id"]}">{height_option["value"]}</option>'
-                    )
-                has_info_options = True
-                
-            # Dodaj sekcję info_options jeśli są parametry wzrostu
-            if has_info_options:
-                xml_parts.append('        <info_options>')
-                xml_parts.extend(info_options_xml)
-                xml_parts.append('        </info_options>')
-            
-            # Przygotuj opcje klienta (options)
-            has_options = False
-            options_xml = []
-            
-            # Dodaj oryginalne options (wykluczając kolor dominujący)
-            for original_option in data_manager.get_filtered_options():
-                if original_option.type:
-                    options_xml.append(f'            <options>')
-                    options_xml.append(f'                <option name="{original_option.name}" remote_id="{original_option.remote_id}" type="{original_option.type}" required="1">{original_option.value}</option>')
-                    options_xml.append(f'            </options>')
-                else:
-                    options_xml.append(f'            <options>')
-                    options_xml.append(f'                <option name="{original_option.name}" remote_id="{original_option.remote_id}" required="1">{original_option.value}</option>')
-                    options_xml.append(f'            </options>')
-                has_options = True
-            
-            # Dodaj parametr koloru jeśli został wybrany (do options)
-            if data_manager.parameters.color and data_manager.parameters.color_remote_id:
-                options_xml.extend([
-                    '            <options>',
-                    f'                <option name="Kolor dominujący" remote_id="{data_manager.parameters.color_remote_id}" required="1">{data_manager.parameters.color}</option>',
-                    '            </options>'
-                ])
-                has_options = True
-                
-            # Dodaj sekcję options jeśli są opcje
-            if has_options:
-                xml_parts.append('        <options>')
-                xml_parts.extend(options_xml)
-                xml_parts.append('        </options>')
-                
-            xml_parts.append('    </item>')
-        
-        xml_parts.append('</products>')
-        
-        return '\n'.join(xml_parts)
\ No newline at end of file
+        return XMLBuilder.build_products_xml(
+            (product_id, data_manager) for product_id in product_ids
+        )
@@ -0,0 +1,74 @@
+# xml_escape.py
+"""Escapowanie tekstu do XML: atrybuty/tekst elementów i sekcje CDATA"""
+from functools import lru_cache
+from typing import Optional
+
+# Kolejność ma znaczenie: & najpierw, żeby nie escapować wstawionych encji
+XML_ESCAPE_TABLE = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#39;")
+)
+
+# Nazwy i wartości opcji powtarzają się w każdym produkcie ("Wzrost", "Kolor dominujący", ...)
+ESCAPE_CACHE_SIZE = 4096
+
+CDATA_END = "]]>"
+# "]]>" w treści: zamknij sekcję po "]]" i otwórz nową przed ">"
+CDATA_END_SPLIT = "]]]]><![CDATA[>"
+
+
+def escape_xml(text: Optional[str]) -> Optional[str]:
+    """
+    Escape znaków specjalnych dla XML
+    
+    Każdy znak z tabeli jest zamieniany tylko jeśli występuje w tekście -
+    tekst bez znaków specjalnych (typowy przypadek) jest tylko przeszukiwany.
+    
+    Args:
+        text: Tekst do escapowania
+        
+    Returns:
+        Tekst z escapowanymi znakami XML
+    """
+    if not text:
+        return text
+        
+    for char, escape_seq in XML_ESCAPE_TABLE:
+        if char in text:
+            text = text.replace(char, escape_seq)
+            
+    return text
+
+
+@lru_cache(maxsize=ESCAPE_CACHE_SIZE)
+def escape_xml_cached(text: Optional[str]) -> Optional[str]:
+    """escape_xml z pamięcią wyników - dla powtarzalnych nazw i wartości opcji"""
+    return escape_xml(text)
+
+
+def escape_cdata(text: Optional[str]) -> str:
+    """
+    Przygotuj tekst do wstawienia w sekcję <![CDATA[...]]>
+    
+    Sekwencja "]]>" zamknęłaby sekcję przedwcześnie, więc jest dzielona
+    między dwie sekcje. Tekst bez niej jest zwracany bez kopiowania.
+    
+    Args:
+        text: Treść sekcji (np. opis HTML)
+        
+    Returns:
+        Treść bezpieczna wewnątrz CDATA
+    """
+    if not text:
+        return ""
+    if CDATA_END in text:
+        return text.replace(CDATA_END, CDATA_END_SPLIT)
+    return text
+
+
+def cdata(text: Optional[str]) -> str:
+    """Sekcja CDATA z bezpieczną treścią"""
+    return f"<![CDATA[{escape_cdata(text)}]]>"